@@ -1,9 +1,130 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.contrib.auth.admin import UserAdmin
 from django.contrib.auth.models import User
+from django.core import checks
+from django.core.exceptions import FieldDoesNotExist
 
+from backend.core.api.pagination import EstimatedCountPaginator
+from backend.core.search import search_queryset, search_words
 
-class CustomUserAdmin(UserAdmin):
+
+def get_list_field(model, name):
+    '''
+    Campo do model com esse nome em list_display, ou None (métodos, __str__ etc.).
+    '''
+    if not isinstance(name, str):
+        return None
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def get_lookup_field(model, path):
+    '''
+    Último campo de um caminho como "user__first_name".
+    '''
+    field = None
+    for name in path.split('__'):
+        field = model._meta.get_field(name)
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def is_indexed(field):
+    if field.primary_key or field.unique or field.db_index:
+        return True
+
+    opts = field.model._meta
+    # Só a primeira coluna de um índice composto ajuda na busca.
+    first_columns = [index.fields[0].lstrip('-') for index in opts.indexes if index.fields]
+    first_columns += [fields[0] for fields in opts.unique_together]
+    return field.name in first_columns
+
+
+class FastChangeList(ChangeList):
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.model_admin.list_prefetch_related:
+            queryset = queryset.prefetch_related(*self.model_admin.list_prefetch_related)
+        return queryset
+
+
+class FastAdminMixin:
+    '''
+    Listagens do admin sem N+1 e sem COUNT(*) em tabelas grandes:
+
+    - list_select_related inclui as FK de list_display, também as nulas,
+      que o select_related() padrão do admin deixa de fora;
+      declare em list_select_related só o que o __str__ precisa;
+    - list_prefetch_related para colunas que leem relações N:N;
+    - paginator com contagem estimada e sem a contagem total sem filtros;
+    - search_document = True busca no documento de busca do model
+      (veja backend.core.search) em vez de ILIKE em cada campo de search_fields;
+    - aviso core.W001 para campos de search_fields sem índice.
+    '''
+    list_prefetch_related = ()
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    search_document = False
+    check_search_indexes = True
+
+    def get_list_select_related(self, request):
+        if self.list_select_related is True:
+            return True
+
+        related = list(self.list_select_related or ())
+        for name in self.get_list_display(request):
+            field = get_list_field(self.model, name)
+            if field is not None and (field.many_to_one or field.one_to_one) and name not in related:
+                related.append(name)
+        return tuple(related) or False
+
+    def get_changelist(self, request, **kwargs):
+        return FastChangeList
+
+    def get_search_results(self, request, queryset, search_term):
+        if not self.search_document:
+            return super().get_search_results(request, queryset, search_term)
+
+        words = search_words(search_term)
+        if not words:
+            return queryset, False
+        return search_queryset(queryset, words), False
+
+    def check(self, **kwargs):
+        return [*super().check(**kwargs), *self._check_search_indexes()]
+
+    def _check_search_indexes(self):
+        if self.search_document or not self.check_search_indexes:
+            return []
+
+        errors = []
+        for name in self.search_fields:
+            path = name.lstrip('^=@')
+            try:
+                field = get_lookup_field(self.model, path)
+            except FieldDoesNotExist:
+                # O ModelAdmin já avisa sobre campos inexistentes.
+                continue
+            if not is_indexed(field):
+                errors.append(checks.Warning(
+                    f"O campo '{name}' de search_fields não tem índice.",
+                    hint='Crie um índice, tire o campo da busca ou use search_document.',
+                    obj=self.__class__,
+                    id='core.W001',
+                ))
+        return errors
+
+
+class FastModelAdmin(FastAdminMixin, admin.ModelAdmin):
+    pass
+
+
+class CustomUserAdmin(FastAdminMixin, UserAdmin):
     list_display = (
         '__str__',
         'email',
@@ -13,6 +134,9 @@ class CustomUserAdmin(UserAdmin):
         'is_staff',
         'is_superuser',
     )
+    list_prefetch_related = ('groups',)
+    # A tabela auth_user é do Django; a busca por nome e e-mail fica sem índice.
+    check_search_indexes = False
 
     @admin.display(description='Grupos')
     def get_groups(self, obj):
@@ -0,0 +1,30 @@
+import math
+
+from django.db.models import Aggregate, FloatField
+
+
+class PercentileCont(Aggregate):
+    '''
+    percentile_cont(fração) WITHIN GROUP (ORDER BY expressão), só no PostgreSQL.
+    Nos outros bancos use percentile_cont() sobre os valores ordenados.
+    '''
+    function = 'PERCENTILE_CONT'
+    name = 'PercentileCont'
+    template = '%(function)s(%(fraction)s) WITHIN GROUP (ORDER BY %(expressions)s)'
+    output_field = FloatField()
+
+    def __init__(self, expression, fraction, **extra):
+        # float() garante que só um número entra no SQL.
+        super().__init__(expression, fraction=float(fraction), **extra)
+
+
+def percentile_cont(values, fraction):
+    '''
+    Mesma interpolação linear do percentile_cont do PostgreSQL; values já ordenados.
+    '''
+    if not values:
+        return None
+    position = fraction * (len(values) - 1)
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
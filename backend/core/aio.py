@@ -0,0 +1,85 @@
+'''
+Ferramentas para views async.
+
+O Django 4.0 ainda não tem ORM async, então as queries rodam com sync_to_async
+(na thread da requisição, onde o Django também fecha a conexão no fim).
+Ler a requisição, serializar as tuplas e enviar a resposta fica no event loop,
+sem prender uma thread por cliente lento.
+'''
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse
+)
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def api_request(request):
+    '''
+    Envolve a requisição do Django em uma Request do DRF,
+    com as autenticações padrão da API.
+    '''
+    authenticators = [authentication() for authentication in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    return Request(request, authenticators=authenticators)
+
+
+def _get_user(request):
+    return api_request(request).user
+
+
+async def aget_user(request):
+    return await sync_to_async(_get_user)(request)
+
+
+async def alist(queryset):
+    return await sync_to_async(list)(queryset)
+
+
+async def aget(queryset, **kwargs):
+    '''
+    Como o get(), mas retorna None se o objeto não existir.
+    '''
+    return await sync_to_async(queryset.filter(**kwargs).first)()
+
+
+async def apaginate(paginator, queryset, request, view=None):
+    '''
+    Roda o paginate_queryset do DRF em uma thread e devolve a página.
+    '''
+    return await sync_to_async(paginator.paginate_queryset)(queryset, api_request(request), view=view)
+
+
+def not_allowed(request, methods=('GET', 'HEAD')):
+    '''
+    Retorna 405 se o método não for permitido (o require_GET do Django 4.0 não aceita views async).
+    '''
+    if request.method not in methods:
+        return HttpResponseNotAllowed(methods)
+    return None
+
+
+def json_response(data, status=200):
+    return JsonResponse(
+        data,
+        status=status,
+        safe=False,
+        encoder=JSONEncoder,
+        json_dumps_params={'ensure_ascii': False},
+    )
+
+
+def streaming_response(request, content, **kwargs):
+    '''
+    StreamingHttpResponse que também funciona no ASGI.
+
+    No Django 4.0 o ASGIHandler percorre o conteúdo no event loop, onde o ORM não pode ser usado.
+    Então no ASGI o conteúdo, que lê o banco aos poucos, é gerado antes, ainda na thread da view;
+    a memória deixa de ser constante nesse caso. No WSGI nada muda.
+    '''
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        content = list(content)
+    return StreamingHttpResponse(content, **kwargs)
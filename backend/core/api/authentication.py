@@ -0,0 +1,153 @@
+import copy
+import hashlib
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authentication import (
+    BasicAuthentication,
+    TokenAuthentication
+)
+from rest_framework.authtoken.models import Token
+
+from backend.core.localcache import LocalCache
+from backend.core.versions import new_version, now_and_on_commit
+
+AUTH_CACHE_TIMEOUT = 60 * 5
+LOCAL_CACHE_TIMEOUT = 10
+LOCAL_CACHE_SIZE = 1024
+
+# Os sinais abaixo só limpam o processo atual;
+# nos outros processos a entrada expira em LOCAL_CACHE_TIMEOUT segundos.
+local_cache = LocalCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TIMEOUT)
+
+
+def credentials_hash(*parts):
+    '''
+    HMAC-SHA256 das credenciais com a SECRET_KEY.
+    É rápido, e quem lê o cache não consegue testar senhas sem a SECRET_KEY.
+    '''
+    message = '\0'.join(parts).encode('utf-8')
+    return hmac.new(settings.SECRET_KEY.encode('utf-8'), message, hashlib.sha256).hexdigest()
+
+
+def token_cache_key(key):
+    return f'auth-token:{credentials_hash(key)}'
+
+
+def basic_cache_key(userid, password):
+    return f'auth-basic:{credentials_hash(userid, password)}'
+
+
+def user_version_key(user_id):
+    return f'auth-user-version:{user_id}'
+
+
+def get_user_version(user_id):
+    '''
+    Versão do usuário, trocada a cada alteração (veja user_changed).
+    As entradas em cache guardam a versão de quando foram criadas.
+    '''
+    key = user_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, new_version(), None)
+        version = cache.get(key)
+    return version
+
+
+def get_cached_auth(key):
+    '''
+    Retorna (user, auth) em cache, ou None.
+    '''
+    value = local_cache.get(key)
+    if value is None:
+        value = cache.get(key)
+        if value is None:
+            return None
+        user, auth, version = value
+        if version != get_user_version(user.pk):
+            return None
+        local_cache.set(key, value)
+
+    user, auth, _ = value
+    # Cada requisição recebe a sua cópia, já que o objeto em memória é compartilhado.
+    return copy.copy(user), copy.copy(auth)
+
+
+def set_cached_auth(key, user, auth):
+    value = (copy.copy(user), copy.copy(auth), get_user_version(user.pk))
+    local_cache.set(key, value)
+    cache.set(key, value, AUTH_CACHE_TIMEOUT)
+
+
+def delete_cached_keys(keys):
+    local_cache.delete_many(keys)
+    cache.delete_many(keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    '''
+    TokenAuthentication que guarda o usuário e o token
+    em memória e no cache compartilhado, sem ir ao banco a cada requisição.
+    '''
+
+    def authenticate_credentials(self, key):
+        cache_key = token_cache_key(key)
+        cached = get_cached_auth(cache_key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        set_cached_auth(cache_key, user, token)
+        return (user, token)
+
+
+class CachedBasicAuthentication(BasicAuthentication):
+    '''
+    BasicAuthentication que guarda o usuário pelo HMAC de usuário e senha,
+    para que clientes repetidos não paguem o PBKDF2 em toda requisição.
+    Senha errada não entra no cache e continua passando pelo hash lento.
+    '''
+
+    def authenticate_credentials(self, userid, password, request=None):
+        cache_key = basic_cache_key(userid, password)
+        cached = get_cached_auth(cache_key)
+        if cached is not None:
+            return cached
+
+        user, auth = super().authenticate_credentials(userid, password, request=request)
+        set_cached_auth(cache_key, user, auth)
+        return (user, auth)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    '''
+    Token revogado (logout do djoser, por exemplo).
+    '''
+    keys = [token_cache_key(instance.key)]
+    now_and_on_commit(lambda: delete_cached_keys(keys))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    '''
+    Senha, is_active ou dados do usuário mudaram: uma nova versão do usuário
+    descarta tudo o que está no cache compartilhado com a versão anterior.
+    O login só atualiza o last_login, que não precisa invalidar.
+    '''
+    update_fields = kwargs.get('update_fields')
+    if kwargs.get('created') or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+
+    def invalidate():
+        cache.set(user_version_key(instance.pk), new_version(), None)
+        # As chaves de Basic auth do usuário não são conhecidas aqui.
+        local_cache.clear()
+
+    now_and_on_commit(invalidate)
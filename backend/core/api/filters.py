@@ -0,0 +1,27 @@
+from rest_framework.filters import SearchFilter
+
+from backend.core.search import search_queryset, search_words
+
+
+class SearchDocumentFilter(SearchFilter):
+    '''
+    SearchFilter que consulta o documento de busca do model (veja backend.core.search),
+    sem joins e sem ILIKE em cada coluna de search_fields.
+
+    O resultado ganha a anotação search_rank (relevância, só no PostgreSQL).
+    '''
+    document_field = 'search_document'
+    vector_field = 'search_vector'
+    rank_alias = 'search_rank'
+
+    def get_search_words(self, request):
+        words = []
+        for term in self.get_search_terms(request):
+            words.extend(search_words(term))
+        return words
+
+    def filter_queryset(self, request, queryset, view):
+        words = self.get_search_words(request)
+        if not words:
+            return queryset
+        return search_queryset(queryset, words, self.document_field, self.vector_field, self.rank_alias)
@@ -0,0 +1,431 @@
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max, prefetch_related_objects
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from backend.core.aio import streaming_response
+from backend.core.api.renderers import CSVRenderer, NDJSONRenderer
+from backend.core.api.serializers import (
+    build_prefetch_plan,
+    get_expandable_fields,
+    get_field_names,
+    get_nested_models,
+    get_only_fields,
+    get_prefetch_plan,
+    parse_sparse_fields,
+    sparse_serializer
+)
+from backend.core.db.router import primary_after_write
+from backend.core.localcache import LocalCache
+from backend.core.versions import get_model_versions
+
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+RESPONSE_LOCAL_CACHE_SIZE = 512
+
+# A versão dos models faz parte da chave, então o cache local nunca fica desatualizado.
+response_cache = LocalCache(RESPONSE_LOCAL_CACHE_SIZE, RESPONSE_CACHE_TIMEOUT)
+
+
+class PrefetchPlanMixin:
+    '''
+    Aplica no queryset o select_related/prefetch_related
+    que o serializer da ação precisa, evitando o N+1.
+
+    Fica no filter_queryset porque list() e get_object() sempre passam por ele,
+    mesmo quando a viewset sobrescreve o get_queryset().
+    '''
+
+    def get_prefetch_plan(self):
+        return get_prefetch_plan(self.get_serializer_class())
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return self.get_prefetch_plan().apply(queryset)
+
+
+def iter_chunks(queryset, chunk_size):
+    '''
+    Percorre o queryset com cursor no servidor (iterator), em blocos.
+    O iterator() ignora o prefetch_related, então ele é feito por bloco.
+    '''
+    lookups = queryset._prefetch_related_lookups
+    chunk = []
+
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            prefetch_related_objects(chunk, *lookups)
+            yield chunk
+            chunk = []
+
+    if chunk:
+        prefetch_related_objects(chunk, *lookups)
+        yield chunk
+
+
+def iter_rows(queryset, get_serializer, chunk_size):
+    for chunk in iter_chunks(queryset, chunk_size):
+        yield from get_serializer(chunk, many=True).data
+
+
+def iter_values(queryset, names, chunk_size):
+    '''
+    Percorre um values_list em blocos e devolve cada tupla como dicionário.
+    '''
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield dict(zip(names, row))
+
+
+def get_requested_fields(request, param, allowed, required=('id',)):
+    '''
+    Campos pedidos em ?<param>=a,b (todos os de allowed se o parâmetro não vier),
+    sempre com os de required. Campos fora de allowed geram 400.
+    '''
+    value = request.query_params.get(param)
+    if not value:
+        return tuple(allowed)
+
+    requested = [name.strip() for name in value.split(',') if name.strip()]
+    invalid = [name for name in requested if name not in allowed]
+    if invalid:
+        raise ValidationError({param: f"Campos inválidos: {', '.join(invalid)}. Use {', '.join(allowed)}."})
+
+    missing = [name for name in required if name not in requested]
+    return tuple(missing + requested)
+
+
+class SparseFieldsMixin(PrefetchPlanMixin):
+    '''
+    ?fields=id,title escolhe os campos da resposta e ?expand=student troca o id
+    da relação pelo serializer declarado em Meta.expandable_fields.
+    "category.title" escolhe os campos de um serializer aninhado.
+
+    O queryset lê só as colunas desses campos (only()) e o select_related/prefetch_related
+    segue o serializer já reduzido. Vale só nas leituras das ações em sparse_actions;
+    as escritas sempre usam o serializer completo.
+
+    sparse_required_fields são colunas lidas mesmo fora de ?fields=,
+    como as usadas pelas permissões de objeto, que senão fariam outra consulta.
+    '''
+    sparse_fields_param = 'fields'
+    sparse_expand_param = 'expand'
+    sparse_actions = ('list', 'retrieve')
+    sparse_required_fields = ()
+
+    def get_sparse_fields(self):
+        '''
+        Retorna (fields, expand) pedidos na requisição, ou None sem ?fields= e ?expand=.
+        '''
+        if not hasattr(self, '_sparse_fields'):
+            self._sparse_fields = self._get_sparse_fields()
+        return self._sparse_fields
+
+    def _get_sparse_fields(self):
+        params = self.request.query_params
+        fields_param, expand_param = self.sparse_fields_param, self.sparse_expand_param
+
+        if self.request.method not in SAFE_METHODS or self.action not in self.sparse_actions:
+            return None
+        if not params.get(fields_param) and not params.get(expand_param):
+            return None
+
+        serializer = self.get_serializer_class()()
+        fields = None
+        if params.get(fields_param):
+            required = ('id',) if 'id' in serializer.fields else ()
+            names = get_requested_fields(self.request, fields_param, get_field_names(serializer), required)
+            fields = parse_sparse_fields(names)
+
+        expand = ()
+        if params.get(expand_param):
+            expand = get_requested_fields(self.request, expand_param, get_expandable_fields(serializer), ())
+        return fields, expand
+
+    def get_sparse_serializer(self):
+        if not hasattr(self, '_sparse_serializer'):
+            serializer = self.get_serializer_class()(context=self.get_serializer_context())
+            self._sparse_serializer = sparse_serializer(serializer, *self.get_sparse_fields())
+        return self._sparse_serializer
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        # A API navegável também monta os formulários de escrita com o get_serializer.
+        if self.request.method in SAFE_METHODS and self.get_sparse_fields() is not None:
+            sparse_serializer(serializer, *self.get_sparse_fields())
+        return serializer
+
+    def get_sparse_models(self):
+        '''
+        Models dos serializers aninhados da resposta com ?fields= ou ?expand=,
+        que também entram na versão do ConditionalGetMixin e do CachedResponseMixin.
+        '''
+        if self.get_sparse_fields() is None:
+            return []
+        return get_nested_models(self.get_sparse_serializer())
+
+    def get_prefetch_plan(self):
+        if self.get_sparse_fields() is None:
+            return super().get_prefetch_plan()
+        return build_prefetch_plan(self.get_sparse_serializer())
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_fields() is None or queryset._fields is not None:
+            return queryset
+
+        only = get_only_fields(self.get_sparse_serializer(), queryset.model)
+        if only is not None:
+            queryset = queryset.only(*only, *self.sparse_required_fields)
+        return queryset
+
+
+def with_sparse_models(view, models):
+    '''
+    Acrescenta os models que ?expand= e "relação.campo" trazem para a resposta.
+    '''
+    if not isinstance(view, SparseFieldsMixin):
+        return tuple(models)
+    return (*models, *[model for model in view.get_sparse_models() if model not in models])
+
+
+class ExportMixin:
+    '''
+    Exporta a listagem inteira, sem paginação, com ?format=ndjson ou ?format=csv.
+
+    As linhas são lidas do banco em blocos de export_chunk_size
+    e enviadas com StreamingHttpResponse, com memória constante (no WSGI; veja streaming_response).
+    '''
+    export_chunk_size = 2000
+    export_renderer_classes = (NDJSONRenderer, CSVRenderer)
+
+    def get_renderers(self):
+        return super().get_renderers() + [renderer() for renderer in self.export_renderer_classes]
+
+    def is_export(self, request):
+        formats = [renderer.format for renderer in self.export_renderer_classes]
+        return request.accepted_renderer.format in formats
+
+    def list(self, request, *args, **kwargs):
+        if self.is_export(request):
+            return self.export(request)
+        return super().list(request, *args, **kwargs)
+
+    def get_export_queryset(self):
+        queryset = self.get_queryset()
+        if hasattr(self, 'filter_queryset'):
+            queryset = self.filter_queryset(queryset)
+        return queryset
+
+    def get_export_serializer(self, *args, **kwargs):
+        if hasattr(self, 'get_serializer_context'):
+            # O get_serializer da viewset passa o contexto e aplica o ?fields= (veja SparseFieldsMixin).
+            return self.get_serializer(*args, **kwargs)
+        return self.get_serializer_class()(*args, **kwargs)
+
+    def get_export_rows(self):
+        return iter_rows(self.get_export_queryset(), self.get_export_serializer, self.export_chunk_size)
+
+    def export(self, request, rows=None):
+        renderer = request.accepted_renderer
+        if rows is None:
+            rows = self.get_export_rows()
+        response = streaming_response(
+            request,
+            renderer.stream(rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}',
+        )
+        if renderer.format == 'csv':
+            filename = getattr(self, 'basename', None) or 'export'
+            response['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+        return response
+
+
+class ConditionalGetMixin:
+    '''
+    Envia ETag e Last-Modified no list e no retrieve
+    e responde 304 ao If-None-Match/If-Modified-Since antes de serializar.
+
+    Por padrão usa a versão dos models em etag_models (o model do queryset
+    se não for definido), que muda a cada post_save/post_delete.
+    Com etag_field = 'updated' usa Max(updated) + Count do queryset filtrado.
+
+    Até REPLICA_PIN_SECONDS depois de uma alteração o corpo é lido do principal.
+    '''
+    etag_models = None
+    etag_field = None
+
+    def get_etag_models(self):
+        return with_sparse_models(self, self.etag_models or (self.get_queryset().model,))
+
+    def get_etag_state(self):
+        '''
+        Retorna (estado, última alteração).
+        '''
+        if self.etag_field:
+            queryset = self.filter_queryset(self.get_queryset())
+            aggregate = queryset.aggregate(last=Max(self.etag_field), count=Count('pk'))
+            return aggregate, aggregate['last']
+
+        versions = get_model_versions(*self.get_etag_models())
+        return versions, max(versions) // 10 ** 9
+
+    def get_validators(self, request):
+        state, last_modified = self.get_etag_state()
+        parts = [
+            state,
+            request.get_full_path(),
+            request.user.pk,
+            request.accepted_media_type,
+            self.action,
+        ]
+        etag = quote_etag(hashlib.md5(repr(parts).encode('utf-8')).hexdigest())
+        if last_modified is not None and not isinstance(last_modified, int):
+            last_modified = int(last_modified.timestamp())
+        return etag, last_modified
+
+    def conditional_response(self, request, handler, *args, **kwargs):
+        etag, last_modified = self.get_validators(request)
+        response = get_conditional_response(request._request, etag=etag, last_modified=last_modified)
+
+        if response is None:
+            # Last-Modified é truncado em segundos.
+            last_write = last_modified + 1 if last_modified is not None else 0
+            with primary_after_write(last_write):
+                response = handler(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(request, super().retrieve, *args, **kwargs)
+
+
+class CachedResponseMixin:
+    '''
+    Guarda a resposta já renderizada do list e do retrieve,
+    primeiro em memória e depois no cache compartilhado.
+
+    A chave tem o host, o caminho, os query params, o escopo, o formato
+    e a versão dos models em cache_models (mais os de ?expand=), que muda a cada post_save/post_delete.
+    Assim nada fica desatualizado e não é preciso esperar um TTL.
+
+    cache_scope = 'public' quando todos veem os mesmos dados
+    (as permissões continuam sendo checadas antes) ou 'user' para separar por usuário.
+
+    Só os formatos em cache_formats são guardados: a página da API navegável
+    tem o nome do usuário logado e o token CSRF.
+
+    Até REPLICA_PIN_SECONDS depois de uma alteração a resposta é lida do principal,
+    senão uma réplica atrasada deixaria dados antigos na chave da versão nova.
+    '''
+    cache_models = None
+    cache_scope = 'public'
+    cache_timeout = RESPONSE_CACHE_TIMEOUT
+    cache_formats = ('json',)
+
+    def get_cache_models(self):
+        return with_sparse_models(self, self.cache_models or (self.get_queryset().model,))
+
+    def get_cache_key(self, request, versions):
+        scope = request.user.pk if self.cache_scope == 'user' else self.cache_scope
+        parts = [
+            versions,
+            request.get_host(),
+            request.path,
+            sorted(request.query_params.lists()),
+            scope,
+            request.accepted_media_type,
+            self.action,
+        ]
+        return 'response:' + hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+
+    def cached_response(self, request, handler, *args, **kwargs):
+        if request.accepted_renderer.format not in self.cache_formats:
+            return handler(request, *args, **kwargs)
+
+        versions = get_model_versions(*self.get_cache_models())
+        key = self.get_cache_key(request, versions)
+
+        cached = response_cache.get(key)
+        if cached is None:
+            cached = cache.get(key)
+            if cached is not None:
+                response_cache.set(key, cached)
+
+        if cached is not None:
+            content, headers = cached
+            response = HttpResponse(content)
+            # Content-Type, Vary, Allow etc. da resposta original.
+            for header, value in headers:
+                response[header] = value
+            return response
+
+        # A versão é o instante da última alteração.
+        with primary_after_write(max(versions) / 10 ** 9):
+            response = handler(request, *args, **kwargs)
+
+        if isinstance(response, Response) and response.status_code == 200:
+            def store(response):
+                value = (response.content, list(response.items()))
+                response_cache.set(key, value)
+                cache.set(key, value, self.cache_timeout)
+
+            response.add_post_render_callback(store)
+
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(request, super().retrieve, *args, **kwargs)
+
+
+class OwnerScopedMixin:
+    '''
+    Viewset em que cada usuário só vê e altera os próprios objetos.
+
+    O get_queryset filtra por <owner_field>_id = request.user.pk no SQL,
+    sem buscar o User de novo; assim o get_object() busca o objeto e valida
+    o dono na mesma query (404 para objetos de outros usuários).
+    A ordenação owner_ordering deve casar com um índice (owner, ...), por exemplo:
+
+        owner_field = 'teacher'
+        owner_ordering = ('-created', '-id')
+
+        class Meta:
+            indexes = [models.Index(fields=('teacher', 'created'))]
+    '''
+    owner_field = 'owner'
+    owner_ordering = ()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        user = self.request.user
+
+        if not user or not user.is_authenticated:
+            return queryset.none()
+
+        queryset = queryset.filter(**{f'{self.owner_field}_id': user.pk})
+        if self.owner_ordering:
+            queryset = queryset.order_by(*self.owner_ordering)
+        return queryset
+
+    def perform_create(self, serializer):
+        serializer.save(**{self.owner_field: self.request.user})
+
+    def perform_update(self, serializer):
+        # O dono não muda na edição.
+        serializer.save(**{self.owner_field: self.request.user})
@@ -0,0 +1,376 @@
+import datetime
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from decimal import Decimal
+from uuid import UUID
+
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+from django.db.models.query import ValuesListIterable
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _get_sql(queryset):
+    return queryset.query.get_compiler(using=queryset.db).as_sql()
+
+
+def table_count(queryset):
+    '''
+    Número de linhas da tabela segundo a estatística pg_class.reltuples.
+    '''
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+            [queryset.model._meta.db_table]
+        )
+        row = cursor.fetchone()
+
+    # reltuples = -1 quando a tabela nunca foi analisada.
+    if row and row[0] >= 0:
+        return int(row[0])
+    return None
+
+
+def explain_count(queryset):
+    '''
+    Número de linhas estimado pelo planejador (EXPLAIN) para o queryset.
+    '''
+    sql, params = _get_sql(queryset)
+
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def estimate_count(queryset):
+    '''
+    Retorna o número aproximado de linhas do queryset, sem SELECT COUNT(*).
+
+    Sem filtros usa pg_class.reltuples; com filtros usa o EXPLAIN.
+    Retorna None quando o banco não é o PostgreSQL.
+    '''
+    if connections[queryset.db].vendor != 'postgresql':
+        return None
+
+    if not queryset.query.where and not queryset.query.distinct:
+        count = table_count(queryset)
+        if count is not None:
+            return count
+
+    return explain_count(queryset)
+
+
+def cached_count(queryset, timeout):
+    '''
+    Contagem exata, guardada no cache por (SQL, parâmetros) durante timeout segundos.
+    '''
+    sql, params = _get_sql(queryset)
+    key = hashlib.md5(f'{queryset.db}:{sql}:{params!r}'.encode('utf-8')).hexdigest()
+    key = f'count:{key}'
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+def get_count(queryset, threshold, timeout):
+    '''
+    Retorna (count, is_estimate).
+
+    Se a estimativa passar de threshold, devolve a estimativa;
+    caso contrário faz a contagem exata (com cache).
+    '''
+    estimate = estimate_count(queryset)
+
+    if estimate is not None and estimate >= threshold:
+        return estimate, True
+
+    return cached_count(queryset, timeout), False
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    '''
+    Paginator que usa a contagem estimada em tabelas grandes.
+
+    Com a contagem estimada não dá para confiar no num_pages,
+    então a página busca um item a mais para saber se existe a próxima.
+    '''
+    count_estimate_threshold = 10000
+    count_cache_timeout = 60
+
+    @cached_property
+    def count_info(self):
+        '''
+        Retorna (count, is_estimate).
+        '''
+        if not isinstance(self.object_list, QuerySet):
+            return len(self.object_list), False
+
+        return get_count(
+            self.object_list,
+            self.count_estimate_threshold,
+            self.count_cache_timeout
+        )
+
+    @cached_property
+    def count(self):
+        return self.count_info[0]
+
+    @property
+    def is_estimate(self):
+        return self.count_info[1]
+
+    def validate_number(self, number):
+        if not self.is_estimate:
+            return super().validate_number(number)
+
+        # Com a estimativa, qualquer página a partir de 1 é válida.
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Essa página não é um número inteiro.')
+        if number < 1:
+            raise EmptyPage('Essa página é menor que 1.')
+        return number
+
+    def page(self, number):
+        if not self.is_estimate:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        return EstimatedPage(self.object_list[bottom:top + 1], number, self)
+
+
+class EstimatedPage(Page):
+
+    def __init__(self, object_list, number, paginator):
+        object_list = list(object_list)
+        self._has_next = len(object_list) > paginator.per_page
+        super().__init__(object_list[:paginator.per_page], number, paginator)
+
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    '''
+    PageNumberPagination com contagem estimada ou em cache.
+
+    Tabelas grandes usam a estimativa do PostgreSQL no "count";
+    as pequenas fazem a contagem exata, guardada em cache por alguns segundos.
+    '''
+    django_paginator_class = EstimatedCountPaginator
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    raise TypeError(f'Tipo não suportado no cursor: {type(value).__name__}')
+
+
+class KeysetPagination(BasePagination):
+    '''
+    Paginação por chave (keyset), sem COUNT(*) e sem OFFSET.
+
+    A página seguinte é buscada com WHERE (created, id) < (x, y),
+    usando o índice das colunas da ordenação.
+    A viewset escolhe as colunas em keyset_ordering, por exemplo:
+
+        pagination_class = KeysetPagination
+        keyset_ordering = ('-created', '-id')
+
+    A última coluna deve ser única (normalmente o id)
+    e nenhuma delas pode ser nula.
+    '''
+    page_size = api_settings.PAGE_SIZE
+    ordering = ('-id',)
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    count_estimate_threshold = EstimatedCountPaginator.count_estimate_threshold
+    count_cache_timeout = EstimatedCountPaginator.count_cache_timeout
+    invalid_cursor_message = 'Cursor inválido.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_ordering(view)
+        self.aliases = [f'keyset_{index}' for index in range(len(self.keys))]
+
+        position, reverse = self.decode_cursor(request)
+
+        self.count = None
+        if self.include_count(request):
+            self.count, _ = get_count(queryset, self.count_estimate_threshold, self.count_cache_timeout)
+
+        queryset = queryset.annotate(**{
+            alias: F(field_name)
+            for alias, (field_name, _) in zip(self.aliases, self.keys)
+        })
+
+        if position is not None:
+            queryset = queryset.filter(self.get_position_filter(position, reverse))
+
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        self.is_values_list = issubclass(queryset._iterable_class, ValuesListIterable)
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.next_position = self.get_position(results[-1]) if results and self.has_next else None
+        self.previous_position = self.get_position(results[0]) if results and self.has_previous else None
+
+        if self.is_values_list:
+            # Remove as colunas da chave que o annotate adicionou no fim da tupla.
+            results = [row[:-len(self.keys)] for row in results]
+
+        return results
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size < 1:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, view):
+        '''
+        Retorna a lista de (campo, decrescente).
+        '''
+        ordering = getattr(view, 'keyset_ordering', self.ordering)
+        return [(key.lstrip('-'), key.startswith('-')) for key in ordering]
+
+    def get_order_by(self, reverse):
+        order_by = []
+        for alias, (_, descending) in zip(self.aliases, self.keys):
+            if descending != reverse:
+                order_by.append(F(alias).desc())
+            else:
+                order_by.append(F(alias).asc())
+        return order_by
+
+    def get_position_filter(self, position, reverse):
+        '''
+        Monta (a > x) OR (a = x AND b > y) OR ...,
+        invertendo o sentido para as colunas decrescentes.
+        '''
+        if len(position) != len(self.keys):
+            raise NotFound(self.invalid_cursor_message)
+
+        lookups = [
+            'lt' if descending != reverse else 'gt'
+            for _, descending in self.keys
+        ]
+
+        condition = Q()
+        equals = Q()
+        for alias, lookup, value in zip(self.aliases, lookups, position):
+            condition |= equals & Q(**{f'{alias}__{lookup}': value})
+            equals &= Q(**{alias: value})
+
+        # Limita pela primeira coluna, para o banco usar o índice por intervalo.
+        first = Q(**{f'{self.aliases[0]}__{lookups[0]}e': position[0]})
+        return first & condition
+
+    def get_position(self, item):
+        if self.is_values_list:
+            return list(item[-len(self.keys):])
+        return [getattr(item, alias) for alias in self.aliases]
+
+    def include_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+
+        try:
+            cursor = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            return cursor['p'], bool(cursor.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        cursor = {'p': position}
+        if reverse:
+            cursor['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(cursor, default=_encode_value).encode('ascii'))
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded.decode('ascii'))
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.previous_position is None:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.previous_position, reverse=True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ])
+        if self.count is not None:
+            response['count'] = self.count
+            response.move_to_end('count', last=False)
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {
+                    'type': 'integer',
+                    'example': 123,
+                },
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
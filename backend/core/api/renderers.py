@@ -0,0 +1,99 @@
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class Echo:
+    '''
+    Objeto com write() que só devolve o valor, para o csv.writer
+    gerar cada linha sem guardar nada em memória.
+    '''
+
+    def write(self, value):
+        return value
+
+
+def flatten(row, prefix=''):
+    '''
+    Achata dicionários aninhados: {'user': {'email': x}} -> {'user.email': x}.
+    Listas viram JSON.
+    '''
+    flat = {}
+    for key, value in row.items():
+        key = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix=f'{key}.'))
+        elif isinstance(value, (list, tuple)):
+            flat[key] = json.dumps(value, cls=JSONEncoder, ensure_ascii=False)
+        else:
+            flat[key] = value
+    return flat
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, cls=JSONEncoder, ensure_ascii=False) + '\n'
+
+
+def stream_json(rows):
+    '''
+    Lista JSON gerada item a item: "[", linhas separadas por vírgula e "]".
+    '''
+    separator = ''
+    yield '['
+    for row in rows:
+        yield separator + json.dumps(row, cls=JSONEncoder, ensure_ascii=False)
+        separator = ','
+    yield ']'
+
+
+def stream_csv(rows):
+    writer = csv.writer(Echo())
+    header = None
+
+    for row in rows:
+        row = flatten(row)
+        if header is None:
+            header = list(row)
+            yield writer.writerow(header)
+        yield writer.writerow([row.get(key) for key in header])
+
+
+class NDJSONRenderer(BaseRenderer):
+    '''
+    Um objeto JSON por linha (?format=ndjson).
+    '''
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def stream(self, rows):
+        return stream_ndjson(rows)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = data.get('results', [data])
+        return ''.join(self.stream(data)).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    '''
+    CSV com cabeçalho; campos aninhados viram colunas "user.email" (?format=csv).
+    '''
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def stream(self, rows):
+        return stream_csv(rows)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            data = data.get('results', [data])
+        return ''.join(self.stream(data)).encode(self.charset)
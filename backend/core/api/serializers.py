@@ -0,0 +1,520 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models.query import ValuesListIterable
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.serializers import LIST_SERIALIZER_KWARGS
+from rest_framework.settings import ISO_8601, api_settings
+
+# Plano compilado por classe de serializer
+# e por (classe, campos) dos serializers reduzidos com sparse_serializer.
+_fast_plans = {}
+
+# Plano de select_related/prefetch_related por classe de serializer.
+_prefetch_plans = {}
+
+
+def _static(converter):
+    return lambda: converter
+
+
+def _datetime_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+
+    if output_format is None:
+        return None
+
+    def bind():
+        # O fuso horário é resolvido uma vez por lista, e não por linha.
+        field_timezone = getattr(field, 'timezone', field.default_timezone())
+
+        def convert(value):
+            if field_timezone is not None:
+                if timezone.is_aware(value):
+                    value = value.astimezone(field_timezone)
+                else:
+                    value = timezone.make_aware(value, field_timezone)
+            elif timezone.is_aware(value):
+                value = timezone.make_naive(value, timezone.utc)
+
+            if output_format.lower() != ISO_8601:
+                return value.strftime(output_format)
+
+            value = value.isoformat()
+            if value.endswith('+00:00'):
+                value = value[:-6] + 'Z'
+            return value
+
+        return convert
+
+    return bind
+
+
+def _date_converter(field):
+    output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+
+    if output_format is None:
+        return None
+
+    if output_format.lower() == ISO_8601:
+        return _static(lambda value: value.isoformat())
+
+    return _static(lambda value: value.strftime(output_format))
+
+
+# Colunas cujo valor vindo do banco já é o tipo que o JSON espera.
+NATIVE_FIELDS = (
+    (serializers.BooleanField, models.BooleanField),
+    (serializers.IntegerField, (models.IntegerField, models.AutoField)),
+    (serializers.CharField, (models.CharField, models.TextField)),
+)
+
+
+def get_converter(field, model_field):
+    '''
+    Retorna uma fábrica da função que converte o valor bruto do banco
+    para o JSON, ou None quando o valor pode ser usado como está.
+    '''
+    for serializer_field_class, model_field_class in NATIVE_FIELDS:
+        if isinstance(field, serializer_field_class) and isinstance(model_field, model_field_class):
+            return None
+
+    if isinstance(field, serializers.BooleanField):
+        return _static(bool)
+    if isinstance(field, serializers.IntegerField):
+        return _static(int)
+    if isinstance(field, serializers.CharField):
+        return _static(str)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    if isinstance(field, serializers.DateField):
+        return _date_converter(field)
+    if isinstance(field, serializers.DecimalField):
+        # O DecimalField já faz quantize e formatação, então reaproveitamos.
+        return _static(field.to_representation)
+    if isinstance(field, serializers.FloatField):
+        return _static(float)
+    if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+        return None
+    return NotImplemented
+
+
+class FastPlan:
+    '''
+    Especificação compilada dos campos: nomes, colunas e conversores.
+    '''
+
+    def __init__(self, names, columns, converters):
+        self.names = names
+        self.columns = columns
+        # Somente os índices que realmente precisam de conversão.
+        self.converters = [
+            (index, converter)
+            for index, converter in enumerate(converters)
+            if converter is not None
+        ]
+
+    def bind(self):
+        '''
+        Retorna os conversores prontos para uma passada de serialização.
+        '''
+        return [(index, factory()) for index, factory in self.converters]
+
+    def row_to_dict(self, row, converters):
+        values = list(row)
+        for index, converter in converters:
+            value = values[index]
+            if value is not None:
+                values[index] = converter(value)
+        return dict(zip(self.names, values))
+
+    def instance_to_row(self, instance):
+        return tuple(getattr(instance, column) for column in self.columns)
+
+
+def compile_plan(serializer):
+    '''
+    Compila os campos legíveis do serializer em um FastPlan.
+    Retorna None se algum campo não puder ser lido direto de uma coluna,
+    por exemplo serializers aninhados ou SerializerMethodField.
+    '''
+    model = serializer.Meta.model
+    names, columns, converters = [], [], []
+
+    for field in serializer._readable_fields:
+        if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+
+        source = field.source
+        if source == '*' or '.' in source:
+            return None
+
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+
+        converter = get_converter(field, model_field)
+        if converter is NotImplemented:
+            return None
+
+        names.append(field.field_name)
+        columns.append(model_field.attname)
+        converters.append(converter)
+
+    return FastPlan(names, columns, converters)
+
+
+class FastListSerializer(serializers.ListSerializer):
+    '''
+    Serializa listas direto de tuplas do values_list(),
+    sem passar pelo to_representation de cada campo.
+    '''
+
+    def to_representation(self, data):
+        plan = self.child.get_plan()
+
+        if plan is None:
+            return super().to_representation(data)
+
+        converters = plan.bind()
+        return [plan.row_to_dict(row, converters) for row in self.get_rows(data, plan)]
+
+    def get_rows(self, data, plan):
+        if isinstance(data, models.QuerySet):
+            if issubclass(data._iterable_class, ValuesListIterable):
+                return data
+            return data.values_list(*plan.columns)
+
+        return (
+            plan.instance_to_row(item) if isinstance(item, models.Model) else item
+            for item in data
+        )
+
+
+class FastModelSerializer(serializers.ModelSerializer):
+    '''
+    ModelSerializer com caminho rápido de leitura.
+
+    Pode ser usado como serializer_class em qualquer ModelViewSet:
+    a escrita continua sendo feita pelo ModelSerializer,
+    e a leitura usa um plano compilado uma única vez por classe.
+    '''
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        # Igual ao do DRF, mas usa o FastListSerializer como padrão.
+        allow_empty = kwargs.pop('allow_empty', None)
+        list_kwargs = {'child': cls(*args, **kwargs)}
+        if allow_empty is not None:
+            list_kwargs['allow_empty'] = allow_empty
+        list_kwargs.update({
+            key: value for key, value in kwargs.items()
+            if key in LIST_SERIALIZER_KWARGS
+        })
+        meta = getattr(cls, 'Meta', None)
+        list_serializer_class = getattr(meta, 'list_serializer_class', FastListSerializer)
+        return list_serializer_class(*args, **list_kwargs)
+
+    @classmethod
+    def get_fast_plan(cls):
+        if cls not in _fast_plans:
+            _fast_plans[cls] = compile_plan(cls())
+        return _fast_plans[cls]
+
+    def get_plan(self):
+        '''
+        Plano da classe ou, depois do sparse_serializer, o dos campos que sobraram.
+        '''
+        sparse_fields = getattr(self, 'sparse_fields', None)
+        if sparse_fields is None:
+            return self.get_fast_plan()
+
+        key = (type(self), sparse_fields)
+        if key not in _fast_plans:
+            _fast_plans[key] = compile_plan(self)
+        return _fast_plans[key]
+
+    @classmethod
+    def values_list(cls, queryset):
+        '''
+        Retorna o queryset como tuplas, na ordem das colunas do plano.
+        '''
+        plan = cls.get_fast_plan()
+        if plan is None:
+            return queryset
+        return queryset.values_list(*plan.columns)
+
+    def to_representation(self, instance):
+        plan = self.get_plan()
+
+        if plan is None:
+            return super().to_representation(instance)
+
+        if isinstance(instance, models.Model):
+            instance = plan.instance_to_row(instance)
+
+        return plan.row_to_dict(instance, plan.bind())
+
+
+class PrefetchPlan:
+    '''
+    Relações que o serializer precisa: select_related e prefetch_related.
+    '''
+
+    def __init__(self, select_related=(), prefetch_related=()):
+        self.select_related = list(select_related)
+        self.prefetch_related = list(prefetch_related)
+
+    def __bool__(self):
+        return bool(self.select_related or self.prefetch_related)
+
+    def apply(self, queryset):
+        # values() e values_list() não aceitam select_related.
+        if queryset._fields is not None:
+            return queryset
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
+
+
+def _needs_related_object(field):
+    if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+        return True
+    if isinstance(field, serializers.PrimaryKeyRelatedField):
+        return False
+    return isinstance(field, serializers.RelatedField)
+
+
+def _walk_relations(serializer, model, prefix, plan, many):
+    '''
+    Percorre os campos do serializer e anota as relações usadas.
+    FK e OneToOne viram select_related; M2M e FK reversa viram prefetch_related.
+    Tudo que fica abaixo de um prefetch também vai para o prefetch_related.
+    '''
+    meta = getattr(serializer, 'Meta', None)
+    for lookup in getattr(meta, 'select_related', ()):
+        target = plan.prefetch_related if many else plan.select_related
+        target.append(prefix + lookup)
+    for lookup in getattr(meta, 'prefetch_related', ()):
+        plan.prefetch_related.append(prefix + lookup)
+
+    for field in serializer._readable_fields:
+        if field.source == '*':
+            continue
+
+        path = field.source.split('.')
+        # 'user.email' precisa da relação 'user', mas não do campo 'email'.
+        # Já o PrimaryKeyRelatedField lê só a coluna seller_id.
+        if not _needs_related_object(field):
+            path = path[:-1]
+        if not path:
+            continue
+
+        current_model = model
+        current_many = many
+        lookup = prefix
+        for name in path:
+            try:
+                model_field = current_model._meta.get_field(name)
+            except FieldDoesNotExist:
+                break
+            if not model_field.is_relation:
+                break
+
+            lookup += name
+            current_many = current_many or model_field.many_to_many or model_field.one_to_many
+            current_model = model_field.related_model
+            target = plan.prefetch_related if current_many else plan.select_related
+            if lookup not in target:
+                target.append(lookup)
+            lookup += '__'
+        else:
+            child = getattr(field, 'child', field)
+            if isinstance(child, serializers.BaseSerializer) and hasattr(child, 'fields'):
+                _walk_relations(child, current_model, lookup, plan, current_many)
+
+
+def build_prefetch_plan(serializer):
+    '''
+    Monta o PrefetchPlan a partir da árvore de uma instância do serializer.
+    '''
+    plan = PrefetchPlan()
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    if model is not None:
+        _walk_relations(serializer, model, '', plan, many=False)
+    # Remove os prefixos já cobertos por caminhos mais longos do select_related.
+    plan.select_related = [
+        lookup for lookup in plan.select_related
+        if not any(other.startswith(lookup + '__') for other in plan.select_related)
+    ]
+    return plan
+
+
+def get_prefetch_plan(serializer_class):
+    '''
+    Monta o PrefetchPlan a partir da árvore do serializer,
+    incluindo os serializers aninhados e os gerados pelo Meta.depth.
+
+    O serializer também pode declarar relações extras no Meta:
+
+        class Meta:
+            select_related = ('user',)
+            prefetch_related = ('groups',)
+    '''
+    if serializer_class not in _prefetch_plans:
+        _prefetch_plans[serializer_class] = build_prefetch_plan(serializer_class())
+    return _prefetch_plans[serializer_class]
+
+
+def _get_target(serializer):
+    # Em listas (many=True) os campos ficam no child.
+    return getattr(serializer, 'child', serializer)
+
+
+def get_expandable_fields(serializer):
+    '''
+    Relações que ?expand= troca pelo serializer declarado no Meta:
+
+        class Meta:
+            expandable_fields = {'student': StudentSerializer}
+    '''
+    target = _get_target(serializer)
+    expandable = getattr(getattr(target, 'Meta', None), 'expandable_fields', {})
+    return {name: serializer_class for name, serializer_class in expandable.items() if name in target.fields}
+
+
+def get_nested_models(serializer):
+    '''
+    Models dos serializers aninhados, inclusive os trocados por ?expand=.
+    '''
+    models = []
+    for field in _get_target(serializer).fields.values():
+        target = _get_target(field)
+        if not isinstance(target, serializers.Serializer):
+            continue
+        model = getattr(getattr(target, 'Meta', None), 'model', None)
+        for nested in ([model] if model is not None else []) + get_nested_models(target):
+            if nested not in models:
+                models.append(nested)
+    return models
+
+
+def get_field_names(serializer, expand=True):
+    '''
+    Nomes aceitos em ?fields=, com "relação.campo" para os serializers aninhados
+    e para os de Meta.expandable_fields.
+    '''
+    target = _get_target(serializer)
+    expandable = get_expandable_fields(target) if expand else {}
+    names = []
+
+    for name, field in target.fields.items():
+        if field.write_only:
+            continue
+        names.append(name)
+
+        if name in expandable:
+            field = expandable[name](read_only=True)
+        if isinstance(_get_target(field), serializers.Serializer):
+            names.extend(f'{name}.{nested}' for nested in get_field_names(field, expand=False))
+    return names
+
+
+def parse_sparse_fields(names):
+    '''
+    ('id', 'category.title') -> {'id': None, 'category': {'title': None}}.
+    None quer dizer todos os campos; o nome sem ponto vence o com ponto.
+    '''
+    tree = {}
+    for name in names:
+        head, _, rest = name.partition('.')
+        if not rest:
+            tree[head] = None
+        elif tree.get(head, []) is not None:
+            tree.setdefault(head, []).append(rest)
+
+    return {
+        name: None if nested is None else parse_sparse_fields(nested)
+        for name, nested in tree.items()
+    }
+
+
+def sparse_serializer(serializer, fields=None, expand=()):
+    '''
+    Deixa no serializer só os campos de fields (veja parse_sparse_fields; None = todos)
+    e troca as relações de expand pelo serializer de Meta.expandable_fields.
+    "relação.campo" de uma relação expansível também a expande.
+    '''
+    target = _get_target(serializer)
+    expandable = get_expandable_fields(target)
+    expand = set(expand)
+    if fields is not None:
+        expand.update(name for name, nested in fields.items() if nested is not None and name in expandable)
+
+    for name in expand:
+        target.fields[name] = expandable[name](read_only=True)
+
+    if fields is not None:
+        for name in list(target.fields):
+            if name not in fields:
+                del target.fields[name]
+
+        for name, nested in fields.items():
+            if nested is not None:
+                sparse_serializer(target.fields[name], nested)
+
+    # Usado pelo FastModelSerializer para compilar o plano dos campos restantes.
+    target.sparse_fields = (tuple(target.fields), tuple(sorted(expand)))
+    return serializer
+
+
+def get_only_fields(serializer, model, prefix=''):
+    '''
+    Caminhos para o only() com as colunas que o serializer lê,
+    inclusive as dos serializers aninhados em FK.
+    Retorna None se algum campo não vier de uma coluna (source='*', propriedades etc.).
+    '''
+    target = _get_target(serializer)
+    only = [prefix + model._meta.pk.name]
+
+    meta = getattr(target, 'Meta', None)
+    for lookup in getattr(meta, 'select_related', ()):
+        only.append(prefix + lookup)
+
+    for field in target._readable_fields:
+        if field.source == '*':
+            return None
+
+        current_model = model
+        lookup = prefix
+        for name in field.source.split('.'):
+            try:
+                model_field = current_model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if model_field.many_to_many or model_field.one_to_many:
+                # Vem do prefetch_related, sem coluna nesta tabela.
+                break
+            if not model_field.concrete:
+                return None
+
+            lookup += name
+            only.append(lookup)
+            if not model_field.is_relation:
+                break
+            current_model = model_field.related_model
+            lookup += '__'
+        else:
+            if isinstance(_get_target(field), serializers.BaseSerializer):
+                nested = get_only_fields(field, current_model, lookup)
+                if nested is None:
+                    return None
+                only.extend(nested)
+
+    return only
@@ -0,0 +1,15 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from backend.core.db.pool import get_pool_stats
+
+
+class DatabasePoolView(APIView):
+    '''
+    Métricas dos pools de conexão deste processo.
+    '''
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, format=None):
+        return Response(get_pool_stats())
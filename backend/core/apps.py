@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.core'
+
+    def ready(self):
+        # Conecta os sinais que invalidam os caches de autenticação, grupos,
+        # permissões e as versões dos models.
+        from backend.core import checks, groups, versions  # noqa: F401
+        from backend.core.api import authentication  # noqa: F401
@@ -0,0 +1,17 @@
+from django.contrib.auth.backends import ModelBackend
+
+from backend.core.groups import get_user_permissions
+
+
+class CachedModelBackend(ModelBackend):
+    '''
+    ModelBackend que lê as permissões do cache de grupos e permissões,
+    em vez de fazer duas queries por requisição (DjangoModelPermissions).
+    '''
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if user_obj.is_superuser:
+            return super().get_all_permissions(user_obj, obj=obj)
+        return set(get_user_permissions(user_obj))
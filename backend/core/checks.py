@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core import checks
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def uses_local_cache():
+    return settings.CACHES.get('default', {}).get('BACKEND') in LOCAL_CACHE_BACKENDS
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    '''
+    As versões dos models e as invalidações de autenticação e grupos
+    precisam chegar a todos os processos.
+    '''
+    if uses_local_cache() and getattr(settings, 'WEB_CONCURRENCY', 1) > 1:
+        return [checks.Error(
+            'O cache padrão é local ao processo, mas WEB_CONCURRENCY é maior que 1.',
+            hint='Defina REDIS_URL: os outros processos não veriam as alterações '
+                 'e continuariam enviando ETags e respostas em cache antigas.',
+            id='core.E001',
+        )]
+    return []
+
+
+@checks.register(checks.Tags.caches, deploy=True)
+def check_shared_cache_deploy(app_configs, **kwargs):
+    if uses_local_cache():
+        return [checks.Warning(
+            'O cache padrão é local ao processo.',
+            hint='Defina REDIS_URL se houver mais de um processo ou servidor.',
+            id='core.W002',
+        )]
+    return []
@@ -0,0 +1,236 @@
+import atexit
+import threading
+import time
+from collections import deque
+
+import psycopg2
+from psycopg2 import extensions
+
+DEFAULT_POOL_SETTINGS = {
+    'MIN_SIZE': 2,
+    'MAX_SIZE': 20,
+    # Segundos esperando uma conexão livre antes de desistir.
+    'TIMEOUT': 10,
+    # Conexões paradas há mais tempo que isso são fechadas (acima do MIN_SIZE).
+    'MAX_IDLE': 300,
+    # Conexões paradas há mais tempo que isso recebem um SELECT 1 antes de serem usadas.
+    'HEALTH_CHECK_INTERVAL': 30,
+    # DISCARD ALL ao devolver: limpa cursores WITH HOLD, SETs e prepared statements.
+    'RESET_ON_RETURN': True,
+}
+
+
+class PoolTimeout(psycopg2.OperationalError):
+    pass
+
+
+class ConnectionPool:
+    '''
+    Pool de conexões psycopg2 seguro entre threads.
+
+    Cada thread (ou tarefa, no ASGI) pega uma conexão no connect()
+    do Django e a devolve no close(), ao fim da requisição.
+    '''
+
+    def __init__(self, conn_params, min_size, max_size, timeout, max_idle, health_check_interval, reset_on_return):
+        self.conn_params = conn_params
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.health_check_interval = health_check_interval
+        self.reset_on_return = reset_on_return
+
+        self.idle = deque()
+        self.size = 0
+        self.condition = threading.Condition()
+        self.metrics = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'timeouts': 0,
+            'created': 0,
+            'closed': 0,
+            'health_check_failures': 0,
+        }
+
+    def count(self, name, value=1):
+        with self.condition:
+            self.metrics[name] += value
+
+    def connect(self):
+        connection = psycopg2.connect(**self.conn_params)
+        self.count('created')
+        return connection
+
+    def discard(self, connection):
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+        with self.condition:
+            self.size -= 1
+            self.metrics['closed'] += 1
+            self.condition.notify()
+
+    def is_healthy(self, connection, idle_since):
+        if connection.closed:
+            return False
+        if time.monotonic() - idle_since < self.health_check_interval:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            if connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def getconn(self):
+        start = time.monotonic()
+        waited = False
+
+        with self.condition:
+            while not self.idle and self.size >= self.max_size:
+                waited = True
+                remaining = self.timeout - (time.monotonic() - start)
+                if remaining <= 0 or not self.condition.wait(remaining):
+                    if not self.idle and self.size >= self.max_size:
+                        self.metrics['timeouts'] += 1
+                        raise PoolTimeout(
+                            f'Nenhuma conexão livre no pool após {self.timeout}s '
+                            f'({self.max_size} em uso).'
+                        )
+
+            self.metrics['checkouts'] += 1
+            if waited:
+                self.metrics['waits'] += 1
+                self.metrics['wait_time'] += time.monotonic() - start
+
+            if self.idle:
+                connection, idle_since = self.idle.pop()
+            else:
+                connection = None
+                self.size += 1
+
+        if connection is not None:
+            if self.is_healthy(connection, idle_since):
+                return connection
+            self.count('health_check_failures')
+            self.discard(connection)
+            with self.condition:
+                self.size += 1
+
+        try:
+            return self.connect()
+        except Exception:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+
+    def reset(self, connection):
+        status = connection.info.transaction_status
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            connection.rollback()
+        if self.reset_on_return:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute('DISCARD ALL')
+        return True
+
+    def putconn(self, connection):
+        try:
+            usable = not connection.closed and self.reset(connection)
+        except psycopg2.Error:
+            usable = False
+
+        if not usable:
+            self.discard(connection)
+            return
+
+        now = time.monotonic()
+        expired = []
+        with self.condition:
+            self.idle.append((connection, now))
+            # As mais antigas ficam no começo da fila.
+            while len(self.idle) > self.min_size and now - self.idle[0][1] > self.max_idle:
+                expired.append(self.idle.popleft()[0])
+            self.condition.notify()
+
+        for old in expired:
+            self.discard(old)
+
+    def closeall(self):
+        with self.condition:
+            idle = [connection for connection, _ in self.idle]
+            self.idle.clear()
+        for connection in idle:
+            self.discard(connection)
+
+    def stats(self):
+        with self.condition:
+            idle = len(self.idle)
+            stats = {
+                'size': self.size,
+                'idle': idle,
+                'in_use': self.size - idle,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+            }
+            stats.update(self.metrics)
+        return stats
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, conn_params, pool_settings):
+    '''
+    Um pool por alias e parâmetros de conexão
+    (os testes trocam o NAME, e o _nodb_cursor conecta no banco "postgres").
+    '''
+    key = (alias, tuple(sorted((name, str(value)) for name, value in conn_params.items())))
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        if key not in _pools:
+            options = {**DEFAULT_POOL_SETTINGS, **pool_settings}
+            _pools[key] = ConnectionPool(
+                conn_params,
+                min_size=options['MIN_SIZE'],
+                max_size=options['MAX_SIZE'],
+                timeout=options['TIMEOUT'],
+                max_idle=options['MAX_IDLE'],
+                health_check_interval=options['HEALTH_CHECK_INTERVAL'],
+                reset_on_return=options['RESET_ON_RETURN'],
+            )
+        return _pools[key]
+
+
+def get_pool_stats():
+    '''
+    Métricas de cada pool, por alias e banco.
+    '''
+    return {
+        f"{alias}:{dict(params).get('database')}": pool.stats()
+        for (alias, params), pool in list(_pools.items())
+    }
+
+
+def close_pools(database=None):
+    '''
+    Fecha as conexões livres dos pools (de um banco só, se informado).
+    '''
+    for (alias, params), pool in list(_pools.items()):
+        if database is None or dict(params).get('database') == database:
+            pool.closeall()
+
+
+atexit.register(close_pools)
@@ -0,0 +1,50 @@
+import psycopg2.extras
+from django.db.backends.postgresql import base
+
+from backend.core.db.pool import get_pool
+
+from .creation import DatabaseCreation
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    '''
+    Backend PostgreSQL com pool de conexões.
+
+    Use com CONN_MAX_AGE = 0: o Django fecha a conexão ao fim de cada requisição
+    e o close() a devolve ao pool, em vez de encerrá-la.
+    As opções ficam em DATABASES['default']['POOL'] (veja DEFAULT_POOL_SETTINGS).
+    '''
+    creation_class = DatabaseCreation
+
+    def get_pool(self, conn_params):
+        return get_pool(self.alias, conn_params, self.settings_dict.get('POOL', {}))
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        if self.timezone_name:
+            # Fuso como padrão da sessão: sobrevive ao DISCARD ALL
+            # e evita o SET TIME ZONE a cada conexão emprestada.
+            options = conn_params.get('options', '')
+            conn_params['options'] = f'{options} -c TimeZone={self.timezone_name}'.strip()
+        return conn_params
+
+    def get_new_connection(self, conn_params):
+        self.pool = self.get_pool(conn_params)
+        connection = self.pool.getconn()
+
+        # Mesmo ajuste do backend padrão, feito em cada conexão emprestada.
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.putconn(self.connection)
@@ -0,0 +1,19 @@
+from django.db.backends.postgresql import creation
+
+from backend.core.db.pool import close_pools
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+    '''
+    CREATE DATABASE ... TEMPLATE e DROP DATABASE falham
+    se houver conexões abertas no banco, inclusive as livres no pool.
+    '''
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        self.connection.close()
+        close_pools(self.connection.settings_dict['NAME'])
+        super()._clone_test_db(suffix, verbosity, keepdb=keepdb)
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        close_pools(test_database_name)
+        super()._destroy_test_db(test_database_name, verbosity)
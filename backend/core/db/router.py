@@ -0,0 +1,74 @@
+import random
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Leituras podem ir para uma réplica? Ligado pelo ReplicaMiddleware
+# somente em requisições GET/HEAD/OPTIONS de clientes que não escreveram há pouco.
+_replica_allowed = ContextVar('replica_allowed', default=False)
+
+
+def get_replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+@contextmanager
+def allow_replica(allowed=True):
+    token = _replica_allowed.set(allowed)
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+def use_primary():
+    '''
+    Força leituras no banco principal dentro do bloco:
+
+        with use_primary():
+            ...
+    '''
+    return allow_replica(False)
+
+
+def primary_after_write(timestamp):
+    '''
+    Força o principal se houve escrita (timestamp em segundos) há menos de REPLICA_PIN_SECONDS.
+
+    As réplicas podem ainda não ter a escrita, e o que fosse lido delas
+    iria para o cache ou receberia o ETag da versão nova.
+    '''
+    if time.time() - timestamp < settings.REPLICA_PIN_SECONDS:
+        return use_primary()
+    return nullcontext()
+
+
+class PrimaryReplicaRouter:
+    '''
+    Escritas vão para o default. Leituras vão para uma das réplicas em
+    DATABASE_REPLICAS só quando liberadas (ContextVar, vale para threads e tarefas async).
+
+    POST/PUT/PATCH/DELETE, e portanto perform_create/perform_update,
+    nunca liberam as réplicas: o get_object() e as validações leem do principal.
+    '''
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if replicas and _replica_allowed.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Todas as réplicas têm os mesmos dados do principal.
+        databases = {'default', *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replicas()
@@ -0,0 +1,125 @@
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from backend.core.versions import now_and_on_commit
+
+ACCESS_CACHE_TIMEOUT = 60 * 10
+
+ACCESS_KINDS = ('groups', 'permissions')
+
+
+def access_cache_key(kind, user_id):
+    return f'user-{kind}:{user_id}'
+
+
+def load_groups(user):
+    return frozenset(user.groups.values_list('name', flat=True))
+
+
+def load_permissions(user):
+    '''
+    Permissões ("app.codename") do usuário, diretas ou herdadas dos grupos.
+    '''
+    permissions = Permission.objects.filter(
+        Q(user=user) | Q(group__user=user)
+    ).values_list('content_type__app_label', 'codename').distinct()
+    return frozenset(f'{app_label}.{codename}' for app_label, codename in permissions)
+
+
+def get_user_access(user, kind, loader):
+    '''
+    Grupos ou permissões do usuário.
+
+    Ficam guardados no próprio objeto user, que é o mesmo durante toda a requisição,
+    e no cache compartilhado, que é invalidado pelos sinais abaixo.
+    '''
+    if user is None or not user.is_authenticated:
+        return frozenset()
+
+    access = user.__dict__.setdefault('_access_cache', {})
+    if kind in access:
+        return access[kind]
+
+    key = access_cache_key(kind, user.pk)
+    value = cache.get(key)
+    if value is None:
+        value = loader(user)
+        cache.set(key, value, ACCESS_CACHE_TIMEOUT)
+
+    access[kind] = value
+    return value
+
+
+def get_user_groups(user):
+    return get_user_access(user, 'groups', load_groups)
+
+
+def get_user_permissions(user):
+    return get_user_access(user, 'permissions', load_permissions)
+
+
+def in_group(user, group_name):
+    return group_name in get_user_groups(user)
+
+
+def invalidate_user_access(user_ids):
+    keys = [
+        access_cache_key(kind, user_id)
+        for user_id in user_ids
+        for kind in ACCESS_KINDS
+    ]
+    now_and_on_commit(lambda: cache.delete_many(keys))
+
+
+def group_user_ids(groups):
+    return User.objects.filter(groups__in=groups).values_list('pk', flat=True).distinct()
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_access_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    '''
+    user.groups.add(...), group.user_set.add(...), user.user_permissions.add(...) etc.
+    O clear() não informa o pk_set, então os usuários são lidos antes (pre_clear).
+    '''
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        # instance é o usuário.
+        instance.__dict__.pop('_access_cache', None)
+        invalidate_user_access([instance.pk])
+    elif pk_set is not None:
+        invalidate_user_access(pk_set)
+    else:
+        invalidate_user_access(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if not reverse:
+        # instance é o grupo.
+        groups = [instance.pk]
+    elif pk_set is not None:
+        groups = pk_set
+    else:
+        groups = instance.group_set.values_list('pk', flat=True)
+
+    invalidate_user_access(group_user_ids(groups))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def group_changed(sender, instance, **kwargs):
+    '''
+    Renomear ou apagar um grupo muda os nomes guardados de todos os seus usuários.
+    '''
+    if kwargs.get('created'):
+        return
+    invalidate_user_access(group_user_ids([instance.pk]))
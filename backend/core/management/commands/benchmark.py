@@ -0,0 +1,393 @@
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+from urllib.request import Request, urlopen
+
+import django
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.core.wsgi import get_wsgi_application
+from django.db import close_old_connections, connection, connections
+from django.test import AsyncClient, Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext, modify_settings
+from rest_framework.authtoken.models import Token
+
+from backend.core.search import update_search_vector
+from backend.crm.models import Customer
+from backend.crm.summaries import rebuild_summaries
+from backend.hotel.models import Hotel
+from backend.movie.models import Category, Movie
+from backend.school.models import Classroom, Grade, Student
+from backend.todo.models import Todo
+from backend.video.models import Video
+
+BATCH_SIZE = 5000
+
+
+def seed(rows, random):
+    '''
+    Cria um conjunto de dados fixo, com `rows` registros nas tabelas principais.
+    A mesma semente gera sempre os mesmos dados.
+    '''
+    categories = Category.objects.bulk_create(
+        Category(title=f'Categoria {i}') for i in range(20)
+    )
+    Movie.objects.bulk_create(
+        (
+            Movie(
+                title=f'Filme {i}',
+                sinopse='Lorem ipsum dolor sit amet. ' * random.randint(1, 8),
+                rating=random.randint(1, 5),
+                like=random.random() > 0.5,
+                censure=random.choice((0, 10, 12, 14, 16, 18)),
+                category=random.choice(categories),
+            )
+            for i in range(rows)
+        ),
+        batch_size=BATCH_SIZE
+    )
+    Hotel.objects.bulk_create(
+        (Hotel(name=f'Hotel {i}') for i in range(rows)),
+        batch_size=BATCH_SIZE
+    )
+    Video.objects.bulk_create(
+        (Video(title=f'Video {i}', release_year=random.randint(1950, 2022)) for i in range(rows)),
+        batch_size=BATCH_SIZE
+    )
+    User.objects.bulk_create(
+        (User(username=f'bench{i}', first_name=f'Nome {i}', last_name='Sobrenome') for i in range(rows)),
+        batch_size=BATCH_SIZE
+    )
+    users = list(User.objects.filter(username__startswith='bench').order_by('id'))
+    customers = [
+        Customer(
+            user=user,
+            seller=random.choice(users),
+            rg=str(random.randint(10 ** 8, 10 ** 9 - 1)),
+            cpf=str(random.randint(10 ** 10, 10 ** 11 - 1)),
+            cep=str(random.randint(10 ** 7, 10 ** 8 - 1)),
+        )
+        for user in users
+    ]
+    for customer in customers:
+        customer.update_derived_fields()
+    Customer.objects.bulk_create(customers, batch_size=BATCH_SIZE)
+    update_search_vector(Customer.objects.all())
+    rebuild_summaries()
+    Todo.objects.bulk_create(
+        (Todo(task=f'Tarefa {i}', created_by=random.choice(users)) for i in range(rows)),
+        batch_size=BATCH_SIZE
+    )
+    Student.objects.bulk_create(
+        (Student(registration=str(i), first_name=f'Aluno {i}', last_name='Sobrenome') for i in range(rows)),
+        batch_size=BATCH_SIZE
+    )
+    students = list(Student.objects.order_by('id'))
+    Grade.objects.bulk_create(
+        (Grade(student=student, note=random.randint(0, 1000) / 100) for student in students),
+        batch_size=BATCH_SIZE
+    )
+    classrooms = Classroom.objects.bulk_create(
+        Classroom(title=f'Sala {i}') for i in range(max(rows // 100, 1))
+    )
+    Through = Classroom.students.through
+    Through.objects.bulk_create(
+        (
+            Through(classroom=classrooms[index % len(classrooms)], student=student)
+            for index, student in enumerate(students)
+        ),
+        batch_size=BATCH_SIZE
+    )
+
+
+def get_endpoints():
+    '''
+    Retorna a lista de (nome, método, url, corpo) a serem medidos.
+    '''
+    movie = Movie.objects.order_by('id').first()
+    customer = Customer.objects.order_by('id').first()
+    hotel = Hotel.objects.order_by('id').first()
+    todo = Todo.objects.order_by('id').first()
+    video = Video.objects.order_by('id').first()
+
+    return [
+        ('movie-list', 'GET', '/api/v1/movies/', None),
+        ('movie-detail', 'GET', f'/api/v1/movies/{movie.pk}/', None),
+        ('movie-get-good-movies', 'GET', '/api/v1/movies/get_good_movies/', None),
+        ('movie-movies-readonly', 'GET', '/api/v1/movies/movies_readonly/', None),
+        ('movie-movies-regular-readonly', 'GET', '/api/v1/movies/movies_regular_readonly/', None),
+        ('movie-movies-fast-readonly', 'GET', '/api/v1/movies/movies_fast_readonly/', None),
+        ('category-list', 'GET', '/api/v1/categories/', None),
+        ('customer-list', 'GET', '/api/v1/customers/', None),
+        ('customer-detail', 'GET', f'/api/v1/customers/{customer.pk}/', None),
+        ('hotel-list', 'GET', '/api/v1/hotels/', None),
+        ('hotel-detail', 'GET', f'/api/v1/hotels/{hotel.pk}/', None),
+        ('todo-list', 'GET', '/api/v1/todos/', None),
+        ('todo-detail', 'GET', f'/api/v1/todos/{todo.pk}/', None),
+        ('classroom-list', 'GET', '/api/v1/classrooms/', None),
+        ('grade-list', 'GET', '/api/v1/grades/', None),
+        ('video-detail', 'GET', f'/api/v1/videos/{video.pk}/', None),
+        # Views async, para comparar com as versões sync acima no modo asgi.
+        ('movie-list-async', 'GET', '/api/v1/async/movies/', None),
+        ('movie-detail-async', 'GET', f'/api/v1/async/movies/{movie.pk}/', None),
+        ('hotel-list-async', 'GET', '/api/v1/async/hotels/', None),
+        ('hotel-detail-async', 'GET', f'/api/v1/async/hotels/{hotel.pk}/', None),
+        ('video-detail-async', 'GET', f'/api/v1/async/videos/{video.pk}/', None),
+        ('category-create', 'POST', '/api/v1/categories/', {'title': 'Nova'}),
+        ('hotel-create', 'POST', '/api/v1/hotels/', {
+            'name': 'Novo',
+            'start_date': '2022-01-01',
+            'end_date': '2022-01-10',
+        }),
+        ('movie-create', 'POST', '/api/v1/movies/', {
+            'title': 'Novo',
+            'sinopse': 'Sinopse',
+            'rating': 5,
+            'like': True,
+            'censure': 10,
+            'category': {'title': 'Categoria 1'},
+        }),
+    ]
+
+
+def summarize(latencies, sizes, queries, elapsed):
+    '''
+    Calcula p50/p95/p99 (ms), vazão (req/s), queries e bytes por requisição.
+    '''
+    latencies = sorted(latencies)
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+        p50, p95, p99 = quantiles[49], quantiles[94], quantiles[98]
+    else:
+        p50 = p95 = p99 = latencies[0]
+
+    result = {
+        'requests': len(latencies),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'bytes_per_response': round(statistics.mean(sizes)),
+    }
+    if queries is not None:
+        result['queries_per_request'] = round(statistics.mean(queries), 2)
+    return result
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark dos endpoints da API com dados fixos."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            action='append',
+            help='Quantidade de registros por tabela. Pode ser repetido (padrão: 10000).'
+        )
+        parser.add_argument('--requests', type=int, default=50, help='Requisições por endpoint.')
+        parser.add_argument('--concurrency', type=int, default=8, help='Clientes simultâneos nos modos HTTP e ASGI.')
+        parser.add_argument('--endpoint', action='append', help='Mede somente estes endpoints.')
+        parser.add_argument('--seed', type=int, default=42, help='Semente dos dados gerados.')
+        parser.add_argument('--output', help='Salva o resultado em JSON neste arquivo.')
+        parser.add_argument('--keepdb', action='store_true', help='Mantém o banco de teste entre execuções.')
+
+    def handle(self, *args, **options):
+        # Usa um banco de teste, para não tocar nos dados reais.
+        runner = DiscoverRunner(verbosity=0, keepdb=options['keepdb'], interactive=False)
+        runner.setup_test_environment()
+        old_config = runner.setup_databases()
+
+        try:
+            report = {
+                'meta': self.get_meta(options),
+                'results': {},
+            }
+            for rows in options['rows'] or [10000]:
+                report['results'][str(rows)] = self.run(rows, options)
+        finally:
+            # O DROP DATABASE falha com conexões abertas.
+            connections.close_all()
+            runner.teardown_databases(old_config)
+            runner.teardown_test_environment()
+
+        output = json.dumps(report, indent=2, sort_keys=True)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(output + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Resultado salvo em {options['output']}."))
+        else:
+            self.stdout.write(output)
+
+    def get_meta(self, options):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+
+        return {
+            'commit': commit,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'requests': options['requests'],
+            'concurrency': options['concurrency'],
+            'seed': options['seed'],
+        }
+
+    def run(self, rows, options):
+        self.stderr.write(f'Criando {rows} registros por tabela...')
+        call_command('flush', interactive=False, verbosity=0)
+        seed(rows, Random(options['seed']))
+
+        user = User.objects.create_superuser(username='benchmark', password='benchmark')
+        token = Token.objects.create(user=user)
+        headers = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+
+        endpoints = get_endpoints()
+        if options['endpoint']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in options['endpoint']]
+
+        results = {}
+        for name, method, url, body in endpoints:
+            self.stderr.write(f'  {name}')
+            results[name] = {
+                'wsgi': self.run_wsgi(method, url, body, headers, options['requests']),
+                'http': self.run_http(method, url, body, token.key, options),
+                'asgi': asyncio.run(self.run_asgi(method, url, body, token.key, options)),
+            }
+        return results
+
+    def run_wsgi(self, method, url, body, headers, total):
+        '''
+        Chama a aplicação WSGI no mesmo processo, uma requisição por vez.
+        '''
+        client = Client(**headers)
+        latencies, sizes, queries = [], [], []
+
+        start = time.perf_counter()
+        for _ in range(total):
+            with CaptureQueriesContext(connection) as context:
+                request_start = time.perf_counter()
+                if method == 'GET':
+                    response = client.get(url)
+                else:
+                    response = client.generic(method, url, json.dumps(body), content_type='application/json')
+                latencies.append(time.perf_counter() - request_start)
+
+            if response.status_code >= 400:
+                raise RuntimeError(f'{method} {url} retornou {response.status_code}.')
+
+            sizes.append(len(response.content))
+            queries.append(len(context))
+
+        return summarize(latencies, sizes, queries, time.perf_counter() - start)
+
+    async def run_asgi(self, method, url, body, token, options):
+        '''
+        Chama a aplicação ASGI no mesmo processo, com requisições simultâneas no event loop.
+        Views sync passam por uma thread; as async só usam thread nas queries.
+        '''
+        client = AsyncClient()
+        # No AsyncClient os cabeçalhos extras vão com o nome HTTP, e não no formato do META.
+        headers = {'authorization': f'Token {token}'}
+        semaphore = asyncio.Semaphore(options['concurrency'])
+        data = json.dumps(body) if body is not None else None
+
+        async def fetch():
+            async with semaphore:
+                request_start = time.perf_counter()
+                if method == 'GET':
+                    response = await client.get(url, **headers)
+                else:
+                    response = await client.generic(method, url, data, content_type='application/json', **headers)
+                latency = time.perf_counter() - request_start
+
+            # O AsyncClient não fecha as conexões no request_finished, como o ASGIHandler faz.
+            # As views e as queries rodam na thread do sync_to_async, e é nela que a conexão fica.
+            await sync_to_async(close_old_connections)()
+
+            if response.status_code >= 400:
+                raise RuntimeError(f'{method} {url} retornou {response.status_code}.')
+            return latency, len(response.content)
+
+        start = time.perf_counter()
+        try:
+            results = await asyncio.gather(*(fetch() for _ in range(options['requests'])))
+            elapsed = time.perf_counter() - start
+        finally:
+            await sync_to_async(connections.close_all)()
+
+        latencies = [latency for latency, _ in results]
+        sizes = [size for _, size in results]
+        return summarize(latencies, sizes, None, elapsed)
+
+    def run_http(self, method, url, body, token, options):
+        '''
+        Sobe um servidor WSGI com threads e faz requisições simultâneas por HTTP.
+        '''
+        # O SQLite em memória só existe na conexão atual, então ela é compartilhada.
+        connections_override = {}
+        for conn in connections.all():
+            if conn.vendor == 'sqlite' and conn.is_in_memory_db():
+                conn.inc_thread_sharing()
+                connections_override[conn.alias] = conn
+
+        server = ThreadedWSGIServer(
+            ('127.0.0.1', 0),
+            QuietWSGIRequestHandler,
+            allow_reuse_address=False,
+            connections_override=connections_override,
+        )
+        server.set_app(get_wsgi_application())
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        base_url = f'http://127.0.0.1:{server.server_port}'
+        data = json.dumps(body).encode('utf-8') if body is not None else None
+
+        def fetch(_):
+            request = Request(base_url + url, data=data, method=method)
+            request.add_header('Authorization', f'Token {token}')
+            request.add_header('Content-Type', 'application/json')
+            request_start = time.perf_counter()
+            with urlopen(request) as response:
+                content = response.read()
+            return time.perf_counter() - request_start, len(content)
+
+        try:
+            start = time.perf_counter()
+            with modify_settings(ALLOWED_HOSTS={'append': '127.0.0.1'}):
+                with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+                    results = list(executor.map(fetch, range(options['requests'])))
+            elapsed = time.perf_counter() - start
+        finally:
+            server.shutdown()
+            server.server_close()
+            thread.join()
+            for conn in connections_override.values():
+                conn.dec_thread_sharing()
+
+        latencies = [latency for latency, _ in results]
+        sizes = [size for _, size in results]
+        return summarize(latencies, sizes, None, elapsed)
@@ -6,7 +6,9 @@ from django.core.management.base import BaseCommand
 from django.utils.text import slugify
 from faker import Faker
 
+from backend.core.search import update_search_vector
 from backend.crm.models import Customer
+from backend.crm.summaries import rebuild_summaries
 
 fake = Faker()
 
@@ -50,8 +52,11 @@ def create_persons():
     for _ in range(6):
         data = get_person()
         obj = Customer(**data)
+        obj.update_derived_fields()
         aux_list.append(obj)
-    Customer.objects.bulk_create(aux_list)
+    customers = Customer.objects.bulk_create(aux_list)
+    update_search_vector(Customer.objects.filter(pk__in=[obj.pk for obj in customers]))
+    rebuild_summaries()
 
 
 def add_permissions(group_name, permissions):
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+
+from backend.core.db.router import allow_replica, get_replicas
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PRIMARY_COOKIE = 'use_primary_until'
+# Clientes da API sem cookies podem mandar "X-Use-Primary: 1" depois de escrever.
+PRIMARY_HEADER = 'HTTP_X_USE_PRIMARY'
+
+
+def replica_allowed(request):
+    if request.method not in SAFE_METHODS or request.META.get(PRIMARY_HEADER):
+        return False
+    try:
+        until = float(request.COOKIES.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        return True
+    return until < time.time()
+
+
+def pin_primary(request, response):
+    '''
+    Depois de uma escrita o cliente lê do principal por REPLICA_PIN_SECONDS,
+    para ver o que acabou de gravar mesmo com atraso nas réplicas.
+    '''
+    if request.method in SAFE_METHODS or response.status_code >= 400 or not get_replicas():
+        return
+    seconds = settings.REPLICA_PIN_SECONDS
+    response.set_cookie(PRIMARY_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True, samesite='Lax')
+
+
+@sync_and_async_middleware
+def replica_middleware(get_response):
+    '''
+    Libera as réplicas de leitura para GET/HEAD/OPTIONS (veja PrimaryReplicaRouter).
+    '''
+    if asyncio.iscoroutinefunction(get_response):
+        async def middleware(request):
+            with allow_replica(replica_allowed(request)):
+                response = await get_response(request)
+            pin_primary(request, response)
+            return response
+    else:
+        def middleware(request):
+            with allow_replica(replica_allowed(request)):
+                response = get_response(request)
+            pin_primary(request, response)
+            return response
+
+    return middleware
@@ -0,0 +1,106 @@
+'''
+Documento de busca desnormalizado.
+
+Em vez de ILIKE '%termo%' em várias colunas (e tabelas), cada registro guarda
+as palavras dos campos pesquisáveis em uma coluna de texto (search_document)
+e, no PostgreSQL, em um tsvector (search_vector) com índice GIN.
+'''
+import re
+import unicodedata
+
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector
+)
+from django.db import connections, router
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Cast
+
+SEARCH_CONFIG = 'simple'
+
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def search_words(text):
+    '''
+    Palavras do texto em minúsculas e sem acentos.
+    '''
+    text = unicodedata.normalize('NFKD', str(text))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return WORD_RE.findall(text.lower())
+
+
+def get_path(obj, path):
+    '''
+    Segue um caminho como "user__first_name"; None se algum passo for nulo.
+    '''
+    for name in path.split('__'):
+        if obj is None:
+            return None
+        obj = getattr(obj, name)
+    return obj
+
+
+def build_search_document(obj, fields):
+    words = []
+    for path in fields:
+        value = get_path(obj, path)
+        if value:
+            words.extend(search_words(value))
+    return ' '.join(words)
+
+
+def is_postgresql(model):
+    return connections[router.db_for_write(model)].vendor == 'postgresql'
+
+
+def update_search_vector(queryset, document_field='search_document', vector_field='search_vector'):
+    '''
+    Recalcula o tsvector a partir do documento (só no PostgreSQL).
+    '''
+    if is_postgresql(queryset.model):
+        queryset.update(**{vector_field: SearchVector(document_field, config=SEARCH_CONFIG)})
+
+
+def update_search_documents(queryset, fields, document_field='search_document', vector_field='search_vector'):
+    '''
+    Recalcula o documento dos registros do queryset;
+    use depois de bulk_create, bulk_update e QuerySet.update(), que não enviam sinais.
+    '''
+    objs = list(queryset)
+    for obj in objs:
+        setattr(obj, document_field, build_search_document(obj, fields))
+    queryset.model.objects.bulk_update(objs, [document_field])
+    update_search_vector(
+        queryset.model.objects.filter(pk__in=[obj.pk for obj in objs]),
+        document_field,
+        vector_field,
+    )
+
+
+def search_queryset(queryset, words, document_field='search_document', vector_field='search_vector',
+                    rank_alias='search_rank'):
+    '''
+    Filtra pelas palavras (veja search_words) e anota a relevância em rank_alias.
+
+    No PostgreSQL cada palavra é buscada como prefixo no tsvector (índice GIN),
+    ou a frase como trecho do documento (índice de trigramas).
+    Nos outros bancos usa LIKE no documento, e a relevância é sempre 0.
+    '''
+    if not is_postgresql(queryset.model):
+        for word in words:
+            queryset = queryset.filter(**{f'{document_field}__contains': word})
+        return queryset.annotate(**{rank_alias: Value(0.0, output_field=FloatField())})
+
+    # Palavras só com letras e números, então não precisam de escape no tsquery.
+    query = SearchQuery(
+        ' & '.join(f'{word}:*' for word in words),
+        search_type='raw',
+        config=SEARCH_CONFIG,
+    )
+    condition = Q(**{vector_field: query}) | Q(**{f'{document_field}__contains': ' '.join(words)})
+    # ts_rank devolve real (float4); em double precision o valor guardado no cursor
+    # da KeysetPagination volta igual, senão as linhas empatadas somem da próxima página.
+    rank = Cast(SearchRank(F(vector_field), query), FloatField())
+    return queryset.filter(condition).annotate(**{rank_alias: rank})
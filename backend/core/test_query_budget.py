@@ -0,0 +1,185 @@
+from itertools import count
+
+from django.contrib.auth.models import Group, User
+
+from backend.core.testing import QueryBudgetTestCase
+from backend.crm.models import Comission, Customer
+from backend.example.models import Example
+from backend.hotel.models import Hotel
+from backend.movie.models import Category, Movie
+from backend.school.models import Class, Classroom, Grade, Student
+from backend.todo.models import Todo
+from backend.video.models import Video
+
+sequence = count()
+
+
+def create_user():
+    return User.objects.create(username=f'user{next(sequence)}')
+
+
+def seed_movies(quantity):
+    for _ in range(quantity):
+        category = Category.objects.create(title=f'Categoria {next(sequence)}')
+        Movie.objects.create(title=f'Filme {next(sequence)}', rating=5, like=True, censure=10, category=category)
+
+
+def seed_categories(quantity):
+    Category.objects.bulk_create(Category(title=f'Categoria {next(sequence)}') for _ in range(quantity))
+
+
+def seed_customers(quantity):
+    for _ in range(quantity):
+        Customer.objects.create(
+            user=create_user(),
+            seller=create_user(),
+            rg='123456789',
+            cpf='12345678901',
+            cep='12345678',
+        )
+
+
+def seed_comissions(quantity):
+    for _ in range(quantity):
+        group = Group.objects.create(name=f'Grupo {next(sequence)}')
+        Comission.objects.create(group=group, percentage=10)
+
+
+def seed_summaries(quantity):
+    for _ in range(quantity):
+        seller = create_user()
+        seller.groups.add(Group.objects.create(name=f'Grupo {next(sequence)}'))
+        Customer.objects.create(user=create_user(), seller=seller)
+
+
+def seed_students(quantity):
+    Student.objects.bulk_create(
+        Student(registration=str(next(sequence)), first_name='Aluno', last_name='Teste')
+        for _ in range(quantity)
+    )
+
+
+def seed_classrooms(quantity):
+    for _ in range(quantity):
+        classroom = Classroom.objects.create(title=f'Sala {next(sequence)}')
+        classroom.students.add(Student.objects.create(registration='1', first_name='Aluno', last_name='Teste'))
+
+
+def seed_grades(quantity):
+    for _ in range(quantity):
+        student = Student.objects.create(registration='1', first_name='Aluno', last_name='Teste')
+        Grade.objects.create(student=student, note=7)
+
+
+def seed_todos(quantity):
+    for _ in range(quantity):
+        Todo.objects.create(task=f'Tarefa {next(sequence)}', created_by=create_user())
+
+
+def seed_hotels(quantity):
+    Hotel.objects.bulk_create(Hotel(name=f'Hotel {next(sequence)}') for _ in range(quantity))
+
+
+def seed_examples(quantity):
+    Example.objects.bulk_create(Example(title=f'Exemplo {next(sequence)}') for _ in range(quantity))
+
+
+def seed_videos(quantity):
+    Video.objects.bulk_create(Video(title=f'Video {next(sequence)}') for _ in range(quantity))
+
+
+class ApiQueryBudgetTest(QueryBudgetTestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+
+    def seed_classes(self, quantity):
+        for _ in range(quantity):
+            classroom = Classroom.objects.create(title=f'Sala {next(sequence)}')
+            Class.objects.create(classroom=classroom, teacher=self.user)
+
+    # movie
+
+    def test_movie_list(self):
+        self.assertQueryBudget('movie-list', '/api/v1/movies/', seed_movies)
+
+    def test_movie_get_good_movies(self):
+        self.assertQueryBudget('movie-get-good-movies', '/api/v1/movies/get_good_movies/', seed_movies)
+
+    def test_movie_movies_readonly(self):
+        self.assertQueryBudget('movie-movies-readonly', '/api/v1/movies/movies_readonly/', seed_movies)
+
+    def test_movie_movies_regular_readonly(self):
+        self.assertQueryBudget(
+            'movie-movies-regular-readonly',
+            '/api/v1/movies/movies_regular_readonly/',
+            seed_movies
+        )
+
+    def test_movie_movies_fast_readonly(self):
+        self.assertQueryBudget('movie-movies-fast-readonly', '/api/v1/movies/movies_fast_readonly/', seed_movies)
+
+    def test_category_list(self):
+        self.assertQueryBudget('category-list', '/api/v1/categories/', seed_categories)
+
+    # crm
+
+    def test_customer_list(self):
+        self.assertQueryBudget('customer-list', '/api/v1/customers/', seed_customers)
+
+    def test_comission_list(self):
+        self.assertQueryBudget('comission-list', '/api/v1/comissions/', seed_comissions)
+
+    def test_seller_summary_list(self):
+        self.assertQueryBudget('seller-summary-list', '/api/v1/summaries/sellers/', seed_summaries)
+
+    def test_group_summary_list(self):
+        self.assertQueryBudget('group-summary-list', '/api/v1/summaries/groups/', seed_summaries)
+
+    # school
+
+    def test_student_list(self):
+        self.assertQueryBudget('student-list', '/api/v1/students/', seed_students)
+
+    def test_student_all_students(self):
+        self.assertQueryBudget('student-all-students', '/api/v1/students/all_students/', seed_students)
+
+    def test_classroom_list(self):
+        self.assertQueryBudget('classroom-list', '/api/v1/classrooms/', seed_classrooms)
+
+    def test_classes_list(self):
+        self.assertQueryBudget('classes-list', '/api/v1/classes/', self.seed_classes)
+
+    def test_grade_list(self):
+        self.assertQueryBudget('grade-list', '/api/v1/grades/', seed_grades)
+
+    def test_grade_analytics(self):
+        self.assertQueryBudget('grade-analytics', '/api/v1/grades/analytics/', seed_grades)
+
+    # todo
+
+    def test_todo_list(self):
+        self.assertQueryBudget('todo-list', '/api/v1/todos/', seed_todos)
+
+    # hotel
+
+    def test_hotel_list(self):
+        self.assertQueryBudget('hotel-list', '/api/v1/hotels/', seed_hotels)
+
+    def test_hotel_available(self):
+        self.assertQueryBudget(
+            'hotel-available',
+            '/api/v1/hotels/available/?start_date=2026-01-10&end_date=2026-01-15',
+            seed_hotels
+        )
+
+    # example
+
+    def test_example_list(self):
+        self.assertQueryBudget('example-list', '/api/v1/examples/', seed_examples)
+
+    # video
+
+    def test_video_list(self):
+        self.assertQueryBudget('video-list', '/api/v1/videos/', seed_videos)
@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+QUERY_BUDGETS_FILE = Path(__file__).resolve().parent / 'query_budgets.json'
+
+
+def load_query_budgets(path=QUERY_BUDGETS_FILE):
+    '''
+    Lê o arquivo com o número máximo de queries por endpoint.
+    '''
+    with open(path) as f:
+        return json.load(f)
+
+
+class QueryBudgetTestCase(TestCase):
+    '''
+    TestCase que garante que o número de queries de um endpoint
+    não cresce com o número de registros (N+1) e fica dentro do orçamento.
+
+    Uso:
+
+        def test_movie_list(self):
+            self.assertQueryBudget('movie-list', '/api/v1/movies/', seed_movies)
+
+    seed é uma função que recebe a quantidade de registros a criar.
+    '''
+    n = 2
+    factor = 10
+    query_budgets_file = QUERY_BUDGETS_FILE
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.query_budgets = load_query_budgets(cls.query_budgets_file)
+
+    def count_queries(self, url):
+        # Limpa o cache para que contagens e respostas em cache não mascarem as queries.
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+            if response.streaming:
+                # As queries de uma resposta em streaming rodam ao consumir o conteúdo.
+                b''.join(response.streaming_content)
+
+        self.assertLess(response.status_code, 400, f'{url} retornou {response.status_code}.')
+        return len(context)
+
+    def assertQueryBudget(self, name, url, seed):
+        self.assertIn(
+            name,
+            self.query_budgets,
+            f'Adicione o endpoint "{name}" em {self.query_budgets_file.name}.'
+        )
+
+        seed(self.n)
+        small = self.count_queries(url)
+
+        seed(self.n * (self.factor - 1))
+        large = self.count_queries(url)
+
+        self.assertEqual(
+            small,
+            large,
+            f'{name}: {small} queries com {self.n} registros e {large} com {self.n * self.factor}. '
+            'Faltou um select_related/prefetch_related?'
+        )
+
+        budget = self.query_budgets[name]
+        self.assertLessEqual(large, budget, f'{name}: {large} queries, o orçamento é {budget}.')
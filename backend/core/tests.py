@@ -1,3 +1,937 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
+import time
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib import admin
+from django.contrib.auth.models import Group, Permission, User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.signals import request_finished, request_started
+from django.db import close_old_connections, connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from backend.core.admin import FastModelAdmin
+from backend.core.api.authentication import (
+    CachedTokenAuthentication,
+    local_cache,
+    user_version_key
+)
+from backend.core.api.mixins import response_cache
+from backend.core.api.pagination import (
+    EstimatedCountPaginator,
+    cached_count,
+    estimate_count
+)
+from backend.core.api.serializers import get_prefetch_plan
+from backend.core.checks import check_shared_cache
+from backend.core.db.pool import ConnectionPool, PoolTimeout
+from backend.core.db.router import (
+    PrimaryReplicaRouter,
+    allow_replica,
+    use_primary
+)
+from backend.core.groups import (
+    access_cache_key,
+    get_user_groups,
+    get_user_permissions
+)
+from backend.core.middleware import PRIMARY_COOKIE, replica_middleware
+from backend.core.versions import version_cache_key
+from backend.crm.api.serializers import CustomerSerializer
+from backend.crm.models import Customer
+from backend.example.api.viewsets import ExampleViewSet
+from backend.example.models import Example
+from backend.hotel.models import Hotel
+from backend.movie.api.serializers import (
+    MovieFastSerializer,
+    MovieReadOnlySerializer,
+    MovieSerializer
+)
+from backend.movie.models import Category, Movie
+from backend.order.models import Employee, Order
+from backend.school.api.serializers import ClassroomSerializer
+from backend.school.models import Grade, Student
+from backend.todo.api.serializers import TodoSerializer
+from backend.video.models import Video
+
+
+def as_json(data):
+    return json.loads(json.dumps(data))
+
+
+class FastModelSerializerTest(TestCase):
+
+    def setUp(self):
+        category = Category.objects.create(title='Drama')
+        Movie.objects.create(title='Matrix', rating=5, like=True, censure=14, category=category)
+        Movie.objects.create(title='Alien', sinopse='Espaço', rating=4, like=False, censure=16)
+        self.queryset = Movie.objects.order_by('id')
+        self.esperado = as_json(MovieReadOnlySerializer(self.queryset, many=True).data)
+
+    def test_queryset(self):
+        resultado = MovieFastSerializer(self.queryset, many=True).data
+        self.assertEqual(self.esperado, as_json(resultado))
+
+    def test_values_list(self):
+        rows = list(MovieFastSerializer.values_list(self.queryset))
+        resultado = MovieFastSerializer(rows, many=True).data
+        self.assertEqual(self.esperado, as_json(resultado))
+
+    def test_instances(self):
+        resultado = MovieFastSerializer(list(self.queryset), many=True).data
+        self.assertEqual(self.esperado, as_json(resultado))
+
+    def test_single_instance(self):
+        movie = self.queryset.first()
+        resultado = MovieFastSerializer(movie).data
+        self.assertEqual(self.esperado[0], as_json(resultado))
+
+    def test_nested_serializer_has_no_plan(self):
+        class MovieNestedFastSerializer(MovieFastSerializer):
+            category = MovieSerializer._declared_fields['category']
+
+            class Meta(MovieFastSerializer.Meta):
+                fields = ('id', 'title', 'category')
+
+        self.assertIsNone(MovieNestedFastSerializer.get_fast_plan())
+        resultado = MovieNestedFastSerializer(self.queryset, many=True).data
+        self.assertEqual(resultado[0]['category'], {'id': self.queryset[0].category_id, 'title': 'Drama'})
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i in range(25):
+            Hotel.objects.create(name=f'Hotel {i}')
+        self.esperado = list(Hotel.objects.order_by('-created', '-id').values_list('id', flat=True))
+
+    def get_pages(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            resultado = json.loads(response.content)
+            ids += [item['id'] for item in resultado['results']]
+            url = resultado['next']
+        return ids, resultado
+
+    def test_walk_all_pages(self):
+        ids, resultado = self.get_pages('/api/v1/hotels/')
+        self.assertEqual(self.esperado, ids)
+        self.assertNotIn('count', resultado)
+
+    def test_previous_page(self):
+        first = json.loads(self.client.get('/api/v1/hotels/').content)
+        second = json.loads(self.client.get(first['next']).content)
+        third = json.loads(self.client.get(second['next']).content)
+        back = json.loads(self.client.get(third['previous']).content)
+        self.assertEqual(second['results'], back['results'])
+        back = json.loads(self.client.get(back['previous']).content)
+        self.assertEqual(first['results'], back['results'])
+        self.assertIsNone(back['previous'])
+
+    def test_count(self):
+        resultado = json.loads(self.client.get('/api/v1/hotels/?count=true').content)
+        self.assertEqual(resultado['count'], 25)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/hotels/?cursor=abc')
+        self.assertEqual(response.status_code, 404)
+
+    def test_values_list_queryset(self):
+        user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(user)
+        for i in range(15):
+            Movie.objects.create(title=f'Movie {i}', rating=5, like=True, censure=10)
+
+        ids, _ = self.get_pages('/api/v1/movies/movies_fast_readonly/')
+        esperado = list(Movie.objects.order_by('-created', '-id').values_list('id', flat=True))
+        self.assertEqual(esperado, ids)
+
+
+class EstimatedCountTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i in range(12):
+            Hotel.objects.create(name=f'Hotel {i}')
+        self.queryset = Hotel.objects.order_by('id')
+
+    def test_cached_count(self):
+        self.assertEqual(cached_count(self.queryset, 60), 12)
+        Hotel.objects.create(name='Novo')
+        self.assertEqual(cached_count(self.queryset, 60), 12)
+        self.assertEqual(cached_count(self.queryset.filter(name='Novo'), 60), 1)
+        cache.clear()
+        self.assertEqual(cached_count(self.queryset, 60), 13)
+
+    @skipUnless(connection.vendor != 'postgresql', 'Sem estimativa fora do PostgreSQL.')
+    def test_estimate_count(self):
+        # Fora do PostgreSQL não há estimativa e o paginator faz a contagem exata.
+        self.assertIsNone(estimate_count(self.queryset.filter(name__startswith='Hotel')))
+        self.assertIsNone(estimate_count(self.queryset))
+
+    @skipUnless(connection.vendor == 'postgresql', 'Somente PostgreSQL.')
+    def test_estimate_count_postgresql(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE hotel_hotel')
+
+        # Sem filtros: pg_class.reltuples.
+        self.assertEqual(estimate_count(Hotel.objects.all()), 12)
+        # Com filtros: EXPLAIN.
+        estimate = estimate_count(self.queryset.filter(name__startswith='Hotel'))
+        self.assertIsInstance(estimate, int)
+        self.assertGreater(estimate, 0)
+
+        class LowThresholdPaginator(EstimatedCountPaginator):
+            count_estimate_threshold = 10
+
+        paginator = LowThresholdPaginator(self.queryset, 5)
+        self.assertEqual(paginator.count, 12)
+        self.assertTrue(paginator.is_estimate)
+
+    def test_small_table_uses_exact_count(self):
+        paginator = EstimatedCountPaginator(self.queryset, 5)
+        self.assertEqual(paginator.count, 12)
+        self.assertFalse(paginator.is_estimate)
+
+    def test_estimated_page(self):
+        class LowEstimatePaginator(EstimatedCountPaginator):
+            count_info = (5, True)
+
+        paginator = LowEstimatePaginator(self.queryset, 5)
+        page = paginator.page(2)
+        self.assertTrue(page.has_next())
+        page = paginator.page(3)
+        self.assertEqual(len(page), 2)
+        self.assertFalse(page.has_next())
+
+
+class PrefetchPlanTest(TestCase):
+
+    def test_customer(self):
+        plan = get_prefetch_plan(CustomerSerializer)
+        self.assertEqual(plan.select_related, ['user', 'seller'])
+        self.assertEqual(plan.prefetch_related, ['seller__groups', 'seller__user_permissions'])
+
+    def test_classroom(self):
+        plan = get_prefetch_plan(ClassroomSerializer)
+        self.assertEqual(plan.select_related, [])
+        self.assertEqual(plan.prefetch_related, ['students'])
+
+    def test_todo(self):
+        plan = get_prefetch_plan(TodoSerializer)
+        self.assertEqual(plan.select_related, ['created_by'])
+
+    def test_movie(self):
+        plan = get_prefetch_plan(MovieSerializer)
+        self.assertEqual(plan.select_related, ['category'])
+        self.assertFalse(get_prefetch_plan(MovieFastSerializer))
+
+
+class UserAccessCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username='vendedor')
+        self.group = Group.objects.create(name='Vendedor')
+        self.user.groups.add(self.group)
+
+    def get_user(self):
+        # Um objeto novo, como em uma nova requisição.
+        return User.objects.get(pk=self.user.pk)
+
+    def test_cached_per_request_and_shared(self):
+        user = self.get_user()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_user_groups(user), {'Vendedor'})
+        with self.assertNumQueries(0):
+            get_user_groups(user)
+            # Outro objeto do mesmo usuário usa o cache compartilhado.
+            self.assertEqual(get_user_groups(User(pk=user.pk)), {'Vendedor'})
+
+    def test_invalidate_on_groups_changed(self):
+        get_user_groups(self.get_user())
+        gerente = Group.objects.create(name='Gerente')
+
+        gerente.user_set.add(self.user)
+        self.assertEqual(get_user_groups(self.get_user()), {'Vendedor', 'Gerente'})
+
+        self.user.groups.remove(self.group)
+        self.assertEqual(get_user_groups(self.get_user()), {'Gerente'})
+
+        gerente.user_set.clear()
+        self.assertEqual(get_user_groups(self.get_user()), set())
+
+    def test_invalidate_after_commit(self):
+        gerente = Group.objects.create(name='Gerente')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(gerente)
+            # Uma requisição concorrente guarda os grupos de antes do commit.
+            cache.set(access_cache_key('groups', self.user.pk), frozenset({'Vendedor'}))
+
+        self.assertEqual(get_user_groups(self.get_user()), {'Vendedor', 'Gerente'})
+
+    def test_invalidate_on_group_permissions_changed(self):
+        permission = Permission.objects.get(codename='add_movie')
+        self.assertEqual(get_user_permissions(self.get_user()), set())
+
+        self.group.permissions.add(permission)
+
+        user = self.get_user()
+        self.assertEqual(get_user_permissions(user), {'movie.add_movie'})
+        self.assertTrue(user.has_perm('movie.add_movie'))
+
+    def test_invalidate_on_group_renamed(self):
+        get_user_groups(self.get_user())
+
+        self.group.name = 'Gerente'
+        self.group.save()
+
+        self.assertEqual(get_user_groups(self.get_user()), {'Gerente'})
+
+
+class CachedAuthenticationTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_cache.clear()
+        self.user = User.objects.create_user(username='script', password='senha-secreta')
+        self.token = Token.objects.create(user=self.user)
+        self.url = '/api/v1/hotels/'
+
+    def get(self, **headers):
+        return self.client.get(self.url, **headers)
+
+    def basic(self, password):
+        credentials = base64.b64encode(f'script:{password}'.encode()).decode()
+        return {'HTTP_AUTHORIZATION': f'Basic {credentials}'}
+
+    def test_token_is_cached(self):
+        headers = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+        self.assertEqual(self.get(**headers).status_code, 200)
+
+        with self.assertNumQueries(1):
+            # Só a listagem de hotéis.
+            self.assertEqual(self.get(**headers).status_code, 200)
+
+    def test_token_auth_on_cache_hit(self):
+        authentication = CachedTokenAuthentication()
+        authentication.authenticate_credentials(self.token.key)
+
+        for cleanup in (lambda: None, local_cache.clear):
+            cleanup()
+            with self.assertNumQueries(0):
+                user, auth = authentication.authenticate_credentials(self.token.key)
+            self.assertEqual(user, self.user)
+            self.assertEqual(auth, self.token)
+
+    def test_token_revoked(self):
+        headers = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+        self.get(**headers)
+
+        self.token.delete()
+
+        self.assertEqual(self.get(**headers).status_code, 401)
+
+    def test_basic_is_cached(self):
+        self.assertEqual(self.get(**self.basic('senha-secreta')).status_code, 200)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get(**self.basic('senha-secreta')).status_code, 200)
+
+        self.assertEqual(self.get(**self.basic('errada')).status_code, 401)
+
+    def test_basic_password_changed(self):
+        self.get(**self.basic('senha-secreta'))
+
+        self.user.set_password('nova-senha')
+        self.user.save()
+
+        self.assertEqual(self.get(**self.basic('senha-secreta')).status_code, 401)
+        self.assertEqual(self.get(**self.basic('nova-senha')).status_code, 200)
+
+    def test_basic_password_changed_in_other_process(self):
+        self.get(**self.basic('senha-secreta'))
+
+        # Outro processo: só o cache compartilhado é atualizado.
+        cache.set(user_version_key(self.user.pk), 'outra')
+        local_cache.clear()
+
+        with self.assertNumQueries(2):
+            # Cache com a versão antiga: autentica de novo no banco, e a listagem.
+            self.assertEqual(self.get(**self.basic('senha-secreta')).status_code, 200)
+
+
+class HotelAsyncTest(TestCase):
+
+    def setUp(self):
+        for i in range(12):
+            Hotel.objects.create(name=f'Hotel {i}', start_date='2022-01-01', end_date='2022-01-10')
+
+    async def test_hotel_list(self):
+        response = await self.async_client.get('/api/v1/async/hotels/')
+
+        esperado = json.loads((await sync_to_async(self.client.get)('/api/v1/hotels/')).content)
+        self.assertEqual(esperado['results'], json.loads(response.content)['results'])
+
+    async def test_hotel_detail(self):
+        hotel = await sync_to_async(Hotel.objects.first)()
+
+        response = await self.async_client.get(f'/api/v1/async/hotels/{hotel.pk}/')
+
+        esperado = json.loads((await sync_to_async(self.client.get)(f'/api/v1/hotels/{hotel.pk}/')).content)
+        self.assertEqual(esperado, json.loads(response.content))
+
+    async def test_method_not_allowed(self):
+        response = await self.async_client.post('/api/v1/async/hotels/')
+
+        self.assertEqual(response.status_code, 405)
+
+
+async def asgi_get(path, query_string='', headers=()):
+    '''
+    GET direto no ASGIHandler, como um servidor ASGI (o AsyncClient lê a resposta fora do event loop).
+    Retorna (status, corpo).
+    '''
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), *headers],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 50000),
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    # Como o AsyncClient: não fecha a conexão do banco usada pelo TestCase.
+    request_started.disconnect(close_old_connections)
+    request_finished.disconnect(close_old_connections)
+    try:
+        await ASGIHandler()(scope, receive, send)
+    finally:
+        request_started.connect(close_old_connections)
+        request_finished.connect(close_old_connections)
+
+    body = b''.join(message.get('body', b'') for message in messages[1:])
+    return messages[0]['status'], body
+
+
+class AsgiStreamingTest(TestCase):
+
+    def setUp(self):
+        Video.objects.create(title='Matrix', release_year=1999)
+        Student.objects.create(registration='1', first_name='Ana', last_name='Lima')
+        User.objects.create_user(username='script', password='senha-secreta')
+
+    async def test_video_export(self):
+        status, body = await asgi_get('/api/v1/async/videos/', 'format=csv')
+        self.assertEqual(status, 200)
+        self.assertEqual(body.decode().splitlines()[1].split(',')[1:], ['Matrix', '1999'])
+
+    async def test_student_list(self):
+        credentials = base64.b64encode(b'script:senha-secreta')
+        status, body = await asgi_get('/api/v1/students/', headers=[(b'authorization', b'Basic ' + credentials)])
+        self.assertEqual(status, 200)
+        self.assertEqual([student['first_name'] for student in json.loads(body)], ['Ana'])
+
+
+class CachedResponseTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        Category.objects.create(title='Drama')
+
+    def test_cached_json_keeps_headers(self):
+        first = self.client.get('/api/v1/categories/')
+
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/v1/categories/')
+
+        self.assertEqual(second.content, first.content)
+        for header in ('Content-Type', 'Vary', 'Allow'):
+            self.assertEqual(second[header], first[header])
+
+    def test_browsable_api_is_not_cached(self):
+        for username in ('ana', 'bruno'):
+            self.client.force_login(User.objects.create_user(username=username))
+            response = self.client.get('/api/v1/categories/', HTTP_ACCEPT='text/html')
+            self.assertContains(response, username)
+
+
+class SharedCacheCheckTest(TestCase):
+
+    @override_settings(WEB_CONCURRENCY=4)
+    def test_local_cache_with_many_processes(self):
+        self.assertEqual([error.id for error in check_shared_cache(None)], ['core.E001'])
+
+    @override_settings(
+        WEB_CONCURRENCY=4,
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://x'}},
+    )
+    def test_shared_cache(self):
+        self.assertEqual(check_shared_cache(None), [])
+
+
+class ConditionalGetTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        Hotel.objects.create(name='Hotel 1')
+
+    def test_not_modified(self):
+        response = self.client.get('/api/v1/hotels/')
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/hotels/', HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_modified_after_commit(self):
+        etag = self.client.get('/api/v1/hotels/')['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Hotel.objects.create(name='Hotel 2')
+            # Uma requisição concorrente, antes do commit, ainda vê a lista antiga.
+            etag = self.client.get('/api/v1/hotels/')['ETag']
+
+        response = self.client.get('/api/v1/hotels/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_modified_after_save(self):
+        etag = self.client.get('/api/v1/hotels/')['ETag']
+
+        Hotel.objects.create(name='Hotel 2')
+
+        response = self.client.get('/api/v1/hotels/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_field(self):
+        # ExampleViewSet não está nas urls.
+        user = User.objects.create_superuser(username='admin', password='d')
+        view = ExampleViewSet.as_view({'get': 'list'})
+        example = Example.objects.create(title='Exemplo')
+
+        def get(**headers):
+            request = APIRequestFactory().get('/examples/', **headers)
+            force_authenticate(request, user=user)
+            return view(request)
+
+        etag = get()['ETag']
+        self.assertEqual(get(HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        example.title = 'Outro'
+        example.save()
+
+        self.assertEqual(get(HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Somente PostgreSQL.')
+class ConnectionPoolTest(TestCase):
+
+    def setUp(self):
+        self.pool = ConnectionPool(
+            connection.get_connection_params(),
+            min_size=1,
+            max_size=2,
+            timeout=0.1,
+            max_idle=300,
+            health_check_interval=0,
+            reset_on_return=True,
+        )
+
+    def tearDown(self):
+        self.pool.closeall()
+
+    def test_reuse(self):
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+
+        self.assertIs(self.pool.getconn(), conn)
+        stats = self.pool.stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['in_use'], 1)
+
+    def test_timeout(self):
+        self.pool.getconn()
+        self.pool.getconn()
+
+        with self.assertRaises(PoolTimeout):
+            self.pool.getconn()
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+
+    def test_health_check(self):
+        conn = self.pool.getconn()
+        self.pool.putconn(conn)
+        conn.close()
+
+        novo = self.pool.getconn()
+
+        self.assertIsNot(novo, conn)
+        self.assertEqual(self.pool.stats()['health_check_failures'], 1)
+
+    def test_rollback_on_return(self):
+        conn = self.pool.getconn()
+        conn.autocommit = False
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.pool.putconn(conn)
+
+        conn = self.pool.getconn()
+        self.assertEqual(conn.info.transaction_status, 0)
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class ReplicaRouterTest(TestCase):
+
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def db_for_read_in_view(self, request):
+        databases = []
+
+        def view(request):
+            databases.append(self.router.db_for_read(Movie))
+            return HttpResponse(status=201 if request.method == 'POST' else 200)
+
+        response = replica_middleware(view)(request)
+        return databases[0], response
+
+    def test_reads_use_primary_by_default(self):
+        self.assertEqual(self.router.db_for_read(Movie), 'default')
+        self.assertEqual(self.router.db_for_write(Movie), 'default')
+
+    def test_allow_replica(self):
+        with allow_replica():
+            self.assertEqual(self.router.db_for_read(Movie), 'replica_0')
+            self.assertEqual(self.router.db_for_write(Movie), 'default')
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Movie), 'default')
+            self.assertEqual(self.router.db_for_read(Movie), 'replica_0')
+
+    def test_no_migrations_on_replicas(self):
+        self.assertTrue(self.router.allow_migrate('default', 'movie'))
+        self.assertFalse(self.router.allow_migrate('replica_0', 'movie'))
+
+    def test_get_reads_from_replica(self):
+        database, response = self.db_for_read_in_view(self.factory.get('/'))
+        self.assertEqual(database, 'replica_0')
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
+        self.assertEqual(self.router.db_for_read(Movie), 'default')
+
+    def test_write_pins_primary(self):
+        database, response = self.db_for_read_in_view(self.factory.post('/'))
+        self.assertEqual(database, 'default')
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+
+        request = self.factory.get('/')
+        request.COOKIES[PRIMARY_COOKIE] = response.cookies[PRIMARY_COOKIE].value
+        database, _ = self.db_for_read_in_view(request)
+        self.assertEqual(database, 'default')
+
+    def test_header_pins_primary(self):
+        database, _ = self.db_for_read_in_view(self.factory.get('/', HTTP_X_USE_PRIMARY='1'))
+        self.assertEqual(database, 'default')
+
+
+@override_settings(DATABASE_REPLICAS=['replica_0'])
+class ReplicaAfterWriteTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        response_cache.clear()
+        Category.objects.create(title='Drama')
+        Hotel.objects.create(name='Hotel 1')
+        self.client.force_login(User.objects.create_superuser(username='admin', password='d'))
+
+    def read_databases(self, url, model):
+        '''
+        Bancos escolhidos pelo router para ler model; a consulta sempre vai para o default.
+        '''
+        databases = []
+        db_for_read = PrimaryReplicaRouter.db_for_read
+
+        def record(router, read_model, **hints):
+            if read_model is model:
+                databases.append(db_for_read(router, read_model, **hints))
+            return 'default'
+
+        with mock.patch.object(PrimaryReplicaRouter, 'db_for_read', record):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return set(databases)
+
+    def age_version(self, model):
+        cache.set(version_cache_key(model), time.time_ns() - 60 * 10 ** 9, None)
+
+    def test_cached_response_reads_from_primary_after_write(self):
+        self.assertEqual(self.read_databases('/api/v1/categories/', Category), {'default'})
+
+        self.age_version(Category)
+        self.assertEqual(self.read_databases('/api/v1/categories/', Category), {'replica_0'})
+
+    def test_etag_reads_from_primary_after_write(self):
+        self.assertEqual(self.read_databases('/api/v1/hotels/', Hotel), {'default'})
+
+        self.age_version(Hotel)
+        self.assertEqual(self.read_databases('/api/v1/hotels/', Hotel), {'replica_0'})
+
+
+class FastModelAdminTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+        self.group = Group.objects.create(name='Vendedor')
+
+    def create_rows(self, quantity):
+        for _ in range(quantity):
+            index = User.objects.count()
+            user = User.objects.create(username=f'usuario{index}', first_name=f'Nome {index}')
+            user.groups.add(self.group)
+            seller = User.objects.create(username=f'vendedor{index}')
+            Customer.objects.create(user=user, seller=seller)
+            Order.objects.create(title=f'Pedido {index}', employee=Employee.objects.create(user=user))
+
+    def count_queries(self, url):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_changelists_without_n_plus_one(self):
+        for url in ('/admin/auth/user/', '/admin/crm/customer/', '/admin/order/order/', '/admin/order/employee/'):
+            with self.subTest(url=url):
+                self.create_rows(2)
+                esperado = self.count_queries(url)
+                self.create_rows(8)
+                self.assertEqual(self.count_queries(url), esperado)
+
+    def test_search_document(self):
+        self.create_rows(2)
+
+        response = self.client.get('/admin/crm/customer/', {'q': 'nome 1'})
+        self.assertEqual(
+            [customer.user.username for customer in response.context['cl'].result_list],
+            ['usuario1']
+        )
+
+    def test_search_index_check(self):
+        class MovieAdmin(FastModelAdmin):
+            search_fields = ('id', 'category__id', 'sinopse')
+
+        warnings = MovieAdmin(Movie, admin.site).check()
+        self.assertEqual([warning.id for warning in warnings], ['core.W001'])
+        self.assertIn("'sinopse'", warnings[0].msg)
+
+
+class SparseFieldsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(User.objects.create_superuser(username='admin', password='d'))
+        category = Category.objects.create(title='Drama')
+        self.movie = Movie.objects.create(
+            title='Matrix', sinopse='Neo', rating=5, like=True, censure=14, category=category
+        )
+
+    def test_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/movies/', {'fields': 'title,category.title'})
+
+        self.assertEqual(
+            response.json()['results'],
+            [{'id': self.movie.pk, 'title': 'Matrix', 'category': {'title': 'Drama'}}]
+        )
+        sql = [query['sql'] for query in context if 'movie_movie' in query['sql']]
+        self.assertEqual(len(sql), 1)
+        self.assertIn('movie_category', sql[0])
+        self.assertNotIn('sinopse', sql[0])
+        self.assertNotIn('movie_category"."created', sql[0])
+
+    def test_required_fields(self):
+        url = f'/api/v1/movies/{self.movie.pk}/'
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'fields': 'title'})
+
+        self.assertEqual(response.json(), {'id': self.movie.pk, 'title': 'Matrix'})
+        # A CensurePermission lê o censure sem outra consulta.
+        sql = [query['sql'] for query in context if 'movie_movie' in query['sql']]
+        self.assertEqual(len(sql), 1)
+        self.assertIn('censure', sql[0])
+
+    def test_fast_serializer(self):
+        Hotel.objects.create(name='Hotel 1')
+        response = self.client.get('/api/v1/hotels/', {'fields': 'name'})
+        self.assertEqual([sorted(hotel) for hotel in response.json()['results']], [['id', 'name']])
+
+    def test_expand(self):
+        student = Student.objects.create(registration='1', first_name='Ana', last_name='Lima')
+        grade = Grade.objects.create(student=student, note=7)
+
+        response = self.client.get('/api/v1/grades/', {'fields': 'note'})
+        self.assertEqual(response.json()['results'], [{'id': grade.pk, 'note': '7.00'}])
+
+        response = self.client.get('/api/v1/grades/', {'fields': 'student.first_name'})
+        self.assertEqual(response.json()['results'], [{'id': grade.pk, 'student': {'first_name': 'Ana'}}])
+
+        response = self.client.get('/api/v1/grades/', {'expand': 'student'})
+        self.assertEqual(response.json()['results'][0]['student']['last_name'], 'Lima')
+
+    def test_expand_cached_response(self):
+        student = Student.objects.create(registration='1', first_name='Ana', last_name='Lima')
+        Grade.objects.create(student=student, note=7)
+
+        def get(params):
+            return self.client.get('/api/v1/grades/', params).json()['results'][0]['student']
+
+        self.assertEqual(get({'expand': 'student'})['last_name'], 'Lima')
+        self.assertEqual(get({'fields': 'student.first_name'}), {'first_name': 'Ana'})
+
+        student.first_name, student.last_name = 'Bia', 'Souza'
+        student.save()
+
+        # GradeViewSet guarda a resposta; a versão de Student também precisa entrar na chave.
+        self.assertEqual(get({'expand': 'student'})['last_name'], 'Souza')
+        self.assertEqual(get({'fields': 'student.first_name'}), {'first_name': 'Bia'})
+
+    def test_invalid_fields(self):
+        self.assertEqual(self.client.get('/api/v1/movies/', {'fields': 'senha'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/grades/', {'expand': 'note'}).status_code, 400)
+
+
+class HotelSerializerTest(TestCase):
+
+    def test_null_dates(self):
+        response = self.client.post('/api/v1/hotels/', {'name': 'Hotel 1'}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.post(
+            '/api/v1/hotels/',
+            {'name': 'Hotel 2', 'start_date': '2026-01-10', 'end_date': None},
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_invalid_range(self):
+        hotel = Hotel.objects.create(name='Hotel 1', end_date=datetime.date(2026, 1, 10))
+
+        response = self.client.patch(
+            f'/api/v1/hotels/{hotel.pk}/', {'start_date': '2026-01-11'}, content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class HotelImportTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+
+    def post(self, rows):
+        return self.client.post('/api/v1/hotels/import/', json.dumps(rows), content_type='application/json')
+
+    def test_import(self):
+        rows = [
+            {'name': f'Hotel {i}', 'start_date': '2026-01-01', 'end_date': '2026-12-31'}
+            for i in range(50)
+        ]
+        rows.append({'name': 'Sem datas'})
+
+        # Sessão, usuário, validação em memória, bulk_create e a transação.
+        with self.assertNumQueries(5):
+            response = self.post(rows)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {'created': 51})
+        self.assertEqual(Hotel.objects.filter(start_date__isnull=True).count(), 1)
+
+    def test_import_errors(self):
+        response = self.post([
+            {'name': 'Hotel 1', 'start_date': '2026-01-01', 'end_date': '2026-12-31'},
+            {'name': '', 'start_date': '2026-02-30'},
+            {'name': 'Hotel 3', 'start_date': '2026-03-01', 'end_date': '2026-02-01'},
+            'hotel',
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        resultado = response.json()
+        self.assertEqual(resultado['error_count'], 3)
+        self.assertEqual([error['row'] for error in resultado['errors']], [1, 2, 3])
+        self.assertEqual(sorted(resultado['errors'][0]), ['name', 'row', 'start_date'])
+        self.assertIn('non_field_errors', resultado['errors'][1])
+        self.assertFalse(Hotel.objects.exists())
+
+    def test_import_csv(self):
+        content = 'name,start_date,end_date\nHotel 1,2026-01-01,2026-01-31\nHotel 2,,\n'
+        upload = SimpleUploadedFile('hotels.csv', content.encode('utf-8'), content_type='text/csv')
+
+        response = self.client.post('/api/v1/hotels/import/', {'file': upload})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Hotel.objects.get(name='Hotel 1').end_date, datetime.date(2026, 1, 31))
+
+    def test_import_permission(self):
+        rows = [{'name': 'Hotel 1'}]
+
+        self.client.logout()
+        self.assertEqual(self.post(rows).status_code, 401)
+
+        self.client.force_login(User.objects.create_user(username='usuario', password='d'))
+        self.assertEqual(self.post(rows).status_code, 403)
+        self.assertFalse(Hotel.objects.exists())
+
+
+class HotelAvailabilityTest(TestCase):
+
+    def setUp(self):
+        january, february = datetime.date(2026, 1, 1), datetime.date(2026, 2, 1)
+        Hotel.objects.create(name='Janeiro', start_date=january, end_date=january.replace(day=31))
+        Hotel.objects.create(name='Fevereiro', start_date=february, end_date=february.replace(day=28))
+        Hotel.objects.create(name='Desde março', start_date=datetime.date(2026, 3, 1))
+        Hotel.objects.create(name='Sempre')
+
+    def get_names(self, start_date, end_date):
+        response = self.client.get('/api/v1/hotels/available/', {'start_date': start_date, 'end_date': end_date})
+        self.assertEqual(response.status_code, 200)
+        return sorted(hotel['name'] for hotel in response.json()['results'])
+
+    def test_available(self):
+        self.assertEqual(self.get_names('2026-01-10', '2026-01-31'), ['Janeiro', 'Sempre'])
+        self.assertEqual(self.get_names('2026-01-31', '2026-02-01'), ['Sempre'])
+        self.assertEqual(self.get_names('2026-04-01', '2026-04-02'), ['Desde março', 'Sempre'])
+
+    def test_invalid_range(self):
+        response = self.client.get('/api/v1/hotels/available/', {'start_date': '2026-02-01', 'end_date': '2026-01-01'})
+        self.assertEqual(response.status_code, 400)
@@ -1,9 +1,11 @@
 from django.urls import path
 
+from .api.viewsets import DatabasePoolView
 from .views import index
 
 app_name = 'core'
 
 urlpatterns = [
     path('', index, name='index'),
+    path('api/v1/db-pool/', DatabasePoolView.as_view(), name='db_pool'),
 ]
@@ -0,0 +1,70 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+VERSION_CACHE_TIMEOUT = None
+
+
+def now_and_on_commit(func):
+    '''
+    Roda func agora e de novo depois do commit.
+
+    Uma requisição concorrente ainda lê os dados antigos até o commit,
+    e o que ela guardar no cache nesse meio tempo é descartado na segunda vez.
+    Fora de um atomic() o on_commit roda na hora.
+    '''
+    func()
+    transaction.on_commit(func)
+
+
+def version_cache_key(model):
+    return f'model-version:{model._meta.label_lower}'
+
+
+def new_version():
+    # Instante da alteração em nanossegundos, para não repetir versões antigas
+    # quando a chave some do cache.
+    return time.time_ns()
+
+
+def get_model_versions(*models):
+    '''
+    Versão atual de cada model; cria a versão de quem ainda não tem.
+    '''
+    keys = [version_cache_key(model) for model in models]
+    versions = cache.get_many(keys)
+
+    missing = {key: new_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, VERSION_CACHE_TIMEOUT)
+        versions.update(missing)
+
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(*models):
+    '''
+    Marca os models como alterados.
+    Chame depois de bulk_create, bulk_update e QuerySet.update(), que não enviam sinais.
+    '''
+    def bump():
+        version = new_version()
+        cache.set_many({version_cache_key(model): version for model in models}, VERSION_CACHE_TIMEOUT)
+
+    # Antes do commit uma requisição concorrente ainda pode guardar os dados antigos com a versão nova.
+    now_and_on_commit(bump)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_changed(sender, **kwargs):
+    bump_model_version(sender)
+
+
+@receiver(m2m_changed)
+def relation_changed(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_model_version(sender, instance.__class__, model)
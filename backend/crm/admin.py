@@ -1,27 +1,22 @@
 from django.contrib import admin
 
-from .models import Comission, Customer
+from backend.core.admin import FastModelAdmin
+
+from .models import CUSTOMER_SEARCH_FIELDS, Comission, Customer
 
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(FastModelAdmin):
     list_display = ('id', '__str__', 'rg', 'cpf', 'cep', 'seller', 'active')
     list_display_links = ('__str__',)
-    search_fields = (
-        'user__first_name',
-        'user__last_name',
-        'user__email',
-        'seller__first_name',
-        'seller__last_name',
-        'seller__email',
-        'rg',
-        'cpf',
-        'cep',
-        'address',
-    )
+    # O __str__ usa o nome do usuário.
+    list_select_related = ('user',)
+    search_fields = CUSTOMER_SEARCH_FIELDS
+    search_document = True
     list_filter = ('active',)
 
 
 @admin.register(Comission)
-class ComissionAdmin(admin.ModelAdmin):
+class ComissionAdmin(FastModelAdmin):
     list_display = ('__str__', 'percentage')
+    list_select_related = ('group',)
@@ -1,7 +1,8 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
 
-from backend.crm.models import Comission, Customer
+from backend.crm.documents import cep_validator, cpf_validator
+from backend.crm.models import Comission, Customer, GroupSummary, SellerSummary
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -28,25 +29,16 @@ class UserSerializer(serializers.ModelSerializer):
 
 class CustomerSerializer(serializers.ModelSerializer):
     user = UserSerializer()
+    # RG, CPF e CEP já formatados ao salvar o cliente.
+    rg = serializers.CharField(source='rg_display', read_only=True)
+    cpf = serializers.CharField(source='cpf_display', read_only=True)
+    cep = serializers.CharField(source='cep_display', read_only=True)
 
     class Meta:
         model = Customer
         fields = ('id', 'rg', 'cpf', 'cep', 'address', 'active', 'user', 'seller')
         depth = 1  # expande todas as FK
 
-    def to_representation(self, instance):
-        '''
-        Representação personalizada para RG, CPF e CEP.
-        '''
-        data = super(CustomerSerializer, self).to_representation(instance)
-
-        data['rg'] = f"{instance.rg[:2]}.{instance.rg[2:5]}.{instance.rg[5:8]}-{instance.rg[8:]}"
-        data['cpf'] = f"{instance.cpf[:3]}.{instance.cpf[3:6]}.{instance.cpf[6:9]}-{instance.cpf[9:]}"
-        if instance.cep:
-            data['cep'] = f"{instance.cep[:5]}-{instance.cep[5:]}"
-
-        return data
-
 
 class CustomerCreateSerializer(serializers.ModelSerializer):
 
@@ -55,15 +47,10 @@ class CustomerCreateSerializer(serializers.ModelSerializer):
         fields = ('user', 'rg', 'cpf', 'cep', 'address')
 
 
-def only_numbers_validator(value):
-    if not value.isnumeric():
-        raise serializers.ValidationError('Digitar somente números.')
-
-
 class CustomerUpdateSerializer(serializers.ModelSerializer):
     user = UserSerializer()
-    cpf = serializers.CharField(validators=[only_numbers_validator])
-    cep = serializers.CharField(validators=[only_numbers_validator])
+    cpf = serializers.CharField(validators=[cpf_validator])
+    cep = serializers.CharField(validators=[cep_validator])
 
     class Meta:
         model = Customer
@@ -106,3 +93,28 @@ class ComissionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Comission
         fields = ('group', 'percentage')
+
+
+class SellerSummarySerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='seller.username')
+    name = serializers.CharField(source='seller.get_full_name')
+    groups = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SellerSummary
+        fields = ('seller', 'username', 'name', 'groups', 'customers', 'active_customers')
+
+    def get_groups(self, instance):
+        return [group.name for group in instance.seller.groups.all()]
+
+
+class GroupSummarySerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source='group.name')
+    comissions = serializers.SerializerMethodField()
+
+    class Meta:
+        model = GroupSummary
+        fields = ('group', 'name', 'comissions', 'sellers', 'customers', 'active_customers')
+
+    def get_comissions(self, instance):
+        return [str(comission.percentage) for comission in instance.group.comissions.all()]
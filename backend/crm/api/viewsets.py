@@ -1,33 +1,49 @@
+from django.contrib.auth.models import Group
 from rest_framework import status, viewsets
 from rest_framework.exceptions import ValidationError as DRFValidationError
-from rest_framework.filters import SearchFilter
 from rest_framework.permissions import BasePermission
 
+from backend.core.api.filters import SearchDocumentFilter
+from backend.core.api.mixins import (
+    CachedResponseMixin,
+    ExportMixin,
+    SparseFieldsMixin
+)
+from backend.core.api.pagination import KeysetPagination
+from backend.core.groups import in_group
 from backend.crm.api.serializers import (
     ComissionSerializer,
     CustomerCreateSerializer,
     CustomerSerializer,
-    CustomerUpdateSerializer
+    CustomerUpdateSerializer,
+    GroupSummarySerializer,
+    SellerSummarySerializer
+)
+from backend.crm.models import (
+    CUSTOMER_SEARCH_FIELDS,
+    Comission,
+    Customer,
+    GroupSummary,
+    SellerSummary
 )
-from backend.crm.models import Comission, Customer
 
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class CustomerViewSet(ExportMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     # queryset = Customer.objects.all()
     # serializer_class = CustomerSerializer
-    filter_backends = (SearchFilter,)
-    search_fields = (
-        'user__first_name',
-        'user__last_name',
-        'user__email',
-        'seller__first_name',
-        'seller__last_name',
-        'seller__email',
-        'rg',
-        'cpf',
-        'cep',
-        'address',
-    )
+    filter_backends = (SearchDocumentFilter,)
+    pagination_class = KeysetPagination
+    # A busca usa o documento montado a partir destes campos.
+    search_fields = CUSTOMER_SEARCH_FIELDS
+
+    @property
+    def keyset_ordering(self):
+        '''
+        Com ?search=, os mais relevantes primeiro.
+        '''
+        if SearchDocumentFilter().get_search_words(self.request):
+            return ('-search_rank', 'user__first_name', 'id')
+        return ('user__first_name', 'id')
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -39,10 +55,7 @@ class CustomerViewSet(viewsets.ModelViewSet):
         return CustomerSerializer
 
     def is_seller(self, seller):
-        if seller:
-            groups_list = seller.groups.values_list('name', flat=True)
-            return True if 'Vendedor' in groups_list else False
-        return False
+        return in_group(seller, 'Vendedor')
 
     def get_queryset(self):
         '''
@@ -89,10 +102,7 @@ class NotSellerPermission(BasePermission):
     message = 'Você não tem permissão para visualizar este registro.'
 
     def is_seller(self, seller):
-        if seller:
-            groups_list = seller.groups.values_list('name', flat=True)
-            return True if 'Vendedor' in groups_list else False
-        return False
+        return in_group(seller, 'Vendedor')
 
     def has_permission(self, request, view):
         seller = request.user
@@ -107,7 +117,27 @@ class NotSellerPermission(BasePermission):
             return True
 
 
-class ComissionViewSet(viewsets.ModelViewSet):
+class ComissionViewSet(CachedResponseMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Comission.objects.all()
     serializer_class = ComissionSerializer
+    # A ordenação usa group__name.
+    cache_models = (Comission, Group)
+    permission_classes = (NotSellerPermission,)
+
+
+class SellerSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    '''
+    Clientes por vendedor, lidos da tabela de resumo.
+    '''
+    queryset = SellerSummary.objects.select_related('seller').prefetch_related('seller__groups')
+    serializer_class = SellerSummarySerializer
+    permission_classes = (NotSellerPermission,)
+
+
+class GroupSummaryViewSet(viewsets.ReadOnlyModelViewSet):
+    '''
+    Vendedores, clientes e comissões por grupo, lidos da tabela de resumo.
+    '''
+    queryset = GroupSummary.objects.select_related('group').prefetch_related('group__comissions')
+    serializer_class = GroupSummarySerializer
     permission_classes = (NotSellerPermission,)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CrmConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'backend.crm'
+
+    def ready(self):
+        from backend.crm import signals  # noqa: F401
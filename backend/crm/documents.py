@@ -0,0 +1,29 @@
+'''
+Validação e formatação de RG, CPF e CEP.
+
+No banco ficam só os dígitos; a versão formatada é calculada ao salvar
+(veja Customer.update_derived_fields), e não a cada leitura.
+'''
+from django.core.validators import RegexValidator
+
+rg_validator = RegexValidator(r'^\d{8}[\dX]$', 'Digite os 9 dígitos do RG (o último pode ser X), sem pontuação.')
+cpf_validator = RegexValidator(r'^\d{11}$', 'Digite os 11 dígitos do CPF, sem pontuação.')
+cep_validator = RegexValidator(r'^\d{8}$', 'Digite os 8 dígitos do CEP, sem pontuação.')
+
+
+def format_rg(rg):
+    if not rg:
+        return rg
+    return f'{rg[:2]}.{rg[2:5]}.{rg[5:8]}-{rg[8:]}'
+
+
+def format_cpf(cpf):
+    if not cpf:
+        return cpf
+    return f'{cpf[:3]}.{cpf[3:6]}.{cpf[6:9]}-{cpf[9:]}'
+
+
+def format_cep(cep):
+    if not cep:
+        return cep
+    return f'{cep[:5]}-{cep[5:]}'
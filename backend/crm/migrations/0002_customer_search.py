@@ -0,0 +1,86 @@
+# Generated by Django 4.0.10 on 2026-10-18 11:04
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+from backend.core.search import build_search_document
+
+CUSTOMER_SEARCH_FIELDS = (
+    'user__first_name',
+    'user__last_name',
+    'user__email',
+    'seller__first_name',
+    'seller__last_name',
+    'seller__email',
+    'rg',
+    'cpf',
+    'cep',
+    'address',
+)
+
+
+def fill_search_document(apps, schema_editor):
+    Customer = apps.get_model('crm', 'Customer')
+    customers = Customer.objects.using(schema_editor.connection.alias).select_related('user', 'seller')
+    for customer in customers.iterator():
+        customer.search_document = build_search_document(customer, CUSTOMER_SEARCH_FIELDS)
+        customer.save(update_fields=['search_document'])
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            "UPDATE crm_customer SET search_vector = to_tsvector('simple', search_document)"
+        )
+
+
+def create_search_indexes(apps, schema_editor):
+    '''
+    Índices GIN só existem no PostgreSQL.
+    O de trigramas (para o LIKE '%trecho%') depende da extensão pg_trgm estar disponível.
+    '''
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        'CREATE INDEX crm_customer_search_vector_gin ON crm_customer USING gin (search_vector)'
+    )
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        has_trigram = cursor.fetchone() is not None
+
+    if has_trigram:
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        schema_editor.execute(
+            'CREATE INDEX crm_customer_search_document_trgm '
+            'ON crm_customer USING gin (search_document gin_trgm_ops)'
+        )
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS crm_customer_search_document_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS crm_customer_search_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='search_document',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(fill_search_document, migrations.RunPython.noop),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.0.10 on 2026-10-18 11:05
+
+import django.core.validators
+from django.db import migrations, models
+
+from backend.crm.documents import format_cep, format_cpf, format_rg
+
+
+def fill_display_fields(apps, schema_editor):
+    Customer = apps.get_model('crm', 'Customer')
+    customers = list(Customer.objects.using(schema_editor.connection.alias).only('rg', 'cpf', 'cep'))
+    for customer in customers:
+        customer.rg_display = format_rg(customer.rg)
+        customer.cpf_display = format_cpf(customer.cpf)
+        customer.cep_display = format_cep(customer.cep)
+    Customer.objects.using(schema_editor.connection.alias).bulk_update(
+        customers,
+        ['rg_display', 'cpf_display', 'cep_display'],
+        batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crm', '0002_customer_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='cep_display',
+            field=models.CharField(editable=False, max_length=9, null=True),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='cpf_display',
+            field=models.CharField(editable=False, max_length=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='rg_display',
+            field=models.CharField(editable=False, max_length=12, null=True),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='cep',
+            field=models.CharField(blank=True, max_length=8, null=True, validators=[django.core.validators.RegexValidator('^\\d{8}$', 'Digite os 8 dígitos do CEP, sem pontuação.')]),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='cpf',
+            field=models.CharField(blank=True, max_length=11, null=True, validators=[django.core.validators.RegexValidator('^\\d{11}$', 'Digite os 11 dígitos do CPF, sem pontuação.')]),
+        ),
+        migrations.AlterField(
+            model_name='customer',
+            name='rg',
+            field=models.CharField(blank=True, max_length=10, null=True, validators=[django.core.validators.RegexValidator('^\\d{8}[\\dX]$', 'Digite os 9 dígitos do RG (o último pode ser X), sem pontuação.')]),
+        ),
+        migrations.RunPython(fill_display_fields, migrations.RunPython.noop),
+    ]
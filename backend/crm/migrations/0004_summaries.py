@@ -0,0 +1,50 @@
+# Generated by Django 4.0.10 on 2026-10-18 11:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from backend.crm.summaries import rebuild_summaries
+
+
+def fill_summaries(apps, schema_editor):
+    rebuild_summaries(apps, using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('crm', '0003_customer_display_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupSummary',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='auth.group')),
+                ('sellers', models.IntegerField(default=0)),
+                ('customers', models.IntegerField(default=0)),
+                ('active_customers', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'resumo do grupo',
+                'verbose_name_plural': 'resumos dos grupos',
+                'ordering': ('group__name',),
+            },
+        ),
+        migrations.CreateModel(
+            name='SellerSummary',
+            fields=[
+                ('seller', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='seller_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('customers', models.IntegerField(default=0)),
+                ('active_customers', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'resumo do vendedor',
+                'verbose_name_plural': 'resumos dos vendedores',
+                'ordering': ('-customers', 'seller'),
+            },
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
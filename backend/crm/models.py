@@ -1,5 +1,30 @@
 from django.contrib.auth.models import Group, User
-from django.db import models
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models, transaction
+
+from backend.core.search import build_search_document
+from backend.crm.documents import (
+    cep_validator,
+    cpf_validator,
+    format_cep,
+    format_cpf,
+    format_rg,
+    rg_validator
+)
+
+# Campos que entram no documento de busca do cliente.
+CUSTOMER_SEARCH_FIELDS = (
+    'user__first_name',
+    'user__last_name',
+    'user__email',
+    'seller__first_name',
+    'seller__last_name',
+    'seller__email',
+    'rg',
+    'cpf',
+    'cep',
+    'address',
+)
 
 
 class Customer(models.Model):
@@ -15,11 +40,20 @@ class Customer(models.Model):
         null=True,
         blank=True
     )
-    rg = models.CharField(max_length=10, null=True, blank=True)
-    cpf = models.CharField(max_length=11, null=True, blank=True)
-    cep = models.CharField(max_length=8, null=True, blank=True)
+    rg = models.CharField(max_length=10, null=True, blank=True, validators=[rg_validator])
+    cpf = models.CharField(max_length=11, null=True, blank=True, validators=[cpf_validator])
+    cep = models.CharField(max_length=8, null=True, blank=True, validators=[cep_validator])
     address = models.CharField(max_length=100, null=True, blank=True)
     active = models.BooleanField(default=True)
+    # Campos calculados, mantidos pelos sinais em backend/crm/signals.py.
+    rg_display = models.CharField(max_length=12, null=True, editable=False)
+    cpf_display = models.CharField(max_length=14, null=True, editable=False)
+    cep_display = models.CharField(max_length=9, null=True, editable=False)
+    # Os índices GIN ficam na migração 0002 (só no PostgreSQL).
+    search_document = models.TextField(default='', editable=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    derived_fields = ('rg_display', 'cpf_display', 'cep_display', 'search_document')
 
     class Meta:
         ordering = ('user__first_name',)
@@ -29,6 +63,24 @@ class Customer(models.Model):
     def __str__(self):
         return f'{self.user.get_full_name()}'
 
+    def save(self, *args, **kwargs):
+        # Os sinais travam a linha antiga e atualizam os resumos na mesma transação.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def get_search_document(self):
+        return build_search_document(self, CUSTOMER_SEARCH_FIELDS)
+
+    def update_derived_fields(self):
+        '''
+        Recalcula os campos de derived_fields.
+        Chame antes de bulk_create e bulk_update, que não enviam sinais.
+        '''
+        self.rg_display = format_rg(self.rg)
+        self.cpf_display = format_cpf(self.cpf)
+        self.cep_display = format_cep(self.cep)
+        self.search_document = self.get_search_document()
+
 
 class Comission(models.Model):
     group = models.ForeignKey(
@@ -45,3 +97,50 @@ class Comission(models.Model):
 
     def __str__(self):
         return f'{self.group}'
+
+
+class SellerSummary(models.Model):
+    '''
+    Clientes de cada vendedor, atualizado a cada alteração de Customer
+    (veja backend/crm/summaries.py).
+    '''
+    seller = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='seller_summary'
+    )
+    customers = models.IntegerField(default=0)
+    active_customers = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ('-customers', 'seller')
+        verbose_name = 'resumo do vendedor'
+        verbose_name_plural = 'resumos dos vendedores'
+
+    def __str__(self):
+        return f'{self.seller}'
+
+
+class GroupSummary(models.Model):
+    '''
+    Vendedores e clientes de cada grupo, atualizado com os clientes
+    e com a entrada e saída de usuários do grupo.
+    '''
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='summary'
+    )
+    sellers = models.IntegerField(default=0)
+    customers = models.IntegerField(default=0)
+    active_customers = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ('group__name',)
+        verbose_name = 'resumo do grupo'
+        verbose_name_plural = 'resumos dos grupos'
+
+    def __str__(self):
+        return f'{self.group}'
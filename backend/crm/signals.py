@@ -0,0 +1,118 @@
+from django.contrib.auth.models import Group, User
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save
+)
+from django.dispatch import receiver
+
+from backend.core.search import update_search_documents, update_search_vector
+from backend.crm.models import CUSTOMER_SEARCH_FIELDS, Customer, GroupSummary
+from backend.crm.summaries import change_customers, change_membership
+
+
+def update_customer_documents(queryset):
+    update_search_documents(queryset.select_related('user', 'seller'), CUSTOMER_SEARCH_FIELDS)
+
+
+@receiver(pre_save, sender=Customer)
+def customer_pre_save(sender, instance, **kwargs):
+    instance.update_derived_fields()
+
+    # Vendedor e situação antes da alteração, para os resumos.
+    # A linha fica travada até o fim do save() (atomic em Customer.save), senão dois saves
+    # concorrentes leriam o mesmo estado antigo e o descontariam duas vezes.
+    instance._summary_state = None
+    if not instance._state.adding:
+        instance._summary_state = (
+            Customer.objects.select_for_update()
+            .filter(pk=instance.pk)
+            # Sem o ordering do model, que faria JOIN com auth_user e travaria o usuário também.
+            .order_by()
+            .values_list('seller_id', 'active')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Customer)
+def customer_post_save(sender, instance, update_fields=None, **kwargs):
+    queryset = Customer.objects.filter(pk=instance.pk)
+    if update_fields is not None:
+        # save(update_fields=...) sem os campos calculados.
+        missing = [name for name in Customer.derived_fields if name not in update_fields]
+        if missing:
+            queryset.update(**{name: getattr(instance, name) for name in missing})
+    update_search_vector(queryset)
+
+    previous = getattr(instance, '_summary_state', None)
+    if previous != (instance.seller_id, instance.active):
+        if previous is not None:
+            seller_id, active = previous
+            change_customers(seller_id, -1, -int(active))
+        change_customers(instance.seller_id, 1, int(instance.active))
+
+
+@receiver(post_delete, sender=Customer)
+def customer_deleted(sender, instance, **kwargs):
+    change_customers(instance.seller_id, -1, -int(instance.active))
+
+
+@receiver(post_save, sender=Group)
+def group_saved(sender, instance, created, **kwargs):
+    if created:
+        GroupSummary.objects.get_or_create(group=instance)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def user_groups_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    '''
+    Usuário entrou ou saiu de grupos (user.groups ou group.user_set).
+    As saídas são contadas antes, só com quem realmente era membro.
+    '''
+    if action not in ('post_add', 'pre_remove', 'pre_clear'):
+        return
+
+    memberships = sender.objects.filter(**{'group_id' if reverse else 'user_id': instance.pk})
+    if action == 'pre_remove':
+        memberships = memberships.filter(**{'user_id__in' if reverse else 'group_id__in': pk_set})
+
+    if action == 'post_add':
+        pairs = [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+    else:
+        pairs = list(memberships.values_list('user_id', 'group_id'))
+
+    sign = 1 if action == 'post_add' else -1
+    groups_by_user = {}
+    for user_id, group_id in pairs:
+        groups_by_user.setdefault(user_id, []).append(group_id)
+    for user_id, group_ids in groups_by_user.items():
+        change_membership(user_id, group_ids, sign)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    '''
+    Nome ou e-mail do cliente ou do vendedor mudou.
+    O login só atualiza o last_login, que não entra na busca.
+    '''
+    if created or (update_fields and set(update_fields) <= {'last_login'}):
+        return
+    update_customer_documents(Customer.objects.filter(Q(user=instance) | Q(seller=instance)))
+
+
+@receiver(pre_delete, sender=User)
+def seller_pre_delete(sender, instance, **kwargs):
+    # O SET_NULL do seller não envia sinais; guarda quem precisa ser atualizado.
+    instance._seller_customer_ids = list(instance.seller_customers.values_list('pk', flat=True))
+    # Os grupos do usuário também são apagados sem m2m_changed.
+    change_membership(instance.pk, list(instance.groups.values_list('pk', flat=True)), -1)
+
+
+@receiver(post_delete, sender=User)
+def seller_deleted(sender, instance, **kwargs):
+    customer_ids = getattr(instance, '_seller_customer_ids', None)
+    if customer_ids:
+        update_customer_documents(Customer.objects.filter(pk__in=customer_ids))
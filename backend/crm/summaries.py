@@ -0,0 +1,99 @@
+'''
+Tabelas de resumo de vendedores e grupos.
+
+Os contadores são somados ou subtraídos (UPDATE ... SET x = x + n) a cada
+alteração, em vez de contar os clientes a cada consulta.
+QuerySet.update() e bulk_create em Customer não enviam sinais:
+chame rebuild_summaries() depois deles.
+'''
+from django.apps import apps as global_apps
+from django.db.models import Count, F, Q
+
+from backend.crm.models import GroupSummary, SellerSummary
+
+
+def _changes(customers, active_customers, sellers=0):
+    changes = {
+        'customers': F('customers') + customers,
+        'active_customers': F('active_customers') + active_customers,
+    }
+    if sellers:
+        changes['sellers'] = F('sellers') + sellers
+    return changes
+
+
+def change_customers(seller_id, customers, active_customers):
+    '''
+    Soma clientes (ou subtrai, com valores negativos) ao vendedor e aos grupos dele.
+    '''
+    if seller_id is None or (customers == 0 and active_customers == 0):
+        return
+
+    changes = _changes(customers, active_customers)
+    if not SellerSummary.objects.filter(seller_id=seller_id).update(**changes):
+        SellerSummary.objects.get_or_create(seller_id=seller_id)
+        SellerSummary.objects.filter(seller_id=seller_id).update(**changes)
+
+    GroupSummary.objects.filter(group__user=seller_id).update(**changes)
+
+
+def change_membership(user_id, group_ids, sign):
+    '''
+    Usuário entrou (sign=1) ou saiu (sign=-1) dos grupos:
+    soma ou subtrai o vendedor e os clientes dele de cada grupo.
+    '''
+    if not group_ids:
+        return
+
+    summary = SellerSummary.objects.filter(seller_id=user_id).values_list('customers', 'active_customers').first()
+    customers, active_customers = summary or (0, 0)
+
+    for group_id in group_ids:
+        GroupSummary.objects.get_or_create(group_id=group_id)
+
+    GroupSummary.objects.filter(group_id__in=group_ids).update(
+        **_changes(sign * customers, sign * active_customers, sellers=sign)
+    )
+
+
+def rebuild_summaries(apps=global_apps, using='default'):
+    '''
+    Recalcula todos os resumos do zero (também usado na migração).
+    '''
+    Customer = apps.get_model('crm', 'Customer')
+    Group = apps.get_model('auth', 'Group')
+    GroupSummary = apps.get_model('crm', 'GroupSummary')
+    SellerSummary = apps.get_model('crm', 'SellerSummary')
+
+    sellers = (
+        Customer.objects.using(using)
+        .filter(seller__isnull=False)
+        .order_by()
+        .values('seller')
+        .annotate(customers=Count('id'), active_customers=Count('id', filter=Q(active=True)))
+    )
+    SellerSummary.objects.using(using).all().delete()
+    SellerSummary.objects.using(using).bulk_create(
+        SellerSummary(
+            seller_id=row['seller'],
+            customers=row['customers'],
+            active_customers=row['active_customers'],
+        )
+        for row in sellers
+    )
+
+    groups = Group.objects.using(using).order_by().annotate(
+        total_sellers=Count('user', distinct=True),
+        total_customers=Count('user__seller_customers'),
+        total_active_customers=Count('user__seller_customers', filter=Q(user__seller_customers__active=True)),
+    )
+    GroupSummary.objects.using(using).all().delete()
+    GroupSummary.objects.using(using).bulk_create(
+        GroupSummary(
+            group_id=group.pk,
+            sellers=group.total_sellers,
+            customers=group.total_customers,
+            active_customers=group.total_active_customers,
+        )
+        for group in groups
+    )
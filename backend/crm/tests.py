@@ -1,3 +1,300 @@
+import csv
+import io
+import json
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import Comission, Customer, GroupSummary, SellerSummary
+from .summaries import rebuild_summaries
+
+
+class CustomerQueriesTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+
+    def create_customers(self, quantity):
+        for i in range(quantity):
+            user = User.objects.create(username=f'cliente{Customer.objects.count()}')
+            seller = User.objects.create(username=f'vendedor{Customer.objects.count()}')
+            Customer.objects.create(user=user, seller=seller, rg='123456789', cpf='12345678901', cep='12345678')
+
+    def count_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/customers/')
+        self.assertEqual(response.status_code, 200)
+        return len(context)
+
+    def test_customer_list_queries(self):
+        self.create_customers(2)
+        esperado = self.count_queries()
+
+        self.create_customers(8)
+        resultado = self.count_queries()
+
+        self.assertEqual(esperado, resultado)
+
+
+class CustomerExportTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+        for i in range(15):
+            user = User.objects.create(username=f'cliente{i}', first_name=f'Cliente {i}')
+            Customer.objects.create(user=user, rg='123456789', cpf='12345678901', cep='12345678')
+
+    def get_content(self, response):
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_export_ndjson(self):
+        response = self.client.get('/api/v1/customers/?format=ndjson')
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        linhas = [json.loads(linha) for linha in self.get_content(response).splitlines()]
+        self.assertEqual(len(linhas), 15)
+        self.assertEqual(linhas[0]['cpf'], '123.456.789-01')
+        self.assertEqual(linhas[0]['user']['username'], 'cliente0')
+
+    def test_export_csv(self):
+        response = self.client.get('/api/v1/customers/?format=csv')
+
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+        linhas = list(csv.DictReader(io.StringIO(self.get_content(response))))
+        self.assertEqual(len(linhas), 15)
+        self.assertEqual(linhas[0]['user.username'], 'cliente0')
+
+
+class CustomerSearchTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+        self.seller = User.objects.create(username='vendedor', first_name='Márcia', last_name='Lopes')
+        self.joao = Customer.objects.create(
+            user=User.objects.create(username='joao', first_name='João', last_name='Silva'),
+            seller=self.seller,
+            rg='123456789',
+            cpf='11122233344',
+            address='Rua das Flores',
+        )
+        self.maria = Customer.objects.create(
+            user=User.objects.create(username='maria', first_name='Maria', last_name='Souza'),
+            rg='987654321',
+            cpf='55566677788',
+        )
+
+    def search(self, term):
+        response = self.client.get('/api/v1/customers/', {'search': term})
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.json()['results']]
+
+    def test_search_document(self):
+        self.assertEqual(
+            self.joao.search_document,
+            'joao silva marcia lopes 123456789 11122233344 rua das flores'
+        )
+
+    def test_search_without_accents_and_prefix(self):
+        self.assertEqual(self.search('joão'), [self.joao.pk])
+        self.assertEqual(self.search('JOA sil'), [self.joao.pk])
+        self.assertEqual(self.search('marc'), [self.joao.pk])
+        self.assertEqual(self.search('555666'), [self.maria.pk])
+        self.assertEqual(self.search('joao souza'), [])
+
+    def test_user_change_updates_document(self):
+        self.seller.first_name = 'Renata'
+        self.seller.save()
+
+        self.assertEqual(self.search('marcia'), [])
+        self.assertEqual(self.search('renata'), [self.joao.pk])
+
+    def test_seller_delete_updates_document(self):
+        self.seller.delete()
+
+        self.assertEqual(self.search('lopes'), [])
+        self.assertEqual(self.search('joao'), [self.joao.pk])
+
+    def test_search_pages(self):
+        response = self.client.get('/api/v1/customers/', {'search': 'a', 'page_size': 1})
+        primeira = response.json()
+        segunda = self.client.get(primeira['next']).json()
+
+        ids = [item['id'] for item in primeira['results'] + segunda['results']]
+        self.assertEqual(sorted(ids), sorted([self.joao.pk, self.maria.pk]))
+
+    def test_search_pages_with_tied_rank(self):
+        # Mesma relevância em todos, então o cursor compara o rank de linhas empatadas.
+        joaos = [self.joao.pk] + [
+            Customer.objects.create(
+                user=User.objects.create(username=f'joao{index}', first_name='João', last_name='Silva')
+            ).pk
+            for index in range(11)
+        ]
+
+        ids = []
+        url, params = '/api/v1/customers/', {'search': 'joao', 'page_size': 3}
+        while url:
+            page = self.client.get(url, params).json()
+            ids += [item['id'] for item in page['results']]
+            url, params = page['next'], None
+
+        self.assertEqual(sorted(ids), sorted(joaos))
+
+
+class CustomerDocumentsTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+
+    def test_display_fields(self):
+        customer = Customer.objects.create(user=self.user, rg='12345678X', cpf='12345678901', cep='12345678')
+
+        self.assertEqual(customer.rg_display, '12.345.678-X')
+        self.assertEqual(customer.cpf_display, '123.456.789-01')
+        self.assertEqual(customer.cep_display, '12345-678')
+
+        customer.cpf = '98765432100'
+        customer.save(update_fields=['cpf'])
+        customer.refresh_from_db()
+        self.assertEqual(customer.cpf_display, '987.654.321-00')
+
+    def test_empty_documents(self):
+        customer = Customer.objects.create(user=self.user)
+
+        data = self.client.get(f'/api/v1/customers/{customer.pk}/').json()
+        self.assertEqual((data['rg'], data['cpf'], data['cep']), (None, None, None))
+
+    def test_create_validates_digits(self):
+        data = {'user': self.user.pk, 'rg': '123456789', 'cpf': '123.456.789-01', 'cep': '12345678'}
+        response = self.client.post('/api/v1/customers/', data)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cpf', response.json())
+
+        data['cpf'] = '12345678901'
+        response = self.client.post('/api/v1/customers/', data)
+        self.assertEqual(response.status_code, 201)
+
+
+class SummaryTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+        self.group = Group.objects.create(name='Equipe A')
+        Comission.objects.create(group=self.group, percentage=10)
+        self.seller = User.objects.create(username='vendedor')
+        self.other = User.objects.create(username='outro')
+        self.seller.groups.add(self.group)
+
+    def create_customer(self, seller, active=True):
+        user = User.objects.create(username=f'cliente{Customer.objects.count()}')
+        return Customer.objects.create(user=user, seller=seller, active=active)
+
+    def get_counts(self):
+        # Vendedor que ficou sem clientes pode continuar com a linha zerada.
+        sellers = {
+            summary.seller_id: (summary.customers, summary.active_customers)
+            for summary in SellerSummary.objects.exclude(customers=0)
+        }
+        groups = {
+            summary.group_id: (summary.sellers, summary.customers, summary.active_customers)
+            for summary in GroupSummary.objects.all()
+        }
+        return sellers, groups
+
+    def assertCountsMatchRebuild(self):
+        counts = self.get_counts()
+        rebuild_summaries()
+        self.assertEqual(counts, self.get_counts())
+
+    def test_customer_changes(self):
+        customer = self.create_customer(self.seller)
+        self.create_customer(self.seller, active=False)
+        self.create_customer(self.other)
+
+        self.assertEqual(SellerSummary.objects.get(seller=self.seller).customers, 2)
+        self.assertEqual(GroupSummary.objects.get(group=self.group).customers, 2)
+
+        customer.active = False
+        customer.save()
+        self.assertEqual(SellerSummary.objects.get(seller=self.seller).active_customers, 0)
+
+        customer.seller = self.other
+        customer.save()
+        self.assertEqual(SellerSummary.objects.get(seller=self.other).customers, 2)
+        self.assertCountsMatchRebuild()
+
+        customer.delete()
+        self.assertCountsMatchRebuild()
+
+    def test_customer_save_locks_previous_state(self):
+        customer = self.create_customer(self.seller)
+        customer.seller = self.other
+
+        with CaptureQueriesContext(connection) as context:
+            customer.save()
+
+        select = next(query['sql'] for query in context if query['sql'].startswith('SELECT'))
+        self.assertIn('"crm_customer"."seller_id"', select)
+        self.assertNotIn('auth_user', select)
+        if connection.features.has_select_for_update:
+            self.assertIn('FOR UPDATE', select)
+
+    def test_group_changes(self):
+        self.create_customer(self.seller)
+        self.create_customer(self.other)
+        self.create_customer(self.other)
+
+        self.group.user_set.add(self.other)
+        self.assertEqual(GroupSummary.objects.get(group=self.group).customers, 3)
+        self.assertCountsMatchRebuild()
+
+        self.seller.groups.remove(self.group, Group.objects.create(name='Equipe B'))
+        self.assertEqual(GroupSummary.objects.get(group=self.group).sellers, 1)
+        self.assertCountsMatchRebuild()
+
+        self.other.groups.clear()
+        self.assertEqual(GroupSummary.objects.get(group=self.group).customers, 0)
+        self.assertCountsMatchRebuild()
+
+    def test_seller_delete(self):
+        self.create_customer(self.seller)
+        self.seller.delete()
+
+        self.assertEqual(GroupSummary.objects.get(group=self.group).sellers, 0)
+        self.assertCountsMatchRebuild()
+
+    def test_summary_endpoints(self):
+        self.create_customer(self.seller)
+
+        response = self.client.get('/api/v1/summaries/sellers/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [{
+            'seller': self.seller.pk,
+            'username': 'vendedor',
+            'name': '',
+            'groups': ['Equipe A'],
+            'customers': 1,
+            'active_customers': 1,
+        }])
 
-# Create your tests here.
+        response = self.client.get('/api/v1/summaries/groups/')
+        self.assertEqual(response.json()['results'], [{
+            'group': self.group.pk,
+            'name': 'Equipe A',
+            'comissions': ['10.00'],
+            'sellers': 1,
+            'customers': 1,
+            'active_customers': 1,
+        }])
@@ -1,7 +1,12 @@
 from django.urls import include, path
 from rest_framework import routers
 
-from backend.crm.api.viewsets import ComissionViewSet, CustomerViewSet
+from backend.crm.api.viewsets import (
+    ComissionViewSet,
+    CustomerViewSet,
+    GroupSummaryViewSet,
+    SellerSummaryViewSet
+)
 
 app_name = 'crm'
 
@@ -9,6 +14,8 @@ router = routers.DefaultRouter()
 
 router.register(r'comissions', ComissionViewSet, basename='comission')
 router.register(r'customers', CustomerViewSet, basename='customer')
+router.register(r'summaries/sellers', SellerSummaryViewSet, basename='seller-summary')
+router.register(r'summaries/groups', GroupSummaryViewSet, basename='group-summary')
 
 urlpatterns = [
     path('api/v1/', include(router.urls)),
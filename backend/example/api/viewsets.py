@@ -2,13 +2,15 @@ from rest_framework import viewsets
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.core.api.mixins import ConditionalGetMixin, SparseFieldsMixin
 from backend.example.api.serializers import ExampleSerializer
 from backend.example.models import Example
 
 
-class ExampleViewSet(viewsets.ModelViewSet):
+class ExampleViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Example.objects.all()
     serializer_class = ExampleSerializer
+    etag_field = 'updated'
 
 
 class ExampleView(APIView):
@@ -1,15 +1,30 @@
 from rest_framework import serializers
 
+from backend.core.api.serializers import FastModelSerializer
+from backend.hotel.imports import DATE_RANGE_MESSAGE, is_valid_range
 from backend.hotel.models import Hotel
 
 
-class HotelSerializer(serializers.ModelSerializer):
+class HotelSerializer(FastModelSerializer):
 
     class Meta:
         model = Hotel
         fields = '__all__'
 
     def validate(self, data):
-        if data['start_date'] > data['end_date']:
-            raise serializers.ValidationError('A data inicial deve ser anterior ou igual a data final!')
+        # As datas podem ser nulas e, no PATCH, vir só uma delas.
+        start_date = data.get('start_date', getattr(self.instance, 'start_date', None))
+        end_date = data.get('end_date', getattr(self.instance, 'end_date', None))
+        if not is_valid_range(start_date, end_date):
+            raise serializers.ValidationError(DATE_RANGE_MESSAGE)
+        return data
+
+
+class HotelAvailabilitySerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+
+    def validate(self, data):
+        if not is_valid_range(data['start_date'], data['end_date']):
+            raise serializers.ValidationError(DATE_RANGE_MESSAGE)
         return data
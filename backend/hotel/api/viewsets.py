@@ -1,11 +1,86 @@
-from rest_framework import viewsets
-from rest_framework.permissions import AllowAny
+import csv
+import io
 
-from backend.hotel.api.serializers import HotelSerializer
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.permissions import AllowAny, DjangoModelPermissions
+from rest_framework.response import Response
+
+from backend.core.api.mixins import ConditionalGetMixin, SparseFieldsMixin
+from backend.core.api.pagination import KeysetPagination
+from backend.hotel.api.serializers import (
+    HotelAvailabilitySerializer,
+    HotelSerializer
+)
+from backend.hotel.availability import available_between
+from backend.hotel.imports import import_hotels, validate_hotels
 from backend.hotel.models import Hotel
 
 
-class HotelViewSet(viewsets.ModelViewSet):
+class HotelViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Hotel.objects.all()
     serializer_class = HotelSerializer
     permission_classes = (AllowAny,)
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created', '-id')
+    sparse_actions = ('list', 'retrieve', 'available')
+    import_max_rows = 100000
+    import_max_errors = 100
+    import_batch_size = 1000
+
+    def get_import_rows(self, request):
+        '''
+        Linhas de um arquivo CSV (campo "file") ou de uma lista em JSON.
+        '''
+        upload = request.FILES.get('file')
+        if upload is not None:
+            try:
+                return list(csv.DictReader(io.TextIOWrapper(upload, encoding='utf-8-sig')))
+            except (UnicodeDecodeError, csv.Error):
+                raise DRFValidationError({'file': 'Envie um arquivo CSV em UTF-8.'})
+
+        if isinstance(request.data, list):
+            return request.data
+
+        raise DRFValidationError('Envie uma lista de hotéis ou um arquivo CSV no campo file.')
+
+    @action(detail=False, methods=['post'], url_path='import', permission_classes=(DjangoModelPermissions,))
+    def bulk_import(self, request):
+        '''
+        Importa hotéis (name, start_date, end_date) com bulk_create.
+        Todas as linhas são validadas antes: se alguma tiver erro nada é gravado,
+        e a resposta traz os erros das primeiras linhas inválidas.
+        Exige a permissão hotel.add_hotel.
+        '''
+        rows = self.get_import_rows(request)
+        if len(rows) > self.import_max_rows:
+            raise DRFValidationError(f'Envie no máximo {self.import_max_rows} hotéis por vez.')
+
+        columns, errors = validate_hotels(rows)
+        if errors:
+            return Response({
+                'error_count': len(errors),
+                'errors': [{'row': index, **errors[index]} for index in sorted(errors)[:self.import_max_errors]],
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        hotels = import_hotels(columns, batch_size=self.import_batch_size)
+        return Response({'created': len(hotels)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def available(self, request):
+        '''
+        Hotéis disponíveis em todo o intervalo ?start_date=2026-01-10&end_date=2026-01-15.
+        '''
+        params = HotelAvailabilitySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        hotels = available_between(self.filter_queryset(self.get_queryset()), **params.validated_data)
+
+        page = self.paginate_queryset(hotels)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(hotels, many=True)
+        return Response(serializer.data)
@@ -0,0 +1,38 @@
+'''
+Hotéis disponíveis em um intervalo de datas.
+
+O período de cada hotel é [start_date, end_date], e uma data nula não tem limite.
+No PostgreSQL a busca usa daterange(start_date, end_date, '[]') @> intervalo,
+com o índice GiST da migração 0003; nos outros bancos compara as colunas.
+'''
+from django.contrib.postgres.fields import DateRangeField
+from django.db.models import F, Func, Q, Value
+from psycopg2.extras import DateRange
+
+from backend.core.search import is_postgresql
+
+
+def availability():
+    # A mesma expressão do índice hotel_availability_gist, senão o índice não é usado.
+    return Func(
+        F('start_date'),
+        F('end_date'),
+        Value('[]'),
+        function='daterange',
+        output_field=DateRangeField(),
+    )
+
+
+def available_between(queryset, start_date, end_date):
+    '''
+    Hotéis cujo período cobre todo o intervalo [start_date, end_date].
+    '''
+    if is_postgresql(queryset.model):
+        return queryset.annotate(availability=availability()).filter(
+            availability__contains=DateRange(start_date, end_date, '[]')
+        )
+
+    return queryset.filter(
+        Q(start_date__isnull=True) | Q(start_date__lte=start_date),
+        Q(end_date__isnull=True) | Q(end_date__gte=end_date),
+    )
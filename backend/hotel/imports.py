@@ -0,0 +1,100 @@
+'''
+Importação de hotéis em lote.
+
+As linhas são validadas coluna a coluna, sem um serializer por linha:
+primeiro cada coluna é convertida, depois as datas são comparadas em uma passada só.
+Os erros ficam por linha, como o ListSerializer do DRF devolveria.
+'''
+import datetime
+from collections import defaultdict
+
+from django.db import transaction
+
+from backend.core.versions import bump_model_version
+from backend.hotel.models import Hotel
+
+DATE_RANGE_MESSAGE = 'A data inicial deve ser anterior ou igual a data final!'
+INVALID_DATE_MESSAGE = 'Informe uma data válida no formato AAAA-MM-DD.'
+REQUIRED_MESSAGE = 'Este campo é obrigatório.'
+INVALID_ROW_MESSAGE = 'Cada linha deve ser um objeto com name, start_date e end_date.'
+
+HOTEL_IMPORT_FIELDS = ('name', 'start_date', 'end_date')
+
+
+def is_valid_range(start_date, end_date):
+    '''
+    Datas nulas não têm limite, então só o par completo pode ser inválido.
+    '''
+    return start_date is None or end_date is None or start_date <= end_date
+
+
+def get_column(rows, name):
+    return [row.get(name) if isinstance(row, dict) else None for row in rows]
+
+
+def parse_names(values, errors):
+    max_length = Hotel._meta.get_field('name').max_length
+    names = []
+
+    for index, value in enumerate(values):
+        name = value.strip() if isinstance(value, str) else ''
+        if not name:
+            errors[index]['name'] = [REQUIRED_MESSAGE]
+        elif len(name) > max_length:
+            errors[index]['name'] = [f'Certifique-se de que este campo não tenha mais de {max_length} caracteres.']
+        names.append(name)
+    return names
+
+
+def parse_dates(values, field, errors):
+    dates = []
+
+    for index, value in enumerate(values):
+        if value is None or value == '':
+            dates.append(None)
+            continue
+        try:
+            dates.append(datetime.date.fromisoformat(value))
+        except (TypeError, ValueError):
+            errors[index][field] = [INVALID_DATE_MESSAGE]
+            dates.append(None)
+    return dates
+
+
+def validate_hotels(rows):
+    '''
+    Retorna (colunas, erros): as colunas convertidas (name, start_date, end_date)
+    e os erros por linha, {índice: {campo: [mensagens]}}.
+    '''
+    errors = defaultdict(dict)
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            errors[index]['non_field_errors'] = [INVALID_ROW_MESSAGE]
+
+    names = parse_names(get_column(rows, 'name'), errors)
+    start_dates = parse_dates(get_column(rows, 'start_date'), 'start_date', errors)
+    end_dates = parse_dates(get_column(rows, 'end_date'), 'end_date', errors)
+
+    for index, (start_date, end_date) in enumerate(zip(start_dates, end_dates)):
+        if not is_valid_range(start_date, end_date):
+            errors[index].setdefault('non_field_errors', []).append(DATE_RANGE_MESSAGE)
+
+    return (names, start_dates, end_dates), dict(errors)
+
+
+def import_hotels(columns, batch_size=1000):
+    '''
+    Grava as colunas já validadas com bulk_create, tudo ou nada.
+    '''
+    hotels = [
+        Hotel(name=name, start_date=start_date, end_date=end_date)
+        for name, start_date, end_date in zip(*columns)
+    ]
+
+    with transaction.atomic():
+        hotels = Hotel.objects.bulk_create(hotels, batch_size=batch_size)
+
+    # bulk_create não envia sinais.
+    bump_model_version(Hotel)
+    return hotels
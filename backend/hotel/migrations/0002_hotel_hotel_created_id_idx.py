@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotel',
+            index=models.Index(fields=['created', 'id'], name='hotel_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.0.10 on 2026-10-18 11:22
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+def swap_inverted_dates(apps, schema_editor):
+    '''
+    Hotéis com a data inicial depois da final, gravados antes da constraint,
+    têm as datas trocadas de lugar.
+    '''
+    Hotel = apps.get_model('hotel', 'Hotel')
+    hotels = Hotel.objects.using(schema_editor.connection.alias).filter(start_date__gt=models.F('end_date'))
+    hotels.update(start_date=models.F('end_date'), end_date=models.F('start_date'))
+
+
+def create_availability_index(apps, schema_editor):
+    '''
+    Índice GiST do período de cada hotel, usado pela busca de hotéis disponíveis.
+    Só existe no PostgreSQL.
+    '''
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute(
+        "CREATE INDEX hotel_availability_gist ON hotel_hotel "
+        "USING gist (daterange(start_date, end_date, '[]'))"
+    )
+
+
+def drop_availability_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    schema_editor.execute('DROP INDEX IF EXISTS hotel_availability_gist')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hotel', '0002_hotel_hotel_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(swap_inverted_dates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='hotel',
+            constraint=models.CheckConstraint(check=models.Q(('start_date__isnull', True), ('end_date__isnull', True), ('start_date__lte', django.db.models.expressions.F('end_date')), _connector='OR'), name='hotel_start_date_lte_end_date'),
+        ),
+        migrations.RunPython(create_availability_index, drop_availability_index),
+    ]
@@ -1,5 +1,9 @@
 from django.db import models
 
+# Uma data nula não tem limite (veja backend.hotel.availability).
+OPEN_PERIOD = models.Q(start_date__isnull=True) | models.Q(end_date__isnull=True)
+VALID_PERIOD = OPEN_PERIOD | models.Q(start_date__lte=models.F('end_date'))
+
 
 class Hotel(models.Model):
     name = models.CharField(max_length=32)
@@ -13,3 +17,14 @@ class Hotel(models.Model):
     class Meta:
         verbose_name = 'Hotel'
         verbose_name_plural = 'Hotéis'
+        indexes = [
+            # Usado pela paginação por chave (KeysetPagination).
+            models.Index(fields=['created', 'id'], name='hotel_created_id_idx'),
+        ]
+        constraints = [
+            # Garante que daterange(start_date, end_date) é válido (veja backend.hotel.availability).
+            models.CheckConstraint(
+                check=VALID_PERIOD,
+                name='hotel_start_date_lte_end_date',
+            ),
+        ]
@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework import routers
 
+from backend.hotel import views as v
 from backend.hotel.api.viewsets import HotelViewSet
 
 app_name = 'hotel'
@@ -11,4 +12,7 @@ router.register(r'hotels', HotelViewSet, basename='hotel')
 
 urlpatterns = [
     path('api/v1/', include(router.urls)),
+    # async
+    path('api/v1/async/hotels/', v.hotels, name='hotels_async'),
+    path('api/v1/async/hotels/<int:pk>/', v.hotel, name='hotel_async'),
 ]
@@ -0,0 +1,36 @@
+from backend.core.aio import aget, apaginate, json_response, not_allowed
+from backend.core.api.pagination import KeysetPagination
+from backend.hotel.api.serializers import HotelSerializer
+from backend.hotel.api.viewsets import HotelViewSet
+from backend.hotel.models import Hotel
+
+
+async def hotels(request):
+    '''
+    Lista de hotéis, async. Mesma resposta do /api/v1/hotels/.
+    '''
+    response = not_allowed(request)
+    if response is not None:
+        return response
+
+    paginator = KeysetPagination()
+    queryset = HotelSerializer.values_list(Hotel.objects.all())
+    page = await apaginate(paginator, queryset, request, view=HotelViewSet)
+
+    data = HotelSerializer(page, many=True).data
+    return json_response(paginator.get_paginated_response(data).data)
+
+
+async def hotel(request, pk):
+    '''
+    Detalhes de um hotel, async.
+    '''
+    response = not_allowed(request)
+    if response is not None:
+        return response
+
+    hotel = await aget(Hotel.objects.all(), pk=pk)
+    if hotel is None:
+        return json_response({'detail': 'Não encontrado.'}, status=404)
+
+    return json_response(HotelSerializer(hotel).data)
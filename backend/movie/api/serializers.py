@@ -1,5 +1,7 @@
 from rest_framework import serializers
 
+from backend.core.api.serializers import FastModelSerializer
+from backend.core.versions import bump_model_version
 from backend.movie.models import Category, Movie
 
 # class CategorySerializer(serializers.Serializer):
@@ -108,7 +110,7 @@ class MovieSerializer(serializers.ModelSerializer):
     #     return value
 
     def validate(self, data):
-        if 'lorem' in data['title'].lower():
+        if 'lorem' in data.get('title', '').lower():
             raise serializers.ValidationError('Lorem não pode.')
         return data
 
@@ -159,3 +161,98 @@ class MovieReadOnlySerializer(serializers.ModelSerializer):
         model = Movie
         fields = ('id', 'title', 'sinopse', 'rating', 'like', 'created')
         read_only_fields = fields
+
+
+class MovieFastSerializer(FastModelSerializer):
+
+    class Meta:
+        model = Movie
+        fields = ('id', 'title', 'sinopse', 'rating', 'like', 'created')
+        read_only_fields = fields
+
+
+class MovieBulkListSerializer(serializers.ListSerializer):
+    '''
+    Cria e edita vários filmes com bulk_create e bulk_update,
+    buscando todas as categorias em uma única query.
+    '''
+    batch_size = 1000
+
+    def validate(self, attrs):
+        if self.instance is not None:
+            ids = {movie.pk for movie in self.instance}
+            for item in attrs:
+                if item.get('id') not in ids:
+                    raise serializers.ValidationError(f"Filme não encontrado: {item.get('id')}.")
+        return attrs
+
+    def get_categories(self, validated_data):
+        '''
+        Retorna um dicionário título -> categoria, criando as que não existem.
+        '''
+        titles = {
+            item['category'].get('title', '')
+            for item in validated_data
+            if item.get('category')
+        }
+        categories = {}
+
+        for category in Category.objects.filter(title__in=titles).order_by('id'):
+            categories.setdefault(category.title, category)
+
+        missing = [Category(title=title) for title in titles if title not in categories]
+        for category in Category.objects.bulk_create(missing):
+            categories[category.title] = category
+
+        if missing:
+            bump_model_version(Category)
+
+        return categories
+
+    def set_category(self, item, categories):
+        if 'category' in item:
+            category_data = item.pop('category')
+            item['category'] = categories[category_data.get('title', '')] if category_data else None
+
+    def create(self, validated_data):
+        categories = self.get_categories(validated_data)
+        movies = []
+
+        for item in validated_data:
+            item.pop('id', None)
+            self.set_category(item, categories)
+            movies.append(Movie(**item))
+
+        movies = Movie.objects.bulk_create(movies, batch_size=self.batch_size)
+        bump_model_version(Movie)
+        return movies
+
+    def update(self, instance, validated_data):
+        movies = {movie.pk: movie for movie in instance}
+        categories = self.get_categories(validated_data)
+        fields = set()
+        updated = []
+
+        for item in validated_data:
+            movie = movies[item.pop('id')]
+            self.set_category(item, categories)
+
+            for attr, value in item.items():
+                setattr(movie, attr, value)
+                fields.add(attr)
+
+            updated.append(movie)
+
+        if fields:
+            Movie.objects.bulk_update(updated, fields, batch_size=self.batch_size)
+            bump_model_version(Movie)
+
+        return updated
+
+
+class MovieBulkSerializer(MovieSerializer):
+    # O id é obrigatório somente na edição em massa.
+    id = serializers.IntegerField(required=False)
+
+    class Meta(MovieSerializer.Meta):
+        list_serializer_class = MovieBulkListSerializer
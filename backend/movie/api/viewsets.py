@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status, viewsets
 from rest_framework.authentication import (
     BasicAuthentication,
@@ -15,15 +16,25 @@ from rest_framework.permissions import (
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from backend.core.api.mixins import (
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    ExportMixin,
+    SparseFieldsMixin
+)
+from backend.core.api.pagination import KeysetPagination
+from backend.core.groups import get_user_groups
 from backend.movie.api.serializers import (
     CategorySerializer,
+    MovieBulkSerializer,
+    MovieFastSerializer,
     MovieReadOnlySerializer,
     MovieSerializer
 )
 from backend.movie.models import Category, Movie
 
 
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, CachedResponseMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     # authentication_classes = (
@@ -61,8 +72,8 @@ class CensurePermission(BasePermission):
     #         return True
 
     def has_object_permission(self, request, view, obj):
-        # Retorna uma lista de todos os grupos do usuário logado.
-        groups = request.user.groups.values_list('name', flat=True)
+        # Retorna os grupos do usuário logado (em cache).
+        groups = get_user_groups(request.user)
 
         censure = obj.censure
 
@@ -90,11 +101,17 @@ class NotDeletePermission(BasePermission):
             return True
 
 
-class MovieViewSet(viewsets.ModelViewSet):
+class MovieViewSet(ExportMixin, ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     # queryset = Movie.objects.all()
     serializer_class = MovieSerializer
+    etag_models = (Movie, Category)
     # permission_classes = (IsAuthenticatedOrReadOnly,)
     permission_classes = (DjangoModelPermissions, CensurePermission, NotDeletePermission)
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created', '-id')
+    sparse_actions = ('list', 'retrieve', 'get_good_movies')
+    # Lido pela CensurePermission.
+    sparse_required_fields = ('censure',)
 
     def get_queryset(self):
         return Movie.objects.all()
@@ -104,7 +121,7 @@ class MovieViewSet(viewsets.ModelViewSet):
         '''
         Retorna somente filmes bons, com rating maior ou igual a 4.
         '''
-        movies = Movie.objects.filter(rating__gte=4)
+        movies = self.filter_queryset(Movie.objects.filter(rating__gte=4))
 
         page = self.paginate_queryset(movies)
         if page is not None:
@@ -138,6 +155,52 @@ class MovieViewSet(viewsets.ModelViewSet):
         serializer = [movie.to_dict() for movie in movies]
         return Response(serializer)
 
+    @action(detail=False, methods=['get'])
+    def movies_fast_readonly(self, request, pk=None):
+        '''
+        Lê somente as colunas necessárias, como tuplas, e monta o JSON
+        com o plano compilado do MovieFastSerializer.
+        '''
+        movies = MovieFastSerializer.values_list(Movie.objects.all())
+
+        page = self.paginate_queryset(movies)
+        if page is not None:
+            serializer = MovieFastSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = MovieFastSerializer(movies, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request, pk=None):
+        '''
+        Cria (POST) ou edita parcialmente (PATCH) vários filmes de uma vez.
+        Na edição, cada item deve ter o id do filme.
+        A exclusão em massa não existe, pois nenhum filme pode ser deletado.
+        '''
+        if request.method == 'POST':
+            serializer = MovieBulkSerializer(data=request.data, many=True)
+            response_status = status.HTTP_201_CREATED
+        else:
+            ids = []
+            if isinstance(request.data, list):
+                ids = [item.get('id') for item in request.data if isinstance(item, dict)]
+
+            movies = list(self.get_queryset().filter(pk__in=ids).select_related('category'))
+            # As mesmas regras da edição de um filme só (CensurePermission).
+            for movie in movies:
+                self.check_object_permissions(request, movie)
+
+            serializer = MovieBulkSerializer(movies, data=request.data, many=True, partial=True)
+            response_status = status.HTTP_200_OK
+
+        serializer.is_valid(raise_exception=True)
+
+        with transaction.atomic():
+            serializer.save()
+
+        return Response(serializer.data, status=response_status)
+
 
 class MovieExampleView(APIView):
 
@@ -33,6 +33,10 @@ class Movie(models.Model):
 
     class Meta:
         verbose_name_plural = "Movies"
+        indexes = [
+            # Usado pela paginação por chave (KeysetPagination).
+            models.Index(fields=['created', 'id'], name='movie_created_id_idx'),
+        ]
 
     def to_dict(self):
         return {
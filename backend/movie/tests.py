@@ -0,0 +1,130 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import Group, User
+from django.test import TestCase
+
+from .models import Category, Movie
+
+
+class MovieBulkTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+        self.payload = [
+            {
+                "title": f"Filme {i}",
+                "sinopse": "Sinopse",
+                "rating": 5,
+                "like": True,
+                "censure": 12,
+                "category": {"title": "Drama" if i % 2 else "Ação"}
+            }
+            for i in range(20)
+        ]
+
+    def test_bulk_create(self):
+        Category.objects.create(title='Drama')
+
+        with self.assertNumQueries(7):
+            # sessão, usuário, savepoint, categorias, nova categoria, filmes e release.
+            response = self.client.post(
+                '/api/v1/movies/bulk/',
+                data=self.payload,
+                content_type='application/json'
+            )
+
+        self.assertEqual(response.status_code, 201)
+        resultado = json.loads(response.content)
+        self.assertEqual(len(resultado), 20)
+        self.assertEqual(Movie.objects.count(), 20)
+        self.assertEqual(Category.objects.count(), 2)
+        self.assertEqual(Movie.objects.filter(category__title='Drama').count(), 10)
+
+    def test_bulk_create_invalid(self):
+        self.payload[3]['title'] = 'Lorem'
+
+        response = self.client.post(
+            '/api/v1/movies/bulk/',
+            data=self.payload,
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Movie.objects.count(), 0)
+
+    def test_bulk_partial_update(self):
+        self.client.post('/api/v1/movies/bulk/', data=self.payload, content_type='application/json')
+        movies = Movie.objects.order_by('id')[:3]
+        data = [
+            {"id": movie.id, "rating": 1, "category": {"title": "Terror"}}
+            for movie in movies
+        ]
+
+        response = self.client.patch(
+            '/api/v1/movies/bulk/',
+            data=data,
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Movie.objects.filter(rating=1, category__title='Terror').count(), 3)
+        self.assertEqual(Movie.objects.filter(rating=5).count(), 17)
+
+    def test_bulk_partial_update_unknown_id(self):
+        response = self.client.patch(
+            '/api/v1/movies/bulk/',
+            data=[{"id": 999, "rating": 1}],
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_partial_update_censure(self):
+        movie = Movie.objects.create(title='Adulto', rating=5, like=True, censure=16)
+        self.user.groups.add(Group.objects.create(name='Infantil'))
+
+        response = self.client.patch(
+            '/api/v1/movies/bulk/',
+            data=[{"id": movie.id, "rating": 1}],
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        movie.refresh_from_db()
+        self.assertEqual(movie.rating, 5)
+
+
+class MovieAsyncTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        for i in range(15):
+            Movie.objects.create(title=f'Filme {i}', rating=5, like=True, censure=10)
+
+    async def test_movie_list(self):
+        await sync_to_async(self.client.force_login)(self.user)
+        esperado = await sync_to_async(self.client.get)('/api/v1/movies/movies_fast_readonly/')
+
+        self.async_client.cookies = self.client.cookies
+        response = await self.async_client.get('/api/v1/async/movies/')
+
+        self.assertEqual(response.status_code, 200)
+        resultado = json.loads(response.content)
+        self.assertEqual(json.loads(esperado.content)['results'], resultado['results'])
+        self.assertIn('/api/v1/async/movies/?cursor=', resultado['next'])
+
+    async def test_movie_detail(self):
+        await sync_to_async(self.client.force_login)(self.user)
+        movie = await sync_to_async(Movie.objects.first)()
+
+        self.async_client.cookies = self.client.cookies
+        response = await self.async_client.get(f'/api/v1/async/movies/{movie.pk}/')
+
+        self.assertEqual(json.loads(response.content)['title'], movie.title)
+
+    async def test_not_authenticated(self):
+        response = await self.async_client.get('/api/v1/async/movies/')
+
+        self.assertEqual(response.status_code, 401)
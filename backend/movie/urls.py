@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework import routers
 
+from backend.movie import views as v
 from backend.movie.api.viewsets import (
     CategoryViewSet,
     MovieExampleView,
@@ -17,4 +18,7 @@ router.register(r'categories', CategoryViewSet, basename='category')
 urlpatterns = [
     path('api/v1/', include(router.urls)),
     path('api/v1/movie-examples/', MovieExampleView.as_view()),
+    # async
+    path('api/v1/async/movies/', v.movies, name='movies_async'),
+    path('api/v1/async/movies/<int:pk>/', v.movie, name='movie_async'),
 ]
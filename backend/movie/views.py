@@ -0,0 +1,70 @@
+from asgiref.sync import sync_to_async
+from rest_framework.exceptions import NotAuthenticated
+from rest_framework.exceptions import ValidationError as DRFValidationError
+
+from backend.core.aio import (
+    aget,
+    aget_user,
+    apaginate,
+    api_request,
+    json_response,
+    not_allowed
+)
+from backend.core.api.pagination import KeysetPagination
+from backend.movie.api.serializers import MovieFastSerializer
+from backend.movie.api.viewsets import CensurePermission, MovieViewSet
+from backend.movie.models import Movie
+
+
+def not_authenticated():
+    return json_response({'detail': NotAuthenticated.default_detail}, status=401)
+
+
+async def movies(request):
+    '''
+    Lista de filmes somente leitura, async.
+    Mesma resposta do /api/v1/movies/movies_fast_readonly/.
+    '''
+    response = not_allowed(request)
+    if response is not None:
+        return response
+
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return not_authenticated()
+
+    paginator = KeysetPagination()
+    queryset = MovieFastSerializer.values_list(Movie.objects.all())
+    page = await apaginate(paginator, queryset, request, view=MovieViewSet)
+
+    # As tuplas são serializadas no event loop, sem queries.
+    data = MovieFastSerializer(page, many=True).data
+    return json_response(paginator.get_paginated_response(data).data)
+
+
+def check_censure(request, movie):
+    CensurePermission().has_object_permission(api_request(request), None, movie)
+
+
+async def movie(request, pk):
+    '''
+    Detalhes de um filme, async.
+    '''
+    response = not_allowed(request)
+    if response is not None:
+        return response
+
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return not_authenticated()
+
+    movie = await aget(Movie.objects.all(), pk=pk)
+    if movie is None:
+        return json_response({'detail': 'Não encontrado.'}, status=404)
+
+    try:
+        await sync_to_async(check_censure)(request, movie)
+    except DRFValidationError as exc:
+        return json_response(exc.detail, status=exc.status_code)
+
+    return json_response(MovieFastSerializer(movie).data)
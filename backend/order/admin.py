@@ -1,16 +1,21 @@
 from django.contrib import admin
 
+from backend.core.admin import FastModelAdmin
+
 from .models import Department, Employee, Order
 
 
 @admin.register(Employee)
-class EmployeeAdmin(admin.ModelAdmin):
+class EmployeeAdmin(FastModelAdmin):
     list_display = ('__str__', 'department')
+    # O __str__ usa o nome do usuário.
+    list_select_related = ('user',)
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(FastModelAdmin):
     list_display = ('__str__', 'employee')
+    list_select_related = ('employee__user',)
 
 
 admin.site.register(Department)
@@ -0,0 +1,68 @@
+'''
+Estatísticas das notas, calculadas pelo banco com GROUP BY.
+'''
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import connections
+from django.db.models import Avg, Count, Max, Min
+
+from backend.core.aggregates import PercentileCont, percentile_cont
+
+DEFAULT_PERCENTILES = (0.25, 0.5, 0.75)
+
+
+def percentile_key(fraction):
+    return f'p{fraction * 100:g}'
+
+
+def to_number(value):
+    if value is None:
+        return None
+    return round(float(value), 2)
+
+
+def grade_stats(queryset, group_fields, percentiles=DEFAULT_PERCENTILES):
+    '''
+    count, avg, min, max e percentis das notas para cada grupo,
+    em uma query (GROUP BY). group_fields mapeia o nome na resposta
+    para o campo; o primeiro identifica o grupo, por exemplo:
+
+        grade_stats(Grade.objects.all(), {'student': 'student', 'name': 'student__first_name'})
+
+    Sem o percentile_cont do PostgreSQL, os percentis saem de uma segunda
+    query com as notas ordenadas por grupo, lidas em streaming.
+    '''
+    lookups = list(group_fields.values())
+    key = lookups[0]
+    queryset = queryset.filter(note__isnull=False, **{f'{key}__isnull': False}).order_by()
+    is_postgresql = connections[queryset.db].vendor == 'postgresql'
+
+    aggregates = {
+        'count': Count('note'),
+        'avg': Avg('note'),
+        'min': Min('note'),
+        'max': Max('note'),
+    }
+    if is_postgresql:
+        for fraction in percentiles:
+            aggregates[percentile_key(fraction)] = PercentileCont('note', fraction)
+
+    rows = queryset.values(*lookups).annotate(**aggregates).order_by(key)
+    stats = {}
+    for row in rows:
+        item = {name: row[lookup] for name, lookup in group_fields.items()}
+        item['count'] = row['count']
+        item.update({name: to_number(row[name]) for name in aggregates if name != 'count'})
+        stats[row[key]] = item
+
+    if percentiles and not is_postgresql:
+        notes = queryset.order_by(key, 'note').values_list(key, 'note')
+        for group, group_notes in groupby(notes.iterator(), key=itemgetter(0)):
+            values = [float(note) for _, note in group_notes]
+            stats[group].update({
+                percentile_key(fraction): to_number(percentile_cont(values, fraction))
+                for fraction in percentiles
+            })
+
+    return list(stats.values())
@@ -45,6 +45,8 @@ class GradeSerializer(serializers.ModelSerializer):
     class Meta:
         model = Grade
         fields = '__all__'
+        # ?expand=student (veja SparseFieldsMixin).
+        expandable_fields = {'student': StudentSerializer}
 
 
 class ClassSerializer(serializers.ModelSerializer):
@@ -52,6 +54,9 @@ class ClassSerializer(serializers.ModelSerializer):
     class Meta:
         model = Class
         fields = '__all__'
+        # O teacher é sempre o usuário logado (veja ClassViewSet).
+        read_only_fields = ('teacher',)
+        expandable_fields = {'classroom': ClassroomSerializer}
 
 
 class ClassAddSerializer(serializers.ModelSerializer):
@@ -1,4 +1,5 @@
-from django.contrib.auth.models import User
+from django.db.models import CharField, Value
+from django.db.models.functions import Concat, LPad
 from django.shortcuts import get_object_or_404
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
@@ -6,12 +7,23 @@ from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from backend.core.aio import streaming_response
+from backend.core.api.mixins import (
+    CachedResponseMixin,
+    ExportMixin,
+    OwnerScopedMixin,
+    SparseFieldsMixin,
+    get_requested_fields,
+    iter_values
+)
+from backend.core.api.pagination import KeysetPagination
+from backend.core.api.renderers import stream_json
+from backend.school.analytics import DEFAULT_PERCENTILES, grade_stats
 from backend.school.api.serializers import (
     ClassAddSerializer,
     ClassroomSerializer,
     ClassSerializer,
     GradeSerializer,
-    StudentRegistrationSerializer,
     StudentSerializer,
     StudentUpdateSerializer
 )
@@ -22,11 +34,19 @@ from backend.school.models import Class, Classroom, Grade, Student
 #     serializer_class = StudentSerializer
 
 
-class StudentViewSet(viewsets.ViewSet):
+class StudentViewSet(ExportMixin, viewsets.ViewSet):
     """
     A simple ViewSet for listing or retrieving students.
     Uma ViewSet simples para listar ou recuperar alunos.
+
+    list e all_students leem o banco com values_list em blocos
+    e devolvem a lista em streaming, sem criar os objetos Student.
+    Com ?page_size ou ?cursor a resposta é paginada por id.
     """
+    pagination_class = KeysetPagination
+    keyset_ordering = ('id',)
+    student_fields = ('id', 'registration', 'first_name', 'last_name')
+    registration_fields = ('registration', 'full_name')
 
     def get_serializer_class(self):
         # Muda o serializer dependendo da ação.
@@ -52,13 +72,48 @@ class StudentViewSet(viewsets.ViewSet):
         obj = get_object_or_404(queryset, pk=pk)
         return obj
 
+    def get_registration_queryset(self):
+        '''
+        Matrícula com 7 dígitos e nome completo formatados pelo banco,
+        no lugar do zfill e do __str__ do StudentRegistrationSerializer.
+        '''
+        return self.get_queryset().annotate(
+            registration_display=LPad('registration', 7, Value('0')),
+            full_name=Concat('first_name', Value(' '), 'last_name', output_field=CharField()),
+        ).values_list('registration_display', 'full_name')
+
+    def is_paginated(self, request):
+        params = request.query_params
+        return KeysetPagination.cursor_query_param in params or KeysetPagination.page_size_query_param in params
+
+    def list_values(self, request, queryset, names):
+        '''
+        Devolve as linhas do values_list como dicionários com os nomes em names.
+        '''
+        if self.is_paginated(request):
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            return paginator.get_paginated_response([dict(zip(names, row)) for row in page])
+
+        rows = iter_values(queryset.order_by('id'), names, self.export_chunk_size)
+
+        if self.is_export(request):
+            # ?format=ndjson ou ?format=csv
+            return self.export(request, rows)
+
+        if request.accepted_renderer.format == 'json':
+            return streaming_response(request, stream_json(rows), content_type='application/json')
+
+        # API navegável
+        return Response(list(rows))
+
     def list(self, request):
         # queryset = Student.objects.all()
         # serializer = StudentSerializer(queryset, many=True)
         # return Response(serializer.data)
-        serializer = self.get_serializer(self.get_queryset(), many=True)
-        # Sem paginação
-        return Response(serializer.data)
+        fields = get_requested_fields(request, 'fields', self.student_fields)
+        queryset = self.get_queryset().values_list(*fields)
+        return self.list_values(request, queryset, fields)
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -91,26 +146,131 @@ class StudentViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['get'])
     def all_students(self, request, pk=None):
-        queryset = Student.objects.all()
-        serializer = StudentRegistrationSerializer(queryset, many=True)
-        return Response(serializer.data)
+        # queryset = Student.objects.all()
+        # serializer = StudentRegistrationSerializer(queryset, many=True)
+        # return Response(serializer.data)
+        return self.list_values(request, self.get_registration_queryset(), self.registration_fields)
 
 
-class ClassroomViewSet(viewsets.ModelViewSet):
+class ClassroomViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Classroom.objects.all()
     serializer_class = ClassroomSerializer
     permission_classes = (AllowAny,)
+    roster_fields = ('id', 'title')
+    roster_student_fields = ('id', 'registration', 'first_name', 'last_name')
+
+    @action(detail=False, methods=['get'])
+    def roster(self, request):
+        '''
+        Salas com os ids dos alunos e um mapa "students" (id → aluno) com cada aluno uma vez só,
+        mesmo que ele esteja em várias salas da página.
+        ?fields=title e ?student_fields=first_name,last_name escolhem os campos.
+
+        São três queries por página (salas, ligações e alunos), todas com values_list.
+        '''
+        fields = get_requested_fields(request, 'fields', self.roster_fields)
+        student_fields = get_requested_fields(request, 'student_fields', self.roster_student_fields)
+
+        queryset = self.get_queryset().order_by('id').values_list(*fields)
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        classrooms = [dict(zip(fields, row)) for row in rows]
+
+        links = Classroom.students.through.objects.filter(
+            classroom_id__in=[classroom['id'] for classroom in classrooms]
+        ).order_by('id').values_list('classroom_id', 'student_id')
+
+        by_id = {}
+        for classroom in classrooms:
+            classroom['students'] = []
+            by_id[classroom['id']] = classroom
+
+        student_ids = set()
+        for classroom_id, student_id in links:
+            by_id[classroom_id]['students'].append(student_id)
+            student_ids.add(student_id)
+
+        students = Student.objects.filter(pk__in=student_ids).order_by('id').values_list(*student_fields)
+        students = {row[0]: dict(zip(student_fields, row)) for row in students}
+
+        if page is None:
+            return Response({'results': classrooms, 'students': students})
 
+        response = self.get_paginated_response(classrooms)
+        response.data['students'] = students
+        return response
 
-class GradeViewSet(viewsets.ReadOnlyModelViewSet):
+
+class GradeViewSet(CachedResponseMixin, SparseFieldsMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Grade.objects.all()
     serializer_class = GradeSerializer
     permission_classes = (AllowAny,)
+    analytics_groups = {
+        'students': {
+            'student': 'student',
+            'registration': 'student__registration',
+            'first_name': 'student__first_name',
+            'last_name': 'student__last_name',
+        },
+        'classrooms': {
+            'classroom': 'student__classroom',
+            'title': 'student__classroom__title',
+        },
+    }
+
+    def get_cache_models(self):
+        if self.action == 'analytics':
+            # Nomes dos alunos e alunos de cada sala também entram no resultado.
+            return (Grade, Student, Classroom)
+        return super().get_cache_models()
+
+    def get_percentiles(self, request):
+        value = request.query_params.get('percentiles')
+        if value is None:
+            return DEFAULT_PERCENTILES
+        try:
+            percentiles = tuple(float(item) for item in value.split(',') if item)
+        except ValueError:
+            percentiles = (-1,)
+        if any(not 0 <= fraction <= 1 for fraction in percentiles):
+            raise DRFValidationError({'percentiles': 'Informe frações entre 0 e 1, separadas por vírgula.'})
+        return percentiles
 
-
-class ClassViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def analytics(self, request):
+        '''
+        Boletim da escola: count, avg, min, max e percentis das notas
+        por aluno e por sala, calculados no banco.
+        ?by=students ou ?by=classrooms para só um deles; ?percentiles=0.5,0.9.
+        A resposta fica em cache até a próxima alteração de notas, alunos ou salas.
+        '''
+        return self.cached_response(request, self.get_analytics)
+
+    def get_analytics(self, request):
+        groups = self.analytics_groups
+        by = request.query_params.get('by')
+        if by is not None:
+            if by not in groups:
+                raise DRFValidationError({'by': f"Use {' ou '.join(groups)}."})
+            groups = {by: groups[by]}
+
+        percentiles = self.get_percentiles(request)
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response({
+            name: grade_stats(queryset, fields, percentiles)
+            for name, fields in groups.items()
+        })
+
+
+class ClassViewSet(OwnerScopedMixin, SparseFieldsMixin, viewsets.ModelViewSet):
+    '''
+    Somente as aulas da pessoa logada no momento (teacher = request.user).
+    '''
     queryset = Class.objects.all()
     # serializer_class = ClassSerializer
+    owner_field = 'teacher'
+    # Usa o índice (teacher, created).
+    owner_ordering = ('-created', '-id')
 
     # def list(self, request, *args, **kwargs):
     #     user = self.request.user
@@ -129,20 +289,6 @@ class ClassViewSet(viewsets.ModelViewSet):
     #     serializer = self.get_serializer(queryset, many=True)
     #     return Response(serializer.data)
 
-    def get_queryset(self):
-        '''
-        Retorna somente as aulas da pessoa logada no momento.
-        '''
-        user = self.request.user
-        teacher = User.objects.get(username=user)
-
-        if user is not None:
-            queryset = Class.objects.filter(teacher=teacher)
-        else:
-            queryset = Class.objects.none()
-
-        return queryset
-
     def get_serializer_class(self):
         if self.action == 'create':
             return ClassAddSerializer
@@ -152,16 +298,6 @@ class ClassViewSet(viewsets.ModelViewSet):
 
         return ClassSerializer
 
-    def perform_create(self, serializer):
-        '''
-        Ao criar um objeto, define teacher com o usuário logado.
-        '''
-        user = self.request.user
-        teacher = User.objects.get(username=user)
-
-        if user is not None:
-            serializer.save(teacher=teacher)
-
     def create(self, request, *args, **kwargs):
         # https://www.cdrf.co/3.12/rest_framework.viewsets/ModelViewSet.html#create
         serializer = self.get_serializer(data=request.data)
@@ -170,38 +306,6 @@ class ClassViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
-    def perform_update(self, serializer):
-        user = self.request.user
-        data = self.request.data
-        teacher_id = data.get('teacher')
-
-        try:
-            teacher = User.objects.get(pk=teacher_id)
-        except User.DoesNotExist:
-            raise DRFValidationError('Usuário não encontrado.')
-
-        if user and user.is_authenticated:
-            if user == teacher:
-                serializer.save()
-            else:
-                raise DRFValidationError('Você não tem permissão para esta operação.')
-
-    def retrieve(self, request, *args, **kwargs):
-        '''
-        Método para ver os detalhes.
-        '''
-        instance = self.get_object()
-        teacher = instance.teacher
-        user = self.request.user
-
-        if user and user.is_authenticated:
-            if user == teacher:
-                serializer = self.get_serializer(instance)
-            else:
-                raise DRFValidationError('Você não tem acesso a esta aula.')
-
-        return Response(serializer.data)
-
     def perform_destroy(self, instance):
         '''
         Método pra deletar os dados.
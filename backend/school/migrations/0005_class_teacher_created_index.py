@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 11:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('school', '0004_alter_class_classroom_alter_class_teacher_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='class',
+            index=models.Index(fields=['teacher', 'created'], name='school_class_teacher_created'),
+        ),
+    ]
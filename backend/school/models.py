@@ -46,6 +46,10 @@ class Class(models.Model):
     class Meta:
         verbose_name = "Aula"
         verbose_name_plural = "Aulas"
+        indexes = [
+            # Aulas de cada professor, das mais recentes para as mais antigas.
+            models.Index(fields=('teacher', 'created'), name='school_class_teacher_created'),
+        ]
 
 
 class Grade(models.Model):
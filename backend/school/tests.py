@@ -0,0 +1,248 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from .models import Class, Classroom, Grade, Student
+
+
+class StudentRosterTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='d')
+        self.client.force_login(self.user)
+        Student.objects.bulk_create(
+            Student(registration=str(i), first_name='Aluno', last_name=f'{i}')
+            for i in range(1, 26)
+        )
+
+    def get_json(self, response):
+        if response.streaming:
+            return json.loads(b''.join(response.streaming_content))
+        return json.loads(response.content)
+
+    def test_all_students(self):
+        response = self.client.get('/api/v1/students/all_students/')
+
+        self.assertTrue(response.streaming)
+        resultado = self.get_json(response)
+        self.assertEqual(len(resultado), 25)
+        self.assertEqual(resultado[0], {'registration': '0000001', 'full_name': 'Aluno 1'})
+
+    def test_all_students_paginated(self):
+        response = self.client.get('/api/v1/students/all_students/?page_size=10')
+        resultado = self.get_json(response)
+
+        self.assertEqual(len(resultado['results']), 10)
+        self.assertEqual(resultado['results'][9]['registration'], '0000010')
+
+        response = self.client.get(resultado['next'])
+        resultado = self.get_json(response)
+
+        self.assertEqual(resultado['results'][0]['registration'], '0000011')
+
+    def test_student_list(self):
+        response = self.client.get('/api/v1/students/')
+
+        resultado = self.get_json(response)
+        student = Student.objects.order_by('id').first()
+        esperado = {
+            'id': student.id,
+            'registration': '1',
+            'first_name': 'Aluno',
+            'last_name': '1',
+        }
+        self.assertEqual(len(resultado), 25)
+        self.assertEqual(resultado[0], esperado)
+
+    def test_student_export_csv(self):
+        response = self.client.get('/api/v1/students/all_students/?format=csv')
+
+        linhas = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(linhas[0], 'registration,full_name')
+        self.assertEqual(linhas[1], '0000001,Aluno 1')
+
+
+class GradeCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        student = Student.objects.create(registration='1', first_name='Aluno', last_name='1')
+        Grade.objects.create(student=student, note=7)
+
+    def test_cached_response(self):
+        esperado = json.loads(self.client.get('/api/v1/grades/').content)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/grades/')
+
+        self.assertEqual(esperado, json.loads(response.content))
+
+    def test_invalidate_on_save(self):
+        self.client.get('/api/v1/grades/')
+
+        grade = Grade.objects.get()
+        grade.note = 9
+        grade.save()
+
+        resultado = json.loads(self.client.get('/api/v1/grades/').content)
+        self.assertEqual(resultado['results'][0]['note'], '9.00')
+
+
+class GradeAnalyticsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.ana = Student.objects.create(registration='1', first_name='Ana', last_name='Lima')
+        self.bia = Student.objects.create(registration='2', first_name='Bia', last_name='Reis')
+        self.classroom = Classroom.objects.create(title='Sala 1')
+        self.classroom.students.add(self.ana, self.bia)
+        Grade.objects.bulk_create([
+            Grade(student=self.ana, note=5),
+            Grade(student=self.ana, note=7),
+            Grade(student=self.ana, note=10),
+            Grade(student=self.bia, note=8),
+            Grade(student=None, note=3),
+        ])
+
+    def get_analytics(self, params=None):
+        response = self.client.get('/api/v1/grades/analytics/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content)
+
+    def test_analytics(self):
+        data = self.get_analytics()
+
+        self.assertEqual(data['students'], [
+            {
+                'student': self.ana.pk, 'registration': '1', 'first_name': 'Ana', 'last_name': 'Lima',
+                'count': 3, 'avg': 7.33, 'min': 5.0, 'max': 10.0, 'p25': 6.0, 'p50': 7.0, 'p75': 8.5,
+            },
+            {
+                'student': self.bia.pk, 'registration': '2', 'first_name': 'Bia', 'last_name': 'Reis',
+                'count': 1, 'avg': 8.0, 'min': 8.0, 'max': 8.0, 'p25': 8.0, 'p50': 8.0, 'p75': 8.0,
+            },
+        ])
+        self.assertEqual(data['classrooms'], [{
+            'classroom': self.classroom.pk, 'title': 'Sala 1',
+            'count': 4, 'avg': 7.5, 'min': 5.0, 'max': 10.0, 'p25': 6.5, 'p50': 7.5, 'p75': 8.5,
+        }])
+
+    def test_by_and_percentiles(self):
+        data = self.get_analytics({'by': 'classrooms', 'percentiles': '0.9'})
+
+        self.assertEqual(list(data), ['classrooms'])
+        self.assertEqual(data['classrooms'][0]['p90'], 9.4)
+
+        response = self.client.get('/api/v1/grades/analytics/', {'percentiles': '2'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_refresh_on_write(self):
+        self.get_analytics()
+        with self.assertNumQueries(0):
+            self.get_analytics()
+
+        Grade.objects.create(student=self.bia, note=10)
+        data = self.get_analytics({})
+        self.assertEqual(data['students'][1]['count'], 2)
+
+
+class ClassroomRosterTest(TestCase):
+
+    def setUp(self):
+        self.ana = Student.objects.create(registration='1', first_name='Ana', last_name='Lima')
+        self.bia = Student.objects.create(registration='2', first_name='Bia', last_name='Reis')
+        self.sala1 = Classroom.objects.create(title='Sala 1')
+        self.sala2 = Classroom.objects.create(title='Sala 2')
+        self.sala1.students.add(self.ana, self.bia)
+        self.sala2.students.add(self.ana)
+
+    def get_roster(self, params=None):
+        response = self.client.get('/api/v1/classrooms/roster/', params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_roster(self):
+        data = self.get_roster()
+
+        self.assertEqual(data['results'], [
+            {'id': self.sala1.pk, 'title': 'Sala 1', 'students': [self.ana.pk, self.bia.pk]},
+            {'id': self.sala2.pk, 'title': 'Sala 2', 'students': [self.ana.pk]},
+        ])
+        self.assertEqual(data['students'], {
+            str(self.ana.pk): {'id': self.ana.pk, 'registration': '1', 'first_name': 'Ana', 'last_name': 'Lima'},
+            str(self.bia.pk): {'id': self.bia.pk, 'registration': '2', 'first_name': 'Bia', 'last_name': 'Reis'},
+        })
+
+    def test_sparse_fields(self):
+        data = self.get_roster({'fields': 'id', 'student_fields': 'first_name'})
+
+        self.assertEqual(data['results'][1], {'id': self.sala2.pk, 'students': [self.ana.pk]})
+        self.assertEqual(data['students'][str(self.ana.pk)], {'id': self.ana.pk, 'first_name': 'Ana'})
+
+        response = self.client.get('/api/v1/classrooms/roster/', {'fields': 'senha'})
+        self.assertEqual(response.status_code, 400)
+
+    def count_queries(self):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            self.get_roster()
+        return len(context)
+
+    def test_roster_queries(self):
+        esperado = self.count_queries()
+
+        for index in range(10):
+            sala = Classroom.objects.create(title=f'Sala {index + 3}')
+            sala.students.add(Student.objects.create(registration='3', first_name='Aluno', last_name='3'))
+
+        self.assertEqual(self.count_queries(), esperado)
+
+
+class ClassViewSetTest(TestCase):
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='professor', password='d')
+        self.other = User.objects.create_user(username='outro', password='d')
+        self.classroom = Classroom.objects.create(title='Sala 1')
+        self.own = Class.objects.create(classroom=self.classroom, teacher=self.teacher)
+        self.not_own = Class.objects.create(classroom=self.classroom, teacher=self.other)
+        self.client.force_login(self.teacher)
+
+    def test_list_only_own_classes(self):
+        Class.objects.create(classroom=self.classroom, teacher=self.teacher)
+
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get('/api/v1/classes/')
+        ids = [item['id'] for item in response.json()['results']]
+
+        self.assertEqual(len(ids), 2)
+        self.assertNotIn(self.not_own.pk, ids)
+        # Sem User.objects.get(username=...) para achar o professor.
+        self.assertFalse([query for query in context.captured_queries if '"username" =' in query['sql']])
+
+    def test_retrieve_other_teacher(self):
+        self.assertEqual(self.client.get(f'/api/v1/classes/{self.own.pk}/').status_code, 200)
+        self.assertEqual(self.client.get(f'/api/v1/classes/{self.not_own.pk}/').status_code, 404)
+
+    def test_create_sets_teacher(self):
+        response = self.client.post('/api/v1/classes/', {'classroom': self.classroom.pk})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Class.objects.latest('id').teacher, self.teacher)
+
+    def test_update_keeps_teacher(self):
+        url = f'/api/v1/classes/{self.own.pk}/'
+        data = {'classroom': self.classroom.pk, 'teacher': self.other.pk}
+        response = self.client.put(url, data, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.own.refresh_from_db()
+        self.assertEqual(self.own.teacher, self.teacher)
+
+        response = self.client.put(f'/api/v1/classes/{self.not_own.pk}/', data, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
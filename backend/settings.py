@@ -12,7 +12,7 @@ https://docs.djangoproject.com/en/4.0/ref/settings/
 
 from pathlib import Path
 
-from decouple import config
+from decouple import Csv, config
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -61,20 +61,21 @@ INSTALLED_APPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.BasicAuthentication',
+        'backend.core.api.authentication.CachedBasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'backend.core.api.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
     'EXCEPTION_HANDLER': 'backend.core.handler.custom_exception_handler',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'backend.core.api.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 10,
 }
 
 MIDDLEWARE = [
+    'backend.core.middleware.replica_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -117,16 +118,69 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+        # Pool de conexões. Para conexões persistentes sem pool use
+        # DB_ENGINE=django.db.backends.postgresql e DB_CONN_MAX_AGE=60.
+        'ENGINE': config('DB_ENGINE', 'backend.core.db.postgresql_pool'),
         'NAME': config('POSTGRES_DB', 'db'),  # postgres
         'USER': config('POSTGRES_USER', 'postgres'),
         'PASSWORD': config('POSTGRES_PASSWORD', 'postgres'),
         # 'db' caso exista um serviço com esse nome.
         'HOST': config('DB_HOST', '127.0.0.1'),
         'PORT': 5433,
+        # Com o pool deve ser 0: a conexão volta ao pool ao fim da requisição.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', 0, cast=int),
+        'POOL': {
+            'MIN_SIZE': config('DB_POOL_MIN_SIZE', 2, cast=int),
+            'MAX_SIZE': config('DB_POOL_MAX_SIZE', 20, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', 10, cast=int),
+            'MAX_IDLE': config('DB_POOL_MAX_IDLE', 300, cast=int),
+            'HEALTH_CHECK_INTERVAL': config('DB_POOL_HEALTH_CHECK_INTERVAL', 30, cast=int),
+        },
     }
 }
 
+# Réplicas de leitura, por exemplo DB_REPLICA_HOSTS=10.0.0.2,10.0.0.3
+DATABASE_REPLICAS = []
+for index, host in enumerate(config('DB_REPLICA_HOSTS', '', cast=Csv())):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['backend.core.db.router.PrimaryReplicaRouter']
+
+# Segundos lendo do principal depois de uma escrita.
+REPLICA_PIN_SECONDS = config('DB_REPLICA_PIN_SECONDS', 5, cast=int)
+
+# Cache compartilhado entre os processos: versões dos models (ETag e cache de respostas),
+# autenticação, grupos e permissões. Sem REDIS_URL fica na memória de cada processo,
+# o que só funciona com um único processo (veja o check core.E001).
+REDIS_URL = config('REDIS_URL', '')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Número de processos do gunicorn/uvicorn.
+WEB_CONCURRENCY = config('WEB_CONCURRENCY', 1, cast=int)
+
+AUTHENTICATION_BACKENDS = [
+    'backend.core.backends.CachedModelBackend',
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/4.0/ref/settings/#auth-password-validators
 
@@ -1,12 +1,16 @@
 from rest_framework import viewsets
 
+from backend.core.api.mixins import SparseFieldsMixin
+from backend.core.api.pagination import KeysetPagination
 from backend.todo.api.serializers import TodoSerializer
 from backend.todo.models import Todo
 
 
-class TodoViewSet(viewsets.ModelViewSet):
+class TodoViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Todo.objects.all()
     serializer_class = TodoSerializer
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-created', '-id')
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user, status='a')
@@ -0,0 +1,17 @@
+# Generated by Django 4.0.10 on 2026-10-18 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('todo', '0004_alter_todo_description_alter_todo_task'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='todo',
+            index=models.Index(fields=['created', 'id'], name='todo_created_id_idx'),
+        ),
+    ]
@@ -28,6 +28,10 @@ class Todo(models.Model):
     class Meta:
         verbose_name = "Tarefa"
         verbose_name_plural = "Tarefas"
+        indexes = [
+            # Usado pela paginação por chave (KeysetPagination).
+            models.Index(fields=['created', 'id'], name='todo_created_id_idx'),
+        ]
 
     def get_absolute_url(self):
         return reverse_lazy('todo:todo_detail', kwargs={'pk': self.pk})
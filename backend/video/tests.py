@@ -1,5 +1,8 @@
 import json
 
+from asgiref.sync import sync_to_async
+from django.core.management.color import no_style
+from django.db import connection
 from django.test import TestCase
 
 from .models import Video
@@ -95,3 +98,60 @@ class VideoTest(TestCase):
         esperado = {"data": "Item deletado com sucesso."}
 
         self.assertEqual(esperado, resultado)
+
+    def test_video_export_ndjson(self):
+        Video.objects.create(**self.payload)
+
+        response = self.client.get('/api/v1/videos/?format=ndjson')
+
+        self.assertTrue(response.streaming)
+        resultado = [json.loads(linha) for linha in b''.join(response.streaming_content).splitlines()]
+        esperado = [{"id": Video.objects.get().id, **self.payload}]
+        self.assertEqual(esperado, resultado)
+
+    def test_video_export_csv(self):
+        Video.objects.create(**self.payload)
+
+        response = self.client.get('/api/v1/videos/?format=csv')
+
+        resultado = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual(resultado[0], 'id,title,release_year')
+        self.assertTrue(resultado[1].endswith(',Matrix,1999'))
+
+
+class VideoAsyncTest(TestCase):
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        # O VideoTest espera ids a partir de 1, e no PostgreSQL o rollback não volta a sequência.
+        sequences = [{'table': Video._meta.db_table, 'column': Video._meta.pk.column}]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_by_name_sql(no_style(), sequences):
+                cursor.execute(sql)
+
+    def setUp(self):
+        self.video = Video.objects.create(title='Matrix', release_year=1999)
+
+    async def test_video_list(self):
+        response = await self.async_client.get('/api/v1/async/videos/')
+
+        esperado = json.loads((await sync_to_async(self.client.get)('/api/v1/videos/')).content)
+        self.assertEqual(esperado, json.loads(response.content))
+
+    async def test_video_detail(self):
+        response = await self.async_client.get(f'/api/v1/async/videos/{self.video.pk}/')
+
+        esperado = {'data': {'id': self.video.pk, 'title': 'Matrix', 'release_year': 1999}}
+        self.assertEqual(esperado, json.loads(response.content))
+
+    async def test_video_create(self):
+        response = await self.async_client.post(
+            '/api/v1/async/videos/',
+            data={'title': 'Alien', 'release_year': 1979},
+            content_type='application/json'
+        )
+
+        resultado = json.loads(response.content)
+        self.assertEqual(resultado['data']['title'], 'Alien')
+        self.assertTrue(await sync_to_async(Video.objects.filter(title='Alien').exists)())
@@ -7,6 +7,9 @@ app_name = 'video'
 v1_urlpatterns = [
     path('videos/', v.videos, name='videos'),
     path('videos/<int:pk>/', v.video, name='video'),
+    # async
+    path('async/videos/', v.videos_async, name='videos_async'),
+    path('async/videos/<int:pk>/', v.video_async, name='video_async'),
 ]
 
 urlpatterns = [
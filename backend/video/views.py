@@ -1,20 +1,40 @@
 import json
 
+from asgiref.sync import sync_to_async
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 
+from backend.core.aio import aget, alist, json_response, streaming_response
+from backend.core.api.renderers import stream_csv, stream_ndjson
+
 from .forms import VideoForm
 from .models import Video
 
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', stream_ndjson),
+    'csv': ('text/csv', stream_csv),
+}
+
+
+def export_videos(request, export_format):
+    '''
+    Exporta todos os videos em NDJSON ou CSV, lendo o banco em blocos.
+    '''
+    content_type, stream = EXPORT_FORMATS[export_format]
+    rows = Video.objects.values('id', 'title', 'release_year').iterator(chunk_size=2000)
+    response = streaming_response(request, stream(rows), content_type=f'{content_type}; charset=utf-8')
+    if export_format == 'csv':
+        response['Content-Disposition'] = 'attachment; filename="videos.csv"'
+    return response
+
 
 @csrf_exempt
 def videos(request):
     '''
     Lista ou cria videos.
+    Na listagem, aceita ?format=ndjson ou ?format=csv para exportar.
     '''
-    videos = Video.objects.all()
-    data = [video.to_dict() for video in videos]
     form = VideoForm(request.POST or None)
 
     if request.method == 'POST':
@@ -33,6 +53,12 @@ def videos(request):
 
         return JsonResponse({'data': video.to_dict()})
 
+    export_format = request.GET.get('format')
+    if export_format in EXPORT_FORMATS:
+        return export_videos(request, export_format)
+
+    videos = Video.objects.all()
+    data = [video.to_dict() for video in videos]
     return JsonResponse({'data': data})
 
 
@@ -70,3 +96,35 @@ def video(request, pk):
     if request.method == 'DELETE':
         video.delete()
         return JsonResponse({'data': 'Item deletado com sucesso.'})
+
+
+async def videos_async(request):
+    '''
+    Versão async de videos().
+    A listagem roda no event loop; criar e exportar usam a view sync em uma thread.
+    '''
+    if request.method != 'GET' or request.GET.get('format') in EXPORT_FORMATS:
+        return await sync_to_async(videos)(request)
+
+    rows = await alist(Video.objects.values('id', 'title', 'release_year'))
+    return json_response({'data': rows})
+
+
+async def video_async(request, pk):
+    '''
+    Versão async de video().
+    Os detalhes rodam no event loop; editar e deletar usam a view sync em uma thread.
+    '''
+    if request.method != 'GET':
+        return await sync_to_async(video)(request, pk)
+
+    row = await aget(Video.objects.values('id', 'title', 'release_year'), pk=pk)
+    if row is None:
+        return json_response({'message': 'Não encontrado.'}, status=404)
+
+    return json_response({'data': row})
+
+
+# No Django 4.0 o @csrf_exempt transforma a view async em sync.
+videos_async.csrf_exempt = True
+video_async.csrf_exempt = True
@@ -21,6 +21,15 @@ POSTGRES_DB=db
 POSTGRES_USER=postgres
 POSTGRES_PASSWORD=postgres
 DB_HOST=localhost
+#DB_ENGINE=django.db.backends.postgresql
+#DB_CONN_MAX_AGE=0
+#DB_POOL_MIN_SIZE=2
+#DB_POOL_MAX_SIZE=20
+#DB_REPLICA_HOSTS=
+#DB_REPLICA_PIN_SECONDS=5
+
+#REDIS_URL=redis://localhost:6379/0
+#WEB_CONCURRENCY=1
 
 #DEFAULT_FROM_EMAIL=
 #EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend